@@ -0,0 +1,177 @@
+"""
+Benchmark for the persistence and backup layer (DatabaseManager).
+
+Each history size gets a fresh temporary database seeded by generate_history.py;
+backups are written into the same temporary directory. Measured operations:
+save_* throughput, get_statistics, load_settings, the session heartbeat and
+startup crash check, create_backup (fast and verified), restore_backup and
+cleanup_old_data.
+
+Results can be stored as a JSON baseline and compared on later runs; any
+operation whose p50 grows by more than --tolerance is reported as a
+regression and the script exits with status 1. Run from the repository root:
+
+    python benchmarks/bench_database.py --rows 10000,100000 --save-baseline
+    python benchmarks/bench_database.py --rows 10000,100000
+
+Seeding 10M rows takes a few minutes and ~2 GB of disk.
+"""
+import os
+import sys
+import json
+import time
+import sqlite3
+import logging
+import argparse
+import platform
+import tempfile
+import statistics
+from datetime import datetime
+from pathlib import Path
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / 'src'))
+
+from core.database_manager import DatabaseManager
+from generate_history import HistorySpec, generate
+
+DEFAULT_BASELINE = _root / 'benchmarks' / 'baselines' / 'bench_database.json'
+
+
+def _summary(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        'runs': len(ordered),
+        'mean_ms': round(statistics.fmean(ordered), 4),
+        'p50_ms': round(ordered[len(ordered) // 2], 4),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+    }
+
+
+def _time(func, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return samples
+
+
+def _bench_size(rows: int, writes: int, repeat: int) -> dict:
+    with tempfile.TemporaryDirectory(prefix='phantomid_bench_') as tmp:
+        tmp_path = Path(tmp)
+        db_path = tmp_path / 'phantomid.db'
+        t0 = time.perf_counter()
+        generate(db_path.as_posix(), HistorySpec.from_total(rows, seed=rows))
+        seed_s = time.perf_counter() - t0
+        db = DatabaseManager(db_path=db_path.as_posix(), base_dir=tmp)
+        db.save_settings({'auto_backup': True, 'backup_interval': 'Daily', 'log_level': 'INFO',
+                          'data_retention': '30 days', 'spoof_mode': 'Temp'})
+        sid = db.start_session()
+
+        results = {'seed_seconds': round(seed_s, 2), 'db_bytes': db_path.stat().st_size}
+        counter = iter(range(10 ** 9))
+        writes_plan = {
+            'save_change': lambda: db.save_change('MAC Address', 'AA', f"BB{next(counter)}", session_id=sid),
+            'save_game_spoof': lambda: db.save_game_spoof('Fortnite', 'game_spoof', '', '', session_id=sid),
+            'save_registry_change': lambda: db.save_registry_change(r'HKLM\SOFTWARE\X', 'Value', 'a', 'b', session_id=sid),
+            'save_system_info': lambda: db.save_system_info({'BIOS': {'SerialNumber': 'X'}, 'CPU': {'Name': 'Y'}}),
+        }
+        for name, func in writes_plan.items():
+            summary = _summary(_time(func, writes))
+            summary['ops_per_s'] = round(1000.0 / summary['mean_ms'], 1) if summary['mean_ms'] else 0.0
+            results[name] = summary
+
+        results['get_statistics'] = _summary(_time(db.get_statistics, repeat))
+        results['load_settings'] = _summary(_time(db.load_settings, repeat * 10))
+        results['heartbeat'] = _summary(_time(db.heartbeat, repeat * 10))
+        results['find_crashed_session'] = _summary(_time(db.find_crashed_session, repeat * 10))
+
+        backups: list[str] = []
+        results['create_backup'] = _summary(_time(lambda: backups.append(db.create_backup(verify=False)), repeat))
+        results['create_backup_verify'] = _summary(_time(lambda: backups.append(db.create_backup(verify=True)), repeat))
+        results['backup_bytes'] = os.path.getsize(backups[-1]) if backups and backups[-1] else 0
+        results['restore_backup'] = _summary(_time(lambda: db.restore_backup(backups[0]), repeat))
+
+        # Destructive, so measured last and only once
+        results['cleanup_old_data'] = _summary(_time(lambda: db.cleanup_old_data(30), 1))
+        db.close()
+        return results
+
+
+def _compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for size, ops in current.get('results', {}).items():
+        base_ops = baseline.get('results', {}).get(size, {})
+        for op, summary in ops.items():
+            base = base_ops.get(op)
+            if not isinstance(summary, dict) or not isinstance(base, dict) or not base.get('p50_ms'):
+                continue
+            ratio = summary['p50_ms'] / base['p50_ms']
+            if ratio > 1.0 + tolerance:
+                regressions.append(f"{size} rows · {op}: p50 {base['p50_ms']:.3f} -> {summary['p50_ms']:.3f} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='DatabaseManager persistence/backup benchmark')
+    parser.add_argument('--rows', default='10000,100000',
+                        help='Comma-separated history sizes to seed (default: 10000,100000; up to 10000000)')
+    parser.add_argument('--writes', type=int, default=500, help='Calls per save_* measurement')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per read/backup/restore measurement')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='Baseline JSON path')
+    parser.add_argument('--save-baseline', action='store_true', help='Write results to the baseline file')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed p50 slowdown before flagging (default 25%%)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    sizes = [int(s.replace('_', '')) for s in args.rows.split(',') if s.strip()]
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'results': {},
+    }
+    for rows in sizes:
+        if not args.json:
+            print(f"Seeding and measuring {rows:,} rows…", flush=True)
+        report['results'][str(rows)] = _bench_size(rows, args.writes, args.repeat)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for size, ops in report['results'].items():
+            print(f"\n{int(size):,} rows (seeded in {ops['seed_seconds']} s, db {ops['db_bytes'] / 1048576:.1f} MB)")
+            for op, r in ops.items():
+                if isinstance(r, dict):
+                    extra = f"  {r['ops_per_s']:,.0f} ops/s" if 'ops_per_s' in r else ''
+                    print(f"  {op:<22} p50 {r['p50_ms']:9.3f} ms  p95 {r['p95_ms']:9.3f} ms{extra}")
+
+    baseline_path = Path(args.baseline)
+    status = 0
+    if baseline_path.exists() and not args.save_baseline:
+        try:
+            baseline = json.loads(baseline_path.read_text(encoding='utf-8'))
+        except Exception as e:
+            print(f"Could not read baseline {baseline_path}: {e}", file=sys.stderr)
+            baseline = {}
+        regressions = _compare(report, baseline, args.tolerance)
+        if regressions:
+            status = 1
+            print(f"\nRegressions vs {baseline_path} (tolerance {args.tolerance:.0%}):", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+        elif not args.json:
+            print(f"\nNo regressions vs {baseline_path}")
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        if not args.json:
+            print(f"\nBaseline written to {baseline_path}")
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
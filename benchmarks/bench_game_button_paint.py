@@ -0,0 +1,94 @@
+"""
+Paint-time benchmark for GameButton on the offscreen Qt platform.
+
+Renders a GameButton repeatedly while toggling hover state, once with the
+scaled-pixmap cache active and once with it cleared before every paint (the
+previous behaviour). Run from the repository root:
+
+    python benchmarks/bench_game_button_paint.py --iterations 500
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / 'src'))
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtGui import QPixmap
+
+from ui.widgets import GameButton
+from utils.game_assets import get_asset_service
+
+
+def _load_logo(game_name: str):
+    img = get_asset_service().fetch_async(game_name).result(timeout=30)
+    return get_asset_service().pixmap_from_image(game_name, img)
+
+
+def _run(btn: GameButton, iterations: int, cached: bool) -> list[float]:
+    canvas = QPixmap(btn.size())
+    samples: list[float] = []
+    for i in range(iterations):
+        btn._hover = bool(i % 2)
+        if not cached:
+            btn._scaled_cache.clear()
+        t0 = time.perf_counter()
+        btn.render(canvas)
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return samples
+
+
+def _summary(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        'mean_ms': round(statistics.fmean(ordered), 4),
+        'p50_ms': round(ordered[len(ordered) // 2], 4),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='GameButton paint benchmark')
+    parser.add_argument('--game', default='Minecraft', help='Game logo to paint (default: Minecraft, the largest asset)')
+    parser.add_argument('--iterations', type=int, default=300)
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication([])
+    btn = GameButton(args.game, '')
+    pm = _load_logo(args.game)
+    if pm is not None:
+        btn.bg_pix = pm
+    btn.show()
+    app.processEvents()
+
+    results = {
+        'game': args.game,
+        'source_size': [btn.bg_pix.width(), btn.bg_pix.height()],
+        'iterations': args.iterations,
+        'uncached': _summary(_run(btn, args.iterations, cached=False)),
+        'cached': _summary(_run(btn, args.iterations, cached=True)),
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"GameButton paint ({args.game}, source {results['source_size'][0]}x{results['source_size'][1]}, {args.iterations} paints)")
+        for label in ('uncached', 'cached'):
+            r = results[label]
+            print(f"  {label:<9} mean {r['mean_ms']:.3f} ms  p50 {r['p50_ms']:.3f} ms  p95 {r['p95_ms']:.3f} ms")
+    get_asset_service().shutdown()
+    btn.close()
+    btn.deleteLater()
+    app.processEvents()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,408 @@
+"""
+Multi-process check for shared database access and the single-instance guard.
+
+Several writer processes call DatabaseManager.save_change() against one
+temporary database while reader processes poll statistics and history pages
+and a "maintenance" process repeatedly holds the write lock the way a long
+cleanup or import does. The check fails if any write is lost or gives up;
+busy retries are reported from each process's metrics.
+
+The busy-retry check then drives the path the busy timeout normally hides:
+writers run with a short BUSY_TIMEOUT_MS while the lock is held for longer
+than that, so writes must be rolled back and retried (db.busy.retry > 0, no
+batch lost), and once for longer than the whole retry budget, so a write
+must give up (db.busy.failed) without leaving part of its batch behind. Each
+write is a save_settings() batch of several keys, which must be stored
+all-or-nothing. Finally several threads share one DatabaseManager (as the
+GUI thread and pool workers do) while another process holds read locks, so
+COMMIT returns busy and is rolled back; no thread's write may be lost.
+
+With --single-instance it also starts GUI-less processes that take the
+SingleInstance lock on the offscreen Qt platform: the first must win, the
+second must be refused and activate the first, and after the first exits a
+new process must get the lock again. Run from the repository root on Linux:
+
+    python benchmarks/check_concurrency.py
+    python benchmarks/check_concurrency.py --writers 8 --writes 500 --single-instance
+    python benchmarks/check_concurrency.py --busy-timeout-ms 0   # shows what retries alone cover
+    python benchmarks/check_concurrency.py --retry-timeout-ms 20 --retry-hold-ms 80
+
+Exit status is 1 when a check fails.
+"""
+import os
+import sys
+import json
+import time
+import sqlite3
+import logging
+import argparse
+import tempfile
+import subprocess
+import multiprocessing as mp
+from pathlib import Path
+
+_root = Path(__file__).resolve().parents[1]
+SRC_DIR = _root / 'src'
+sys.path.insert(0, str(SRC_DIR))
+
+BUSY_COUNTERS = ('db.busy.retry', 'db.busy.failed', 'db.write.errors')
+# Keys per save_settings() call in the busy-retry check
+BATCH_KEYS = 5
+
+
+def _open(db_path: str, busy_timeout_ms):
+    import core.database_manager as dm
+    if busy_timeout_ms is not None:
+        dm.BUSY_TIMEOUT_MS = busy_timeout_ms
+    return dm.DatabaseManager(db_path=db_path, base_dir=str(Path(db_path).parent))
+
+
+def _metrics_result(name: str, **extra) -> dict:
+    from core.metrics import metrics
+    write = metrics.summary('db.write') or {}
+    return {'process': name, **{c: metrics.counter(c) for c in BUSY_COUNTERS},
+            'write_p95_ms': round(write.get('p95_ms', 0.0), 2), 'write_max_ms': round(write.get('max_ms', 0.0), 2), **extra}
+
+
+def _writer(index: int, db_path: str, writes: int, busy_timeout_ms, start, results):
+    logging.disable(logging.CRITICAL)
+    db = _open(db_path, busy_timeout_ms)
+    start.wait()
+    for i in range(writes):
+        db.save_change(f"item-{index}-{i}", 'old', 'new', session_id=f"writer-{index}")
+        if i % 50 == 0:
+            db.save_settings({f"writer_{index}": i})
+    db.close()
+    results.put(_metrics_result(f"writer-{index}"))
+
+
+def _reader(index: int, db_path: str, busy_timeout_ms, start, stop, results):
+    logging.disable(logging.CRITICAL)
+    db = _open(db_path, busy_timeout_ms)
+    start.wait()
+    reads = 0
+    while not stop.is_set():
+        db.get_statistics()
+        db.history_page('changes')
+        reads += 1
+    db.close()
+    results.put(_metrics_result(f"reader-{index}", reads=reads))
+
+
+def _maintenance(db_path: str, hold_s: float, start, stop, results, pause_s=None, holding=None):
+    """Holds the write lock in bursts, like cleanup_old_data or import-history on a large table."""
+    conn = sqlite3.connect(db_path, timeout=30)
+    start.wait()
+    holds = 0
+    while not stop.is_set():
+        conn.execute('BEGIN IMMEDIATE')
+        conn.execute("UPDATE app_settings SET value=value WHERE key='maintenance'")
+        if holding is not None:
+            holding.set()
+        time.sleep(hold_s)
+        conn.commit()
+        holds += 1
+        time.sleep(hold_s if pause_s is None else pause_s)
+    conn.close()
+    results.put({'process': 'maintenance', 'holds': holds})
+
+
+def check_database(args) -> dict:
+    tmp = tempfile.mkdtemp(prefix='phantomid_concurrency_')
+    db_path = os.path.join(tmp, 'phantomid.db')
+    _open(db_path, None).close()
+    ctx = mp.get_context('spawn')
+    start, stop, results = ctx.Event(), ctx.Event(), ctx.Queue()
+    writers = [ctx.Process(target=_writer, args=(i, db_path, args.writes, args.busy_timeout_ms, start, results))
+               for i in range(args.writers)]
+    others = [ctx.Process(target=_reader, args=(i, db_path, args.busy_timeout_ms, start, stop, results))
+              for i in range(args.readers)]
+    if args.hold_ms > 0:
+        others.append(ctx.Process(target=_maintenance, args=(db_path, args.hold_ms / 1000, start, stop, results)))
+    for p in writers + others:
+        p.start()
+    t0 = time.perf_counter()
+    start.set()
+    for p in writers:
+        p.join()
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    for p in others:
+        p.join()
+    crashed = [p.name for p in writers + others if p.exitcode != 0]
+    per_process = [results.get(timeout=10) for p in writers + others if p.exitcode == 0]
+
+    conn = sqlite3.connect(db_path)
+    stored = conn.execute("SELECT COUNT(*) FROM changes").fetchone()[0]
+    conn.close()
+    expected = args.writers * args.writes
+    totals = {c: sum(r.get(c, 0) for r in per_process) for c in BUSY_COUNTERS}
+    return {
+        'db_path': db_path, 'seconds': round(elapsed, 2), 'expected_rows': expected, 'stored_rows': stored,
+        **totals, 'crashed': crashed, 'processes': sorted(per_process, key=lambda r: r['process']),
+        'ok': stored == expected and not crashed and totals['db.busy.failed'] == 0 and totals['db.write.errors'] == 0,
+    }
+
+
+def _read_holder(db_path: str, hold_s: float, pause_s: float, start, stop, holding):
+    """Keeps read transactions open, so a writer's COMMIT cannot take the exclusive lock."""
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    start.wait()
+    while not stop.is_set():
+        conn.execute('BEGIN')
+        conn.execute('SELECT COUNT(*) FROM changes').fetchone()
+        holding.set()
+        time.sleep(hold_s)
+        conn.execute('COMMIT')
+        time.sleep(pause_s)
+    conn.close()
+
+
+def _threaded_writer(db_path: str, threads: int, writes: int, busy_timeout_ms, ready, start, results):
+    import threading
+    logging.disable(logging.CRITICAL)
+    db = _open(db_path, busy_timeout_ms)
+    ready.put(0)
+    start.wait()
+
+    def _run(t: int):
+        for i in range(writes):
+            db.save_change(f"thread-{t}-{i}", 'old', 'new', session_id=f"thread-{t}")
+
+    workers = [threading.Thread(target=_run, args=(t,)) for t in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    db.close()
+    results.put(_metrics_result('shared-manager', threads=threads, writes=threads * writes))
+
+
+def check_shared_manager(args) -> dict:
+    tmp = tempfile.mkdtemp(prefix='phantomid_threads_')
+    db_path = os.path.join(tmp, 'phantomid.db')
+    _open(db_path, None).close()
+    ctx = mp.get_context('spawn')
+    timeout_ms = args.retry_timeout_ms
+    go, stop, holding, ready, start, results = (ctx.Event(), ctx.Event(), ctx.Event(),
+                                                ctx.Queue(), ctx.Event(), ctx.Queue())
+    holder = ctx.Process(target=_read_holder,
+                         args=(db_path, args.retry_hold_ms / 1000, timeout_ms / 2000, go, stop, holding))
+    writer = ctx.Process(target=_threaded_writer,
+                         args=(db_path, args.threads, args.retry_writes, timeout_ms, ready, start, results))
+    holder.start()
+    writer.start()
+    ready.get(timeout=60)
+    go.set()
+    holding.wait(60)
+    start.set()
+    writer.join()
+    stop.set()
+    holder.join()
+    result = results.get(timeout=10) if writer.exitcode == 0 else {}
+    conn = sqlite3.connect(db_path)
+    stored = conn.execute("SELECT COUNT(*) FROM changes WHERE item LIKE 'thread-%'").fetchone()[0]
+    conn.close()
+    expected = args.threads * args.retry_writes
+    failed = result.get('db.write.errors', 0)
+    return {
+        'db_path': db_path, 'threads': args.threads, 'expected_rows': expected, 'stored_rows': stored,
+        'db.busy.retry': result.get('db.busy.retry', 0), 'db.busy.failed': result.get('db.busy.failed', 0),
+        'db.write.errors': failed, 'crashed': writer.exitcode != 0,
+        # A write that reported success must be stored; only reported failures may be missing
+        'ok': writer.exitcode == 0 and stored == expected - failed and failed == 0,
+    }
+
+
+def _batch_writer(index: int, db_path: str, writes: int, busy_timeout_ms, ready, start, results):
+    logging.disable(logging.CRITICAL)
+    db = _open(db_path, busy_timeout_ms)
+    ready.put(index)
+    start.wait()
+    for i in range(writes):
+        db.save_settings({f"batch_{index}_{i}_{k}": k for k in range(BATCH_KEYS)})
+    db.close()
+    results.put(_metrics_result(f"writer-{index}", writes=writes))
+
+
+def _retry_budget_s(busy_timeout_ms: int) -> float:
+    """Longest a write keeps trying: every attempt's busy wait plus the backoff sleeps between them."""
+    import core.database_manager as dm
+    backoff = sum(dm.BUSY_RETRY_DELAY_S * 2 ** i for i in range(dm.BUSY_RETRIES))
+    return (dm.BUSY_RETRIES + 1) * busy_timeout_ms / 1000 + backoff
+
+
+def _batch_counts(db_path: str) -> dict:
+    conn = sqlite3.connect(db_path)
+    counts: dict = {}
+    for (key,) in conn.execute("SELECT key FROM app_settings WHERE key LIKE 'batch_%'"):
+        batch = key.rsplit('_', 1)[0]
+        counts[batch] = counts.get(batch, 0) + 1
+    conn.close()
+    return counts
+
+
+def _run_batch_writers(ctx, db_path: str, writers: int, writes: int, timeout_ms: int, hold):
+    """Start writers, wait until each has opened the database, then run them while hold(start) keeps the lock busy."""
+    ready, start, results = ctx.Queue(), ctx.Event(), ctx.Queue()
+    procs = [ctx.Process(target=_batch_writer, args=(i, db_path, writes, timeout_ms, ready, start, results))
+             for i in range(writers)]
+    for p in procs:
+        p.start()
+    for _ in procs:
+        ready.get(timeout=60)
+    hold(start)
+    for p in procs:
+        p.join()
+    crashed = [p.name for p in procs if p.exitcode != 0]
+    return [results.get(timeout=10) for p in procs if p.exitcode == 0], crashed
+
+
+def check_busy_retries(args) -> dict:
+    tmp = tempfile.mkdtemp(prefix='phantomid_busy_')
+    db_path = os.path.join(tmp, 'phantomid.db')
+    _open(db_path, None).close()
+    ctx = mp.get_context('spawn')
+    timeout_ms = args.retry_timeout_ms
+
+    # Phase 1: bursts longer than the busy timeout but well inside the retry budget
+    go, stop, holding, holder_results = ctx.Event(), ctx.Event(), ctx.Event(), ctx.Queue()
+    holder = ctx.Process(target=_maintenance, args=(db_path, args.retry_hold_ms / 1000, go, stop, holder_results,
+                                                    timeout_ms / 2000, holding))
+    holder.start()
+
+    def bursts(start):
+        go.set()
+        holding.wait(60)
+        start.set()
+
+    retry_procs, crashed = _run_batch_writers(ctx, db_path, 2, args.retry_writes, timeout_ms, bursts)
+    stop.set()
+    holder.join()
+    retried = {c: sum(r.get(c, 0) for r in retry_procs) for c in BUSY_COUNTERS}
+    counts = _batch_counts(db_path)
+    retry_phase = {
+        'writes': 2 * args.retry_writes, 'stored_batches': len(counts), **retried,
+        'partial_batches': sum(1 for n in counts.values() if n != BATCH_KEYS),
+        'ok': (not crashed and retried['db.busy.retry'] > 0 and retried['db.busy.failed'] == 0
+               and len(counts) == 2 * args.retry_writes and all(n == BATCH_KEYS for n in counts.values())),
+    }
+
+    # Phase 2: one write against a lock held past the whole retry budget must give up cleanly
+    budget = _retry_budget_s(timeout_ms)
+
+    def lock_out(start):
+        conn = sqlite3.connect(db_path, timeout=30)
+        conn.execute('BEGIN IMMEDIATE')
+        start.set()
+        time.sleep(budget * 2)
+        conn.rollback()
+        conn.close()
+
+    before = len(counts)
+    giveup_procs, giveup_crashed = _run_batch_writers(ctx, db_path, 1, 1, timeout_ms, lock_out)
+    gave_up = {c: sum(r.get(c, 0) for r in giveup_procs) for c in BUSY_COUNTERS}
+    counts = _batch_counts(db_path)
+    giveup_phase = {
+        'lock_held_s': round(budget * 2, 2), **gave_up, 'stored_batches': len(counts) - before,
+        'ok': (not giveup_crashed and gave_up['db.busy.failed'] == 1 and gave_up['db.write.errors'] == 1
+               and len(counts) == before and all(n == BATCH_KEYS for n in counts.values())),
+    }
+    return {'db_path': db_path, 'busy_timeout_ms': timeout_ms, 'retry': retry_phase, 'give_up': giveup_phase,
+            'crashed': crashed + giveup_crashed, 'ok': retry_phase['ok'] and giveup_phase['ok']}
+
+
+_INSTANCE_PROBE = (
+    "import sys, time\n"
+    "sys.path.insert(0, {src!r})\n"
+    "from PySide6.QtCore import QCoreApplication\n"
+    "from ui.single_instance import SingleInstance\n"
+    "app = QCoreApplication(sys.argv)\n"
+    "inst = SingleInstance({db!r})\n"
+    "primary = inst.acquire()\n"
+    "activated = []\n"
+    "inst.activation_requested.connect(lambda: activated.append(1))\n"
+    "deadline = time.time() + ({linger} if primary else 0)\n"
+    "while time.time() < deadline and not activated:\n"
+    "    app.processEvents()\n"
+    "    time.sleep(0.02)\n"
+    "print('primary' if primary else 'secondary', 'activated' if activated else '-', flush=True)\n"
+)
+
+
+def _run_instance(db_path: str, linger: float) -> subprocess.Popen:
+    code = _INSTANCE_PROBE.format(src=str(SRC_DIR), db=db_path, linger=linger)
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    return subprocess.Popen([sys.executable, '-c', code], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, env=env)
+
+
+def check_single_instance() -> dict:
+    db_path = os.path.join(tempfile.mkdtemp(prefix='phantomid_instance_'), 'phantomid.db')
+    first = _run_instance(db_path, linger=10)
+    time.sleep(1.0)
+    second = _run_instance(db_path, linger=0)
+    second_out = second.communicate(timeout=30)[0].strip()
+    first_out = first.communicate(timeout=30)[0].strip()
+    third_out = _run_instance(db_path, linger=0).communicate(timeout=30)[0].strip()
+    return {
+        'first': first_out, 'second': second_out, 'after_exit': third_out,
+        'ok': first_out == 'primary activated' and second_out == 'secondary -' and third_out == 'primary -',
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Check concurrent multi-process database access')
+    parser.add_argument('--writers', type=int, default=4, help='Writer processes (default: 4)')
+    parser.add_argument('--writes', type=int, default=200, help='save_change calls per writer (default: 200)')
+    parser.add_argument('--readers', type=int, default=2, help='Reader processes (default: 2)')
+    parser.add_argument('--hold-ms', type=int, default=200,
+                        help='How long the maintenance process holds the write lock per burst; 0 disables it')
+    parser.add_argument('--busy-timeout-ms', type=int, default=None, help='Override DatabaseManager.BUSY_TIMEOUT_MS')
+    parser.add_argument('--retry-timeout-ms', type=int, default=50,
+                        help='BUSY_TIMEOUT_MS used by the busy-retry check (default: 50)')
+    parser.add_argument('--retry-hold-ms', type=int, default=150,
+                        help='Lock bursts in the busy-retry check; must exceed --retry-timeout-ms (default: 150)')
+    parser.add_argument('--retry-writes', type=int, default=40, help='Batches per writer in the busy-retry check (default: 40)')
+    parser.add_argument('--threads', type=int, default=4,
+                        help='Threads sharing one DatabaseManager in the shared-manager check (default: 4)')
+    parser.add_argument('--single-instance', action='store_true', help='Also check the SingleInstance lock (needs PySide6)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args(argv)
+
+    report = {'database': check_database(args), 'busy_retries': check_busy_retries(args),
+              'shared_manager': check_shared_manager(args)}
+    if args.single_instance:
+        report['single_instance'] = check_single_instance()
+    ok = all(part['ok'] for part in report.values())
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        db = report['database']
+        print(f"  {'ok  ' if db['ok'] else 'FAIL'}  database: {db['stored_rows']}/{db['expected_rows']} rows in {db['seconds']}s, "
+              f"{db['db.busy.retry']} busy retries, {db['db.busy.failed']} gave up, {db['db.write.errors']} failed writes"
+              + (f", {len(db['crashed'])} process(es) crashed" if db['crashed'] else ''))
+        for r in db['processes']:
+            detail = ', '.join(f"{k}={v}" for k, v in r.items() if k != 'process')
+            print(f"          {r['process']:<12} {detail}")
+        br = report['busy_retries']
+        retry, give_up = br['retry'], br['give_up']
+        print(f"  {'ok  ' if retry['ok'] else 'FAIL'}  busy retries ({br['busy_timeout_ms']} ms timeout): "
+              f"{retry['stored_batches']}/{retry['writes']} batches, {retry['db.busy.retry']} retries, "
+              f"{retry['db.busy.failed']} gave up, {retry['partial_batches']} partial")
+        print(f"  {'ok  ' if give_up['ok'] else 'FAIL'}  lock held {give_up['lock_held_s']}s: "
+              f"{give_up['db.busy.failed']} write gave up, {give_up['stored_batches']} batch(es) stored"
+              + (f", {len(br['crashed'])} process(es) crashed" if br['crashed'] else ''))
+        sm = report['shared_manager']
+        print(f"  {'ok  ' if sm['ok'] else 'FAIL'}  {sm['threads']} threads on one manager: "
+              f"{sm['stored_rows']}/{sm['expected_rows']} rows, {sm['db.busy.retry']} busy retries, "
+              f"{sm['db.write.errors']} failed writes" + (", writer crashed" if sm['crashed'] else ''))
+        if 'single_instance' in report:
+            si = report['single_instance']
+            print(f"  {'ok  ' if si['ok'] else 'FAIL'}  single instance: first '{si['first']}', second '{si['second']}', "
+                  f"after exit '{si['after_exit']}'")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Import-time budget check for the Qt-free core modules.
+
+Each module is imported in a fresh interpreter with -X importtime, so the
+numbers are cold-import costs (bytecode caches aside). A module fails the
+check when its cumulative import time exceeds its budget, or when importing it
+loads any Qt binding. Run from the repository root:
+
+    python benchmarks/check_import_time.py
+    python benchmarks/check_import_time.py --scale 2 --runs 5
+
+Exit status is 1 when any module is over budget or pulls in Qt.
+"""
+import sys
+import json
+import argparse
+import subprocess
+from pathlib import Path
+
+_root = Path(__file__).resolve().parents[1]
+SRC_DIR = _root / 'src'
+
+# module -> cold import budget in milliseconds
+BUDGETS_MS = {
+    'core.metrics': 30,
+    'core.database_manager': 60,
+    'core.inventory': 40,
+    'utils.logging_setup': 40,
+    'utils.auto_updater': 60,
+    'spoofers.system_spoofers': 40,
+}
+QT_PREFIXES = ('PySide6', 'shiboken6', 'PyQt5', 'PyQt6')
+
+_PROBE = (
+    "import sys, json\n"
+    "sys.path.insert(0, {src!r})\n"
+    "import {module}\n"
+    "print(json.dumps(sorted(m for m in sys.modules if m.split('.')[0] in {qt!r})))\n"
+)
+
+
+def _measure(module: str) -> tuple[float, list[str]]:
+    """Return (cumulative import ms, Qt modules loaded) for one cold import."""
+    code = _PROBE.format(src=str(SRC_DIR), module=module, qt=QT_PREFIXES)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          capture_output=True, text=True, cwd=str(_root))
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}")
+    cumulative_us = None
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            cumulative_us = int(parts[1])
+    qt_loaded = json.loads(proc.stdout.strip().splitlines()[-1]) if proc.stdout.strip() else []
+    return (cumulative_us or 0) / 1000.0, qt_loaded
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Check cold import time of the Qt-free core modules')
+    parser.add_argument('--runs', type=int, default=3, help='Imports per module; the fastest is compared (default: 3)')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiply every budget, e.g. for slow CI machines')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args(argv)
+
+    results = {}
+    failed = False
+    for module, budget in BUDGETS_MS.items():
+        budget_ms = budget * args.scale
+        try:
+            samples = [_measure(module) for _ in range(max(1, args.runs))]
+        except Exception as e:
+            results[module] = {'error': str(e), 'ok': False}
+            failed = True
+            continue
+        best_ms = min(ms for ms, _ in samples)
+        qt_loaded = sorted({m for _, mods in samples for m in mods})
+        ok = best_ms <= budget_ms and not qt_loaded
+        failed = failed or not ok
+        results[module] = {'import_ms': round(best_ms, 2), 'budget_ms': budget_ms, 'qt_modules': qt_loaded, 'ok': ok}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for module, r in results.items():
+            if 'error' in r:
+                print(f"  FAIL  {module:<24} import failed: {r['error']}")
+                continue
+            note = f"  loads Qt: {', '.join(r['qt_modules'][:3])}" if r['qt_modules'] else ''
+            print(f"  {'ok  ' if r['ok'] else 'FAIL'}  {module:<24} {r['import_ms']:7.1f} ms / {r['budget_ms']:.0f} ms{note}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,279 @@
+"""
+Synthetic history generator for load-testing DatabaseManager.
+
+Fills changes, registry_changes, game_spoofs, sessions, system_info and
+backup_metadata with realistic-looking rows. Every row belongs
+to a session and is timestamped inside that session's lifetime, so time-range
+and per-session queries behave as they would on a long-lived install.
+
+    python benchmarks/generate_history.py --db /tmp/phantomid.db --rows 1000000
+    python benchmarks/generate_history.py --db /tmp/phantomid.db --changes 5000000 \\
+        --sessions 20000 --distribution zipf --span-days 365 --payload-bytes 8192
+
+The schema is created through DatabaseManager, so the generated file can be
+opened by the application. Existing rows are kept; new rows are appended.
+"""
+import sys
+import json
+import time
+import random
+import sqlite3
+import argparse
+import logging
+from bisect import bisect
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / 'src'))
+
+from core.database_manager import DatabaseManager
+
+CHUNK_ROWS = 50_000
+DISTRIBUTIONS = ('uniform', 'zipf', 'bursty')
+ITEMS = ['MAC Address', 'HWID', 'IP Address', 'Volume ID', 'MachineGuid', 'BIOS Serial']
+GAMES = ['FiveM', 'Fortnite', 'Valorant', 'Minecraft', 'Roblox', 'CS2']
+REGISTRY_KEYS = [
+    (r'HKLM\SOFTWARE\Microsoft\Cryptography', 'MachineGuid'),
+    (r'HKLM\SYSTEM\CurrentControlSet\Control\Class\{4d36e972-e325-11ce-bfc1-08002be10318}\0001', 'NetworkAddress'),
+    (r'HKLM\SOFTWARE\Microsoft\Windows NT\CurrentVersion', 'ProductId'),
+    (r'HKLM\SYSTEM\CurrentControlSet\Control\IDConfigDB\Hardware Profiles\0001', 'HwProfileGuid'),
+]
+
+
+@dataclass
+class HistorySpec:
+    changes: int = 0
+    registry_changes: int = 0
+    game_spoofs: int = 0
+    system_info: int = 0
+    backup_metadata: int = 0
+    sessions: int = 0
+    distribution: str = 'zipf'
+    span_days: int = 90
+    end: Optional[datetime] = None
+    session_minutes: int = 120
+    payload_bytes: int = 2048
+    failure_rate: float = 0.05
+    seed: int = 1
+
+    @classmethod
+    def from_total(cls, rows: int, **kwargs) -> 'HistorySpec':
+        """Split a total row count the way a typical install fills its tables."""
+        spec = cls(
+            changes=rows * 5 // 10,
+            registry_changes=rows * 2 // 10,
+            system_info=max(1, rows // 1000),
+            backup_metadata=max(1, rows // 5000),
+            sessions=max(1, rows // 200),
+            **kwargs,
+        )
+        spec.game_spoofs = max(0, rows - spec.changes - spec.registry_changes - spec.system_info)
+        return spec
+
+
+class _Sessions:
+    """Session ids with start times and a row-assignment distribution."""
+
+    def __init__(self, spec: HistorySpec, rnd: random.Random):
+        self.rnd = rnd
+        end = spec.end or datetime.now()
+        span = max(1, spec.span_days * 86400)
+        self.duration = max(60, spec.session_minutes * 60)
+        count = max(1, spec.sessions)
+        starts = sorted(end - timedelta(seconds=rnd.randrange(span)) for _ in range(count))
+        self.ids = [f"{rnd.getrandbits(128):032x}" for _ in range(count)]
+        self.starts = [s.timestamp() for s in starts]
+        self.ends = [min(end.timestamp(), s + self.duration) for s in self.starts]
+        if spec.distribution == 'uniform':
+            weights = [1.0] * count
+        elif spec.distribution == 'zipf':
+            order = list(range(count))
+            rnd.shuffle(order)
+            weights = [1.0 / (rank + 1) ** 1.1 for rank in order]
+        elif spec.distribution == 'bursty':
+            # 10% of sessions carry 90% of the rows
+            heavy = set(rnd.sample(range(count), max(1, count // 10)))
+            weights = [81.0 if i in heavy else 1.0 for i in range(count)]
+        else:
+            raise ValueError(f"Unknown session distribution: {spec.distribution}")
+        self.cum_weights = list(accumulate(weights))
+        self.total_weight = self.cum_weights[-1]
+
+    def pick(self):
+        """Return (session_id, timestamp string) for one row."""
+        i = bisect(self.cum_weights, self.rnd.random() * self.total_weight)
+        i = min(i, len(self.ids) - 1)
+        ts = self.rnd.uniform(self.starts[i], self.ends[i])
+        return self.ids[i], datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')
+
+    def rows(self):
+        for sid, start, end in zip(self.ids, self.starts, self.ends):
+            yield (sid, datetime.fromtimestamp(start).isoformat(timespec='seconds'),
+                   datetime.fromtimestamp(end).isoformat(timespec='seconds'))
+
+
+def _payload(rnd: random.Random, size: int) -> str:
+    info = {
+        'BIOS': {'SerialNumber': f"{rnd.getrandbits(40):010X}", 'Version': 'ALASKA - 1072009'},
+        'CPU': {'Name': 'AMD Ryzen 7 5800X 8-Core Processor', 'ProcessorId': f"{rnd.getrandbits(64):016X}"},
+        'UUID': {'UUID': f"{rnd.getrandbits(128):032X}"},
+        'Disks': [],
+    }
+    text = json.dumps(info)
+    while len(text) < size:
+        disk = {'Model': 'Samsung SSD 980 PRO 1TB', 'SerialNumber': f"S{rnd.getrandbits(56):014X}",
+                'Size': str(rnd.choice([500, 1000, 2000]) * 10 ** 9)}
+        missing = (size - len(text)) // (len(json.dumps(disk)) + 2) + 1
+        info['Disks'].extend(dict(disk, SerialNumber=f"S{rnd.getrandbits(56):014X}") for _ in range(missing))
+        text = json.dumps(info)
+    return text
+
+
+def _chunks(count: int, make_row: Callable[[], tuple]) -> Iterator[List[tuple]]:
+    done = 0
+    while done < count:
+        n = min(CHUNK_ROWS, count - done)
+        yield [make_row() for _ in range(n)]
+        done += n
+
+
+def generate(db_path: str, spec: HistorySpec, progress: Optional[Callable[[str, int, int], None]] = None) -> dict:
+    """Append spec's rows to db_path (creating the schema if needed); returns rows written per table."""
+    DatabaseManager(db_path=db_path, base_dir=str(Path(db_path).resolve().parent)).close()
+    rnd = random.Random(spec.seed)
+    sessions = _Sessions(spec, rnd)
+    hex48 = lambda: f"{rnd.getrandbits(48):012X}"
+    ok = lambda: int(rnd.random() >= spec.failure_rate)
+
+    def _change():
+        sid, ts = sessions.pick()
+        success = ok()
+        return (ts, 'system', rnd.choice(ITEMS), hex48(), hex48(), success,
+                '' if success else 'Access is denied.', sid)
+
+    def _registry():
+        sid, ts = sessions.pick()
+        key, name = rnd.choice(REGISTRY_KEYS)
+        return (ts, key, name, f"{rnd.getrandbits(128):032x}", f"{rnd.getrandbits(128):032x}", ok(), sid)
+
+    def _game():
+        sid, ts = sessions.pick()
+        return (ts, rnd.choice(GAMES), 'game_spoof', '', '', ok(), rnd.randrange(4), sid)
+
+    # A pool of payloads keeps large payload sizes cheap to generate
+    payloads = [_payload(rnd, spec.payload_bytes) for _ in range(min(64, max(1, spec.system_info)))]
+
+    def _system_info():
+        _, ts = sessions.pick()
+        return (ts.replace(' ', 'T'), rnd.choice(payloads))
+
+    def _backup():
+        _, ts = sessions.pick()
+        stamp = ts.replace('-', '').replace(':', '').replace(' ', '_')
+        return (ts.replace(' ', 'T'), f"backups/phantomid_backup_{stamp}.bak", rnd.randrange(1 << 20, 1 << 30),
+                json.dumps({'names': ['changes', 'game_spoofs', 'registry_changes', 'registry', 'registry_spoof',
+                                      'app_settings', 'sessions', 'backup_metadata', 'system_info']}))
+
+    plan = [
+        ('changes', spec.changes,
+         'INSERT INTO changes (timestamp, category, item, original_value, new_value, success, error_message, session_id) '
+         'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', _change),
+        ('registry_changes', spec.registry_changes,
+         'INSERT INTO registry_changes (timestamp, key_path, value_name, original_value, new_value, success, session_id) '
+         'VALUES (?, ?, ?, ?, ?, ?, ?)', _registry),
+        ('game_spoofs', spec.game_spoofs,
+         'INSERT INTO game_spoofs (timestamp, game, spoof_type, original_value, new_value, success, anti_detection_level, session_id) '
+         'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', _game),
+        ('system_info', spec.system_info,
+         'INSERT INTO system_info (collected_at, info_json) VALUES (?, ?)', _system_info),
+        ('backup_metadata', spec.backup_metadata,
+         'INSERT INTO backup_metadata (created_at, file_path, size_bytes, included_tables) VALUES (?, ?, ?, ?)', _backup),
+    ]
+
+    written = {}
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute('PRAGMA synchronous=OFF')
+        conn.executemany('INSERT OR IGNORE INTO sessions (id, started_at, ended_at) VALUES (?, ?, ?)', sessions.rows())
+        conn.commit()
+        written['sessions'] = len(sessions.ids)
+        for table, count, sql, make_row in plan:
+            done = 0
+            for batch in _chunks(count, make_row):
+                conn.executemany(sql, batch)
+                conn.commit()
+                done += len(batch)
+                if progress:
+                    progress(table, done, count)
+            written[table] = done
+    finally:
+        conn.close()
+    return written
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Generate a synthetic PhantomID history database')
+    parser.add_argument('--db', required=True, help='Database file to create or append to')
+    parser.add_argument('--rows', type=int, default=0,
+                        help='Total rows, split across tables like a typical install (per-table options override)')
+    for table in ('changes', 'registry-changes', 'game-spoofs', 'system-info', 'backups', 'sessions'):
+        parser.add_argument(f'--{table}', type=int, default=None, help=f'Rows for {table}')
+    parser.add_argument('--distribution', choices=DISTRIBUTIONS, default='zipf',
+                        help='How rows are spread over sessions (default: zipf)')
+    parser.add_argument('--span-days', type=int, default=90, help='Timestamp span ending at --end (default: 90)')
+    parser.add_argument('--end', default=None, help='Newest timestamp, ISO format (default: now)')
+    parser.add_argument('--session-minutes', type=int, default=120, help='Maximum session length (default: 120)')
+    parser.add_argument('--payload-bytes', type=int, default=2048, help='Approximate system_info JSON size (default: 2048)')
+    parser.add_argument('--failure-rate', type=float, default=0.05, help='Fraction of rows with success=0')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--analyze', action='store_true', help='Run ANALYZE when done')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    common = dict(distribution=args.distribution, span_days=args.span_days,
+                  end=datetime.fromisoformat(args.end) if args.end else None,
+                  session_minutes=args.session_minutes, payload_bytes=args.payload_bytes,
+                  failure_rate=args.failure_rate, seed=args.seed)
+    spec = HistorySpec.from_total(args.rows, **common) if args.rows else HistorySpec(**common)
+    overrides = {
+        'changes': args.changes, 'registry_changes': args.registry_changes,
+        'game_spoofs': args.game_spoofs, 'system_info': args.system_info, 'backup_metadata': args.backups,
+        'sessions': args.sessions,
+    }
+    for field_name, value in overrides.items():
+        if value is not None:
+            setattr(spec, field_name, max(0, value))
+    if not spec.sessions:
+        spec.sessions = max(1, (spec.changes + spec.registry_changes + spec.game_spoofs) // 200)
+
+    last_report = [0.0]
+
+    def _progress(table: str, done: int, total: int):
+        now = time.perf_counter()
+        if done == total or now - last_report[0] > 1.0:
+            last_report[0] = now
+            print(f"  {table:<17} {done:>12,} / {total:,}", flush=True)
+
+    t0 = time.perf_counter()
+    written = generate(args.db, spec, _progress)
+    if args.analyze:
+        conn = sqlite3.connect(args.db)
+        try:
+            conn.execute('ANALYZE')
+            conn.commit()
+        finally:
+            conn.close()
+    elapsed = time.perf_counter() - t0
+    total = sum(written.values())
+    print(f"Wrote {total:,} rows to {args.db} in {elapsed:.1f} s ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+    for table, count in written.items():
+        print(f"  {table:<17} {count:>12,}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
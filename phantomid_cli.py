@@ -0,0 +1,348 @@
+"""
+Headless command-line entry point for PhantomID maintenance jobs.
+
+Runs backups, retention cleanup, inventory export and update checks without
+the GUI; nothing here (or in the modules it loads) imports Qt. Suitable for
+Task Scheduler / cron:
+
+    python phantomid_cli.py backup --verify
+    python phantomid_cli.py backup --if-due
+    python phantomid_cli.py cleanup --days 30
+    python phantomid_cli.py export-inventory -o serials.json
+    python phantomid_cli.py check-update
+    python phantomid_cli.py stats --json
+    python phantomid_cli.py inspect-backup backups/phantomid_backup_20240101_120000.bak --diff
+    python phantomid_cli.py check-integrity
+    python phantomid_cli.py registry-backups
+    python phantomid_cli.py export-reg backups/registry/registry_20240101_120000_1a2b3c4d.jsonl.gz -o regs
+    python phantomid_cli.py export-history -o history.ndjson.gz --since 2024-01-01
+    python phantomid_cli.py import-history history.ndjson.gz
+
+Exit status is 0 on success, 1 when the job failed and 2 for usage errors.
+"""
+import sys
+import json
+import logging
+import argparse
+from pathlib import Path
+
+# Only the app's own src/: a src/ under the working directory could shadow core/ and utils/
+_root = Path(__file__).resolve().parent
+SRC_DIR = _root / 'src'
+sys.path.insert(0, str(SRC_DIR))
+
+from core.database_manager import DatabaseManager
+
+logger = logging.getLogger('phantomid.cli')
+
+
+def _open_db(args) -> DatabaseManager:
+    if not args.db:
+        return DatabaseManager()
+    # Keep backups/ next to an explicitly chosen database, as the app does for its own
+    return DatabaseManager(db_path=args.db, base_dir=str(Path(args.db).resolve().parent))
+
+
+def _print(args, payload: dict, text: str) -> None:
+    print(json.dumps(payload, indent=2) if args.json else text)
+
+
+def cmd_backup(args) -> int:
+    from core.backup_scheduler import BackupScheduler, ACTION_WAIT, ACTION_SKIP
+    db = _open_db(args)
+    try:
+        scheduler = BackupScheduler(db)
+        if args.if_due:
+            settings = db.load_settings()
+            try:
+                interval = int(settings.get('backup_interval', 7))
+            except (TypeError, ValueError):
+                interval = 7
+            scheduler.configure(interval, enabled=True)
+            action, detail = scheduler.run_pending(verify=args.verify)
+            if action == ACTION_WAIT:
+                due = scheduler.next_due()
+                _print(args, {'ok': True, 'action': action, 'next_due': due.isoformat(timespec='seconds')},
+                       f"Not due until {due:%Y-%m-%d %H:%M}")
+                return 0
+            if action == ACTION_SKIP:
+                _print(args, {'ok': True, 'action': action, 'reason': detail}, f"Backup skipped: {detail}")
+                return 0
+            path = detail
+        else:
+            path = db.create_backup(verify=args.verify, reason='cli')
+            if path:
+                scheduler.note_backup_taken()
+    finally:
+        db.close()
+    if not path:
+        _print(args, {'ok': False}, "Backup failed (see log output)")
+        return 1
+    _print(args, {'ok': True, 'path': path}, f"Backup created: {path}")
+    return 0
+
+
+def cmd_cleanup(args) -> int:
+    db = _open_db(args)
+    try:
+        days = args.days
+        if days is None:
+            try:
+                days = int(db.load_settings().get('data_retention', 30))
+            except Exception:
+                days = 30
+        removed = db.cleanup_old_data(days)
+    finally:
+        db.close()
+    if removed is None:
+        _print(args, {'ok': False, 'days_kept': days}, "Cleanup failed (see log output)")
+        return 1
+    total = sum(removed.values())
+    detail = ', '.join(f"{table} {count}" for table, count in removed.items())
+    _print(args, {'ok': True, 'days_kept': days, 'rows_removed': total, 'removed': removed},
+           f"Removed {total} row(s) older than {days} days ({detail})")
+    return 0
+
+
+def cmd_export_inventory(args) -> int:
+    from core.inventory import collect_serials_info
+    db = _open_db(args)
+    try:
+        settings = db.load_settings()
+        info = collect_serials_info(settings)
+        if not args.no_save:
+            db.save_system_info(info)
+    finally:
+        db.close()
+    text = json.dumps(info, indent=2)
+    if args.output and args.output != '-':
+        Path(args.output).write_text(text, encoding='utf-8')
+        print(f"Inventory written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+
+def cmd_check_update(args) -> int:
+    from utils.auto_updater import AutoUpdater
+    db = _open_db(args)
+    try:
+        updater = AutoUpdater(_root, db, logger)
+        if args.apply:
+            ok, message = updater.perform_update_if_available()
+            _print(args, {'updated': ok, 'message': message}, message)
+            return 0 if ok or message == 'No updates found.' else 1
+        available, tag = updater.check_update_available()
+    finally:
+        db.close()
+    _print(args, {'update_available': available, 'release': tag},
+           f"Update available: {tag}" if available else f"Up to date{f' ({tag})' if tag else ''}")
+    return 0
+
+
+def cmd_stats(args) -> int:
+    db = _open_db(args)
+    try:
+        stats = db.get_statistics()
+        stats['last_backup'] = db.get_last_backup()
+        stats['unclosed_sessions'] = db.get_unclosed_sessions_count()
+    finally:
+        db.close()
+    lines = [f"{k.replace('_', ' ').capitalize()}: {v}" for k, v in stats.items() if k != 'last_backup']
+    last = stats['last_backup']
+    lines.append(f"Last backup: {last['created_at']} ({last['backup_path']})" if last else "Last backup: never")
+    _print(args, stats, "\n".join(lines))
+    return 0
+
+
+def cmd_inspect_backup(args) -> int:
+    from core.backup_inspector import inspect_backup, diff_backup
+    info = inspect_backup(args.path)
+    if not info.ok:
+        _print(args, {'ok': False, 'error': info.error}, f"Cannot read backup: {info.error}")
+        return 1
+    payload = {'ok': True, 'path': info.path, 'size_bytes': info.size_bytes, 'modified': info.modified, 'tables': info.tables}
+    lines = [f"{info.path} ({info.size_bytes / 1048576:.1f} MB, modified {info.modified})"]
+    if args.diff:
+        db = _open_db(args)
+        try:
+            live_path = db.db_path.as_posix()
+        finally:
+            db.close()
+        diffs = diff_backup(live_path, args.path)
+        payload['diff'] = [{'table': d.table, 'status': d.status, 'backup_rows': d.backup_rows, 'live_rows': d.live_rows,
+                            'added': d.added, 'removed': d.removed, 'changed': d.changed, 'samples': d.samples}
+                           for d in diffs]
+        lines.append(f"  {'table':<20} {'backup':>10} {'live':>10} {'added':>8} {'removed':>8} {'changed':>8}  status")
+        for d in diffs:
+            backup_rows = '-' if d.backup_rows is None else f"{d.backup_rows:,}"
+            live_rows = '-' if d.live_rows is None else f"{d.live_rows:,}"
+            lines.append(f"  {d.table:<20} {backup_rows:>10} {live_rows:>10} {d.added:>8,} {d.removed:>8,} {d.changed:>8,}  {d.status}")
+    else:
+        lines.extend(f"  {table:<20} {count:>10,}" for table, count in info.tables.items())
+    _print(args, payload, "\n".join(lines))
+    return 0
+
+
+def cmd_check_integrity(args) -> int:
+    from core.integrity import IntegrityScanner
+    db = _open_db(args)
+    try:
+        report = IntegrityScanner(db).run_pass()
+    finally:
+        db.close()
+    payload = {'ok': report.ok, 'tables_checked': report.tables_checked, 'backup_path': report.backup_path,
+               'backup_status': report.backup_status,
+               'issues': [{'source': i.source, 'target': i.target, 'message': i.message} for i in report.issues]}
+    lines = [f"Database: {report.tables_checked} tables checked, {'ok' if report.database_ok else 'DAMAGED'}",
+             f"Newest backup: {report.backup_status}" + (f" ({report.backup_path})" if report.backup_path else '')]
+    lines.extend(f"  {i.source} {i.target}: {i.message}" for i in report.issues)
+    _print(args, payload, "\n".join(lines))
+    return 0 if report.ok else 1
+
+
+def cmd_registry_backups(args) -> int:
+    from core.registry_backup import list_archives
+    db = _open_db(args)
+    try:
+        archives = list_archives(db)
+    finally:
+        db.close()
+    lines = [f"{a['name']}  {a['size_bytes'] / 1024:.1f} KB  {a['records']} key(s)"
+             + (f"  {a['damaged']} DAMAGED" if a['damaged'] else '') for a in archives] or ["No registry backups"]
+    _print(args, {'archives': archives}, "\n".join(lines))
+    return 1 if any(a['damaged'] for a in archives) else 0
+
+
+def cmd_export_reg(args) -> int:
+    from core.registry_backup import iter_reg_exports
+    files = list(iter_reg_exports(args.archive, args.output, args.key))
+    _print(args, {'files': files}, "\n".join(files) if files else "No matching keys")
+    return 0 if files else 1
+
+
+def _transfer_progress(args):
+    if args.json or not sys.stderr.isatty():
+        return None
+    return lambda table, rows: print(f"\r  {table}: {rows:,} rows", end='', file=sys.stderr, flush=True)
+
+
+def _transfer_text(verb: str, result) -> str:
+    lines = [f"  {table}: {rows:,}" for table, rows in result.rows.items()]
+    lines.append(f"{verb} {result.total_rows:,} rows in {result.seconds:.2f}s ({result.rows_per_s:,.0f} rows/s)")
+    if result.skipped:
+        lines.append(f"Skipped {result.skipped:,} rows (duplicate ids or unknown tables)")
+    return "\n".join(lines)
+
+
+def cmd_export_history(args) -> int:
+    from core.history_io import export_history
+    tables = [t.strip() for t in args.tables.split(',') if t.strip()] if args.tables else None
+    db = _open_db(args)
+    try:
+        progress = _transfer_progress(args)
+        result = export_history(db, args.output, tables=tables, since=args.since, until=args.until,
+                                fmt=args.format, compress=args.gzip, progress=progress)
+        if progress:
+            print(file=sys.stderr)
+    finally:
+        db.close()
+    _print(args, result.as_dict(), _transfer_text("Exported", result) + f"\nWritten: {', '.join(result.files)}")
+    return 0
+
+
+def cmd_import_history(args) -> int:
+    from core.history_io import import_history
+    db = _open_db(args)
+    try:
+        progress = _transfer_progress(args)
+        result = import_history(db, args.input, table=args.table, fmt=args.format,
+                                keep_ids=args.keep_ids, batch_size=args.batch_size, progress=progress)
+        if progress:
+            print(file=sys.stderr)
+    finally:
+        db.close()
+    _print(args, result.as_dict(), _transfer_text("Imported", result))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='phantomid_cli', description='PhantomID headless maintenance')
+    parser.add_argument('--db', default=None, help='Database path (default: phantomid.db next to the app); backups go to backups/ beside it')
+    parser.add_argument('--json', action='store_true', help='Machine-readable output')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Log at INFO level')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('backup', help='Create a database backup')
+    p.add_argument('--verify', action='store_true', help='Count rows in the backup after writing it')
+    p.add_argument('--if-due', action='store_true',
+                   help='Follow the auto-backup schedule: only back up once the interval has passed and the data changed')
+    p.set_defaults(func=cmd_backup)
+
+    p = sub.add_parser('cleanup', help='Delete history older than the retention period')
+    p.add_argument('--days', type=int, default=None, help='Days to keep (default: data_retention setting)')
+    p.set_defaults(func=cmd_cleanup)
+
+    p = sub.add_parser('export-inventory', help='Collect hardware serials and write them as JSON')
+    p.add_argument('-o', '--output', default='-', help='Output file (default: stdout)')
+    p.add_argument('--no-save', action='store_true', help='Do not store the snapshot in system_info')
+    p.set_defaults(func=cmd_export_inventory)
+
+    p = sub.add_parser('check-update', help='Check GitHub for a newer release')
+    p.add_argument('--apply', action='store_true', help='Download and apply the update if one is available')
+    p.set_defaults(func=cmd_check_update)
+
+    p = sub.add_parser('stats', help='Show history and backup statistics')
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser('inspect-backup', help='Show the tables in a backup without restoring it')
+    p.add_argument('path', help='Backup file (.bak)')
+    p.add_argument('--diff', action='store_true', help='Compare it row by row with the live database')
+    p.set_defaults(func=cmd_inspect_backup)
+
+    p = sub.add_parser('check-integrity', help='Run quick_check on the database and verify the newest backup')
+    p.set_defaults(func=cmd_check_integrity)
+
+    p = sub.add_parser('registry-backups', help='List registry backup archives and verify their checksums')
+    p.set_defaults(func=cmd_registry_backups)
+
+    p = sub.add_parser('export-reg', help='Write standard .reg files from a registry backup archive')
+    p.add_argument('archive', help='Archive in backups/registry (.jsonl.gz)')
+    p.add_argument('-o', '--output', default='.', help='Directory for the .reg files (default: current directory)')
+    p.add_argument('--key', default=None, help='Only keys whose path or label contains this text')
+    p.set_defaults(func=cmd_export_reg)
+
+    p = sub.add_parser('export-history', help='Stream history tables to NDJSON or CSV')
+    p.add_argument('-o', '--output', required=True, help='Output file; .csv selects CSV, .gz compresses')
+    p.add_argument('--tables', default=None, help='Comma-separated tables (default: all history tables)')
+    p.add_argument('--since', default=None, help='Only rows at or after this time (ISO format)')
+    p.add_argument('--until', default=None, help='Only rows before this time (ISO format)')
+    p.add_argument('--format', choices=('ndjson', 'csv'), default=None, help='Override the format implied by the file name')
+    p.add_argument('--gzip', action='store_true', help='Compress the output (adds .gz)')
+    p.set_defaults(func=cmd_export_history)
+
+    p = sub.add_parser('import-history', help='Bulk-load an NDJSON or CSV history export')
+    p.add_argument('input', help='File written by export-history (.gz is detected automatically)')
+    p.add_argument('--table', default=None, help='Target table for CSV files (default: taken from the file name)')
+    p.add_argument('--format', choices=('ndjson', 'csv'), default=None, help='Override the format implied by the file name')
+    p.add_argument('--keep-ids', action='store_true', help='Keep row ids and skip rows whose id already exists')
+    p.add_argument('--batch-size', type=int, default=50000, help='Rows per transaction (default: 50000)')
+    p.set_defaults(func=cmd_import_history)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', stream=sys.stderr)
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        return 1
+    except Exception as e:
+        logger.error(f"{args.command} failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""
+Change-aware auto-backup scheduling.
+
+The schedule is anchored to the last backup or skip, persisted in the
+database (backup_metadata) and in a small JSON sidecar next to it, so it
+survives restarts; a window that passed while the app was closed is caught
+up on the next start. When a backup falls due the scheduler first asks
+whether anything changed since the last one:
+
+1. SQLite's file change counter equals the value saved after the last
+   backup or skip: nothing was written at all.
+2. Otherwise the content fingerprint (row counts and max rowids of the
+   history tables, a hash of the settings) is compared, so writes the app
+   makes on its own (sessions, metric flushes) do not force a backup.
+
+Unchanged databases get a 'skipped' row in backup_metadata instead of a copy.
+While the integrity scanner reports a damaged database the scheduler is held:
+due backups are skipped so the rotation keeps the last good copies.
+Nothing here imports Qt; the GUI drives it from a timer and the CLI calls
+run_pending() directly.
+"""
+import os
+import json
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_DAYS = 7
+# A backup that starts this long after its due time is reported as a catch-up
+CATCH_UP_GRACE = timedelta(minutes=15)
+
+ACTION_WAIT = 'wait'
+ACTION_SKIP = 'skip'
+ACTION_TAKE = 'take'
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+class BackupScheduler:
+    def __init__(self, db_manager, state_path: Optional[str] = None):
+        self.db_manager = db_manager
+        db_path = Path(db_manager.db_path)
+        self.state_path = Path(state_path) if state_path else db_path.with_name(db_path.stem + '.backup-state.json')
+        self.interval = timedelta(days=DEFAULT_INTERVAL_DAYS)
+        self.enabled = True
+        self.held_reason: Optional[str] = None
+        self._state: Dict[str, Any] = self._load_state()
+
+    def configure(self, interval_days: int, enabled: bool = True) -> None:
+        self.interval = timedelta(days=max(1, int(interval_days)))
+        self.enabled = bool(enabled)
+
+    def hold(self, reason: str) -> None:
+        """Skip due backups until release(), e.g. while the live database fails its integrity check."""
+        if self.held_reason != reason:
+            logger.warning(f"Auto-backups held: {reason}")
+        self.held_reason = reason
+
+    def release(self) -> None:
+        if self.held_reason:
+            logger.info("Auto-backups resumed")
+        self.held_reason = None
+
+    # ---------- Persistent state ----------
+    def _load_state(self) -> Dict[str, Any]:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable backup state {self.state_path}: {e}")
+            return {}
+
+    def _save_state(self) -> None:
+        tmp = self.state_path.with_name(self.state_path.name + '.tmp')
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self._state, f, indent=2)
+            os.replace(tmp, self.state_path)
+        except Exception as e:
+            logger.warning(f"Failed to write backup state {self.state_path}: {e}")
+
+    def _remember(self, result: str) -> None:
+        # Read after the backup_metadata write so our own record does not count as a change
+        self._state = {
+            'checked_at': datetime.now().isoformat(timespec='seconds'),
+            'result': result,
+            'change_counter': self.db_manager.change_counter(),
+            'fingerprint': self.db_manager.content_fingerprint(),
+        }
+        self._save_state()
+
+    # ---------- Schedule ----------
+    def last_run(self) -> Optional[datetime]:
+        """Time of the last backup or skip, whichever is later."""
+        candidates = [_parse_time(self._state.get('checked_at'))]
+        last = self.db_manager.get_last_backup()
+        if last:
+            candidates.append(_parse_time(last.get('created_at')))
+        candidates = [c for c in candidates if c]
+        return max(candidates) if candidates else None
+
+    def next_due(self) -> Optional[datetime]:
+        if not self.enabled:
+            return None
+        last = self.last_run()
+        return last + self.interval if last else datetime.now()
+
+    def seconds_until_due(self, now: Optional[datetime] = None) -> Optional[float]:
+        due = self.next_due()
+        if due is None:
+            return None
+        return max(0.0, (due - (now or datetime.now())).total_seconds())
+
+    def has_changes(self) -> Tuple[bool, str]:
+        """Return (changed, how it was decided)."""
+        if not self._state:
+            return True, 'no previous state'
+        last = self.db_manager.get_last_backup()
+        if last and (_parse_time(last.get('created_at')) or datetime.min) > (_parse_time(self._state.get('checked_at')) or datetime.min):
+            # A backup was taken without us (e.g. by an older build); its content is unknown
+            return True, 'state older than last backup'
+        counter = self.db_manager.change_counter()
+        if counter is not None and counter == self._state.get('change_counter'):
+            return False, 'change counter unchanged'
+        if self.db_manager.content_fingerprint() == self._state.get('fingerprint'):
+            return False, 'only housekeeping writes'
+        return True, 'data changed'
+
+    def evaluate(self, now: Optional[datetime] = None) -> Tuple[str, str]:
+        """
+        Decide what to do now: (ACTION_WAIT, ''), (ACTION_SKIP, why) or
+        (ACTION_TAKE, 'scheduled' | 'catch-up' | 'first').
+        """
+        if not self.enabled:
+            return ACTION_WAIT, ''
+        now = now or datetime.now()
+        last = self.last_run()
+        if last is not None and now < last + self.interval:
+            return ACTION_WAIT, ''
+        if self.held_reason:
+            return ACTION_SKIP, self.held_reason
+        if last is None:
+            return ACTION_TAKE, 'first'
+        due = last + self.interval
+        changed, why = self.has_changes()
+        if not changed:
+            return ACTION_SKIP, why
+        return ACTION_TAKE, 'catch-up' if now - due > CATCH_UP_GRACE else 'scheduled'
+
+    def record_skip(self, why: str = 'unchanged') -> None:
+        self.db_manager.record_backup_skip(reason=why)
+        self._remember('skipped')
+        logger.info(f"Auto-backup skipped: {why}")
+
+    def note_backup_taken(self) -> None:
+        """Call after any successful backup, manual ones included, to restart the interval."""
+        self._remember('taken')
+
+    def run_pending(self, now: Optional[datetime] = None, verify: bool = False) -> Tuple[str, Optional[str]]:
+        """
+        Evaluate and act synchronously. Returns (action, backup path or skip
+        reason); the backup path is None when creating it failed.
+        """
+        action, detail = self.evaluate(now)
+        if action == ACTION_SKIP:
+            self.record_skip(detail)
+            return action, detail
+        if action == ACTION_TAKE:
+            path = self.db_manager.create_backup(verify=verify, reason=detail)
+            if path:
+                self.note_backup_taken()
+            return action, path
+        return action, None
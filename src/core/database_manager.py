@@ -4,7 +4,10 @@ import sqlite3
 import shutil
 import logging
 import uuid
+import time
 import typing
+import threading
+import hashlib
 import ctypes
 try:
     import winreg  # Windows registry access
@@ -13,17 +16,118 @@ except Exception:  # pragma: no cover
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from core.metrics import metrics
+
+# Browsable history: sort column, unique tiebreak column and displayed columns per source.
+# Pages are fetched with keyset pagination on (time, key), newest first.
+HISTORY_SOURCES = {
+    'changes': {
+        'time': 'timestamp', 'key': 'id',
+        'columns': ['timestamp', 'item', 'original_value', 'new_value', 'success', 'error_message', 'session_id'],
+        'fts': 'changes_fts', 'search': ['item', 'error_message'],
+    },
+    'registry_changes': {
+        'time': 'timestamp', 'key': 'id',
+        'columns': ['timestamp', 'key_path', 'value_name', 'original_value', 'new_value', 'success', 'session_id'],
+        'fts': 'registry_changes_fts', 'search': ['key_path', 'value_name'],
+    },
+    'sessions': {
+        'time': 'started_at', 'key': 'rowid',
+        'columns': ['started_at', 'ended_at', 'id'],
+        'fts': None, 'search': ['id'],
+    },
+}
+HISTORY_PAGE_SIZE = 200
+# Written by the app itself on every run (session bookkeeping, metric flushes,
+# backup records); changes confined to these do not make a new backup worthwhile.
+HOUSEKEEPING_TABLES = {'sessions', 'metrics', 'backup_metadata', 'sqlite_sequence', 'sqlite_stat1'}
+# Tables pruned by cleanup_old_data, with the column holding each row's age
+CLEANUP_TABLES = (('changes', 'timestamp'), ('game_spoofs', 'timestamp'),
+                  ('registry_changes', 'timestamp'), ('metrics', 'recorded_at'))
+# Another process (a second window, a scheduled CLI job) may hold the write lock.
+# SQLite's busy handler waits up to BUSY_TIMEOUT_MS; a write that still fails with
+# SQLITE_BUSY (e.g. lock upgrade deadlock, which the handler cannot wait out) is
+# rolled back and retried with backoff.
+BUSY_TIMEOUT_MS = 5000
+BUSY_RETRIES = 3
+BUSY_RETRY_DELAY_S = 0.05
+
+
+def _is_busy(error: Exception) -> bool:
+    text = str(error).lower()
+    return isinstance(error, sqlite3.OperationalError) and ('locked' in text or 'busy' in text)
+
+
+def file_sha256(path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 
 class DatabaseManager:
-    def __init__(self, db_path: str | None = None):
+    def __init__(self, db_path: str | None = None, base_dir: str | None = None):
         self.logger = logging.getLogger(__name__)
-        base_dir = Path(__file__).resolve().parents[2]
+        # base_dir holds the default database and the backups/ folder
+        base_dir = Path(base_dir) if base_dir else Path(__file__).resolve().parents[2]
         self.base_dir = base_dir
-        self.db_path = Path(db_path) if db_path else base_dir / 'phantomid.db'
-        self.conn = sqlite3.connect(self.db_path.as_posix(), check_same_thread=False)
-        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.db_path = Path(db_path) if db_path else self.default_path(base_dir)
+        self.conn = self._connect()
+        # self.conn is shared by the GUI thread and pool workers; a transaction
+        # (statements, commit, rollback) must not interleave with another thread's
+        self._write_lock = threading.RLock()
+        self.fts_available = False
+        # (session id, started_at) of the session this process opened
+        self.active_session: tuple[str, str] | None = None
         self.setup_database()
 
+    @staticmethod
+    def default_path(base_dir: str | Path | None = None) -> Path:
+        return Path(base_dir or Path(__file__).resolve().parents[2]) / 'phantomid.db'
+
+    def _connect(self) -> sqlite3.Connection:
+        # timeout= installs SQLite's busy handler on the connection
+        conn = sqlite3.connect(self.db_path.as_posix(), check_same_thread=False, timeout=BUSY_TIMEOUT_MS / 1000)
+        conn.execute('PRAGMA foreign_keys = ON')
+        return conn
+
+    def _write(self, apply: typing.Callable[[sqlite3.Cursor], typing.Any]):
+        """
+        Run apply(cursor) and commit as one transaction, retrying when another
+        process keeps the database locked past the busy timeout. Holds the
+        manager's write lock throughout, so a rollback here never discards
+        statements another thread ran on the shared connection.
+        """
+        with self._write_lock:
+            delay = BUSY_RETRY_DELAY_S
+            started = time.perf_counter()
+            for attempt in range(BUSY_RETRIES + 1):
+                try:
+                    result = apply(self.conn.cursor())
+                    self.conn.commit()
+                    if attempt:
+                        metrics.observe('db.busy.wait', (time.perf_counter() - started) * 1000.0)
+                    return result
+                except Exception as e:
+                    # Leave nothing pending for the next thread's commit
+                    try:
+                        self.conn.rollback()
+                    except Exception:
+                        pass
+                    if not _is_busy(e):
+                        raise
+                    if attempt == BUSY_RETRIES:
+                        metrics.incr('db.busy.failed')
+                        self.logger.error(f"Database write gave up after {attempt + 1} attempts, locked by another process: {e}")
+                        raise
+                    metrics.incr('db.busy.retry')
+                    time.sleep(delay)
+                    delay *= 2
+
+    def _execute_write(self, sql: str, params: typing.Sequence | dict = ()) -> sqlite3.Cursor:
+        return self._write(lambda cur: cur.execute(sql, params))
+
     # ---------- Schema ----------
     def setup_database(self) -> None:
         cur = self.conn.cursor()
@@ -83,20 +187,6 @@ class DatabaseManager:
                )'''
         )
 
-        # Spoofed registry changes (requested table name)
-        cur.execute(
-            '''CREATE TABLE IF NOT EXISTS registry_spoof (
-                   id INTEGER PRIMARY KEY AUTOINCREMENT,
-                   timestamp TEXT NOT NULL DEFAULT (datetime('now')),
-                   key_path TEXT,
-                   value_name TEXT,
-                   original_value TEXT,
-                   spoofed_value TEXT,
-                   success INTEGER DEFAULT 1,
-                   session_id TEXT
-               )'''
-        )
-
         # Settings and sessions
         cur.execute(
             '''CREATE TABLE IF NOT EXISTS app_settings (
@@ -132,6 +222,22 @@ class DatabaseManager:
                )'''
         )
 
+        # Aggregated operation metrics, one row per metric per flush interval
+        cur.execute(
+            '''CREATE TABLE IF NOT EXISTS metrics (
+                   id INTEGER PRIMARY KEY AUTOINCREMENT,
+                   recorded_at TEXT NOT NULL,
+                   name TEXT NOT NULL,
+                   kind TEXT NOT NULL,
+                   count INTEGER NOT NULL,
+                   total_ms REAL,
+                   p50_ms REAL,
+                   p95_ms REAL,
+                   max_ms REAL
+               )'''
+        )
+        cur.execute('CREATE INDEX IF NOT EXISTS idx_metrics_name_time ON metrics(name, recorded_at)')
+
         self.conn.commit()
 
         # ---------- Lightweight migrations ----------
@@ -163,6 +269,8 @@ class DatabaseManager:
             ('success', 'INTEGER DEFAULT 1'),
             ('session_id', 'TEXT')
         ])
+        self._migrate_registry_spoof(cur)
+        self._setup_history_indexes(cur)
 
         # Ensure backup_metadata has required columns and map legacy names
         try:
@@ -174,6 +282,16 @@ class DatabaseManager:
                 cur.execute('ALTER TABLE backup_metadata ADD COLUMN size_bytes INTEGER')
             if 'included_tables' not in bm_cols:
                 cur.execute('ALTER TABLE backup_metadata ADD COLUMN included_tables TEXT')
+            # taken/skipped, why the backup ran (or did not), and the database's change counter at the time
+            if 'status' not in bm_cols:
+                cur.execute("ALTER TABLE backup_metadata ADD COLUMN status TEXT DEFAULT 'taken'")
+            if 'reason' not in bm_cols:
+                cur.execute('ALTER TABLE backup_metadata ADD COLUMN reason TEXT')
+            if 'change_counter' not in bm_cols:
+                cur.execute('ALTER TABLE backup_metadata ADD COLUMN change_counter INTEGER')
+            # SHA-256 of the backup file as written, checked later by the integrity scanner
+            if 'checksum' not in bm_cols:
+                cur.execute('ALTER TABLE backup_metadata ADD COLUMN checksum TEXT')
             # Map legacy backup_path -> file_path if present
             cur.execute("PRAGMA table_info(backup_metadata)")
             bm_cols2 = {row[1] for row in cur.fetchall()}
@@ -232,11 +350,151 @@ class DatabaseManager:
         except Exception as e:
             self.logger.warning(f"Migration: sessions table rebuild failed: {e}")
 
+        # Heartbeat columns. Sessions left open by crashes before heartbeats existed are
+        # closed once here, so crash detection only ever has to look at the newest session.
+        try:
+            cur.execute("PRAGMA table_info(sessions)")
+            if 'last_seen' not in {row[1] for row in cur.fetchall()}:
+                _ensure_columns('sessions', [('last_seen', 'TEXT'), ('crashed', 'INTEGER DEFAULT 0')])
+                cur.execute(
+                    "UPDATE sessions SET ended_at=started_at, crashed=1 "
+                    "WHERE (ended_at IS NULL OR ended_at='') "
+                    "AND rowid NOT IN (SELECT rowid FROM sessions ORDER BY started_at DESC LIMIT 1)"
+                )
+                self.conn.commit()
+        except Exception as e:
+            self.logger.warning(f"Migration: session heartbeat columns failed: {e}")
+
         self.conn.commit()
 
+    def _migrate_registry_spoof(self, cur) -> None:
+        """
+        registry_spoof used to be a second table holding a copy of every
+        registry_changes row. It is now a view over registry_changes; the
+        INSTEAD OF triggers keep legacy INSERT/DELETE statements working.
+        """
+        try:
+            cur.execute("SELECT type FROM sqlite_master WHERE name='registry_spoof'")
+            row = cur.fetchone()
+            if row and row[0] == 'table':
+                cur.execute('SELECT COUNT(*) FROM registry_spoof')
+                spoof_rows = int(cur.fetchone()[0])
+                # Older builds could commit one table's INSERT without the other's. Rows
+                # are compared as multisets over every column (NULL-safe through quote()):
+                # a row stored k times in the mirror and j < k times in registry_changes
+                # gets k - j copies. Rows whose two datetime('now') defaults fell in
+                # different seconds do not match and are copied as separate rows.
+                key = lambda value_col: "||'|'||".join(
+                    f"quote({c})" for c in ('timestamp', 'key_path', 'value_name', 'original_value',
+                                            value_col, 'success', 'session_id'))
+                cur.execute(
+                    f'CREATE TEMP TABLE _spoof_counts AS SELECT {key("spoofed_value")} AS k, timestamp, key_path, '
+                    'value_name, original_value, spoofed_value, success, session_id, COUNT(*) AS n '
+                    'FROM registry_spoof GROUP BY k'
+                )
+                cur.execute(f'CREATE TEMP TABLE _changes_counts AS SELECT {key("new_value")} AS k, COUNT(*) AS n '
+                            'FROM registry_changes GROUP BY k')
+                cur.execute('CREATE UNIQUE INDEX temp._spoof_counts_k ON _spoof_counts (k)')
+                cur.execute('CREATE UNIQUE INDEX temp._changes_counts_k ON _changes_counts (k)')
+                cur.execute(
+                    'INSERT INTO registry_changes (timestamp, key_path, value_name, original_value, new_value, success, session_id) '
+                    'WITH RECURSIVE missing (k, remaining) AS ('
+                    'SELECT s.k, s.n - COALESCE(c.n, 0) FROM _spoof_counts s LEFT JOIN _changes_counts c ON c.k = s.k '
+                    'WHERE s.n > COALESCE(c.n, 0) '
+                    'UNION ALL SELECT k, remaining - 1 FROM missing WHERE remaining > 1) '
+                    'SELECT s.timestamp, s.key_path, s.value_name, s.original_value, s.spoofed_value, s.success, s.session_id '
+                    'FROM missing JOIN _spoof_counts s ON s.k = missing.k'
+                )
+                copied = cur.rowcount
+                cur.execute('DROP TABLE registry_spoof')
+                self.conn.commit()
+                cur.execute('DROP TABLE temp._spoof_counts')
+                cur.execute('DROP TABLE temp._changes_counts')
+                if spoof_rows:
+                    # Return the mirror's pages to the filesystem once
+                    self.conn.execute('VACUUM')
+                self.logger.info(f"Migration: registry_spoof mirror table ({spoof_rows} rows, {copied} copied) replaced by a view")
+            cur.execute(
+                '''CREATE VIEW IF NOT EXISTS registry_spoof AS
+                   SELECT id, timestamp, key_path, value_name, original_value,
+                          new_value AS spoofed_value, success, session_id
+                   FROM registry_changes'''
+            )
+            cur.execute(
+                '''CREATE TRIGGER IF NOT EXISTS registry_spoof_insert
+                   INSTEAD OF INSERT ON registry_spoof
+                   BEGIN
+                       INSERT INTO registry_changes (timestamp, key_path, value_name, original_value, new_value, success, session_id)
+                       VALUES (COALESCE(NEW.timestamp, datetime('now')), NEW.key_path, NEW.value_name,
+                               NEW.original_value, NEW.spoofed_value, COALESCE(NEW.success, 1), NEW.session_id);
+                   END'''
+            )
+            cur.execute(
+                '''CREATE TRIGGER IF NOT EXISTS registry_spoof_delete
+                   INSTEAD OF DELETE ON registry_spoof
+                   BEGIN
+                       DELETE FROM registry_changes WHERE id = OLD.id;
+                   END'''
+            )
+            self.conn.commit()
+        except Exception as e:
+            # Keep the copy and the DROP together: a failed migration leaves the mirror as it was
+            self.conn.rollback()
+            for table in ('_spoof_counts', '_changes_counts'):
+                try:
+                    self.conn.execute(f'DROP TABLE IF EXISTS temp.{table}')
+                except Exception:
+                    pass
+            self.logger.warning(f"Migration: registry_spoof view setup failed: {e}")
+
+    def _setup_history_indexes(self, cur) -> None:
+        """Indexes for keyset pagination plus FTS5 indexes kept in sync by triggers."""
+        try:
+            # The rowid is implicitly the last index column, so these serve ORDER BY (timestamp, id)
+            cur.execute('CREATE INDEX IF NOT EXISTS idx_changes_timestamp ON changes(timestamp)')
+            cur.execute('CREATE INDEX IF NOT EXISTS idx_registry_changes_timestamp ON registry_changes(timestamp)')
+            cur.execute('CREATE INDEX IF NOT EXISTS idx_sessions_started_at ON sessions(started_at)')
+            self.conn.commit()
+        except Exception as e:
+            self.logger.warning(f"Migration: history indexes failed: {e}")
+
+        self.fts_available = True
+        for source in ('changes', 'registry_changes'):
+            fts = HISTORY_SOURCES[source]['fts']
+            cols = HISTORY_SOURCES[source]['search']
+            col_list = ', '.join(cols)
+            new_vals = ', '.join(f'new.{c}' for c in cols)
+            old_vals = ', '.join(f'old.{c}' for c in cols)
+            try:
+                cur.execute("SELECT 1 FROM sqlite_master WHERE name=?", (fts,))
+                existed = cur.fetchone() is not None
+                # External content: the index refers to rows of the source table instead of copying them
+                cur.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({col_list}, content='{source}', content_rowid='id')")
+                cur.execute(f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {source} BEGIN "
+                            f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals}); END")
+                cur.execute(f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {source} BEGIN "
+                            f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals}); END")
+                cur.execute(f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {source} BEGIN "
+                            f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals}); "
+                            f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals}); END")
+                if not existed:
+                    cur.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+                self.conn.commit()
+            except sqlite3.OperationalError as e:
+                # SQLite built without FTS5: searches fall back to LIKE
+                self.fts_available = False
+                self.logger.warning(f"Full-text index {fts} unavailable: {e}")
+                try:
+                    self.conn.rollback()
+                except Exception:
+                    pass
+
     # ---------- Backup and Restore ----------
-    def create_backup(self, verify: bool = False, progress_cb: typing.Callable[[int], None] | None = None) -> str | None:
+    @metrics.timed('backup.create')
+    def create_backup(self, verify: bool = False, progress_cb: typing.Callable[[int], None] | None = None,
+                      reason: str = 'manual') -> str | None:
         try:
+            change_counter = self.change_counter()
             backups_dir = self.base_dir / 'backups'
             backups_dir.mkdir(parents=True, exist_ok=True)
             ts = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -301,7 +559,8 @@ class DatabaseManager:
                     except Exception:
                         pass
                 try:
-                    self.conn.commit()
+                    with self._write_lock:
+                        self.conn.commit()
                 except Exception:
                     pass
             finally:
@@ -359,13 +618,15 @@ class DatabaseManager:
                 values['backup_name'] = backup_path.name
             if 'backup_path' in bm_cols:
                 values['backup_path'] = backup_path.as_posix()
-            insert_cols = [c for c in ['created_at','file_path','size_bytes','included_tables','backup_name','backup_path'] if c in bm_cols]
+            values.update({'status': 'taken', 'reason': reason, 'change_counter': change_counter,
+                           'checksum': file_sha256(backup_path)})
+            insert_cols = [c for c in ['created_at','file_path','size_bytes','included_tables','backup_name','backup_path',
+                                       'status','reason','change_counter','checksum'] if c in bm_cols]
             placeholders = ', '.join(['?'] * len(insert_cols))
-            cur.execute(
+            self._execute_write(
                 f"INSERT INTO backup_metadata ({', '.join(insert_cols)}) VALUES ({placeholders})",
                 [values[c] for c in insert_cols]
             )
-            self.conn.commit()
             if progress_cb:
                 try:
                     progress_cb(100)
@@ -377,57 +638,165 @@ class DatabaseManager:
             )
             return backup_path.as_posix()
         except Exception as e:
+            metrics.fail('backup.create')
             self.logger.error(f"Backup creation failed: {e}")
             return None
 
+    @metrics.timed('backup.restore')
     def restore_backup(self, backup_file_path: str) -> bool:
         try:
             src = Path(backup_file_path)
             if not src.exists():
                 self.logger.error(f"Backup file not found: {backup_file_path}")
                 return False
-            # Close existing connection before overwriting
-            try:
-                self.conn.close()
-            except Exception:
-                pass
-            shutil.copy2(src.as_posix(), self.db_path.as_posix())
-            # Reopen connection and ensure schema/migrations applied
-            self.conn = sqlite3.connect(self.db_path.as_posix(), check_same_thread=False)
-            self.conn.execute('PRAGMA foreign_keys = ON')
-            self.setup_database()
+            with self._write_lock:
+                # Close existing connection before overwriting
+                try:
+                    self.conn.close()
+                except Exception:
+                    pass
+                shutil.copy2(src.as_posix(), self.db_path.as_posix())
+                # Reopen connection and ensure schema/migrations applied
+                self.conn = self._connect()
+                self.setup_database()
+            # The restored file predates this session; put it back so it can still end cleanly
+            self.heartbeat()
             self.logger.info("Backup restored and schema verified")
             return True
         except Exception as e:
+            metrics.fail('backup.restore')
             self.logger.error(f"Backup restore failed: {e}")
             return False
 
+    def record_backup_skip(self, reason: str = 'unchanged') -> None:
+        try:
+            self._execute_write(
+                "INSERT INTO backup_metadata (created_at, file_path, size_bytes, included_tables, status, reason, change_counter) "
+                "VALUES (?, '', 0, '{}', 'skipped', ?, ?)",
+                (datetime.now().isoformat(timespec='seconds'), reason, self.change_counter())
+            )
+        except Exception as e:
+            self.logger.warning(f"record_backup_skip failed: {e}")
+
+    # ---------- Change detection ----------
+    def change_counter(self) -> int | None:
+        """
+        SQLite's file change counter (header bytes 24-27), bumped by every
+        committed write. None in WAL mode, where the counter is not maintained.
+        """
+        try:
+            mode = self.conn.execute('PRAGMA journal_mode').fetchone()[0]
+            if str(mode).lower() == 'wal':
+                return None
+            with open(self.db_path, 'rb') as f:
+                header = f.read(28)
+            return int.from_bytes(header[24:28], 'big') if len(header) == 28 else None
+        except Exception as e:
+            self.logger.warning(f"change_counter failed: {e}")
+            return None
+
+    def content_fingerprint(self) -> dict:
+        """
+        Cheap summary of the user-visible data: (row count, max rowid) per
+        append-only table and a hash of the settings. Housekeeping tables and
+        full-text index internals are left out.
+        """
+        fingerprint: dict = {}
+        try:
+            cur = self.conn.cursor()
+            cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND sql NOT LIKE 'CREATE VIRTUAL%' ORDER BY name")
+            fts_tables = {spec['fts'] for spec in HISTORY_SOURCES.values() if spec['fts']}
+            for (name,) in cur.fetchall():
+                if name in HOUSEKEEPING_TABLES or any(name.startswith(f + '_') for f in fts_tables):
+                    continue
+                if name == 'app_settings':
+                    cur.execute('SELECT key, value FROM app_settings ORDER BY key')
+                    fingerprint[name] = hashlib.sha1(json.dumps(cur.fetchall()).encode('utf-8')).hexdigest()
+                else:
+                    cur.execute(f'SELECT COUNT(*), MAX(rowid) FROM "{name}"')
+                    fingerprint[name] = list(cur.fetchone())
+        except Exception as e:
+            self.logger.warning(f"content_fingerprint failed: {e}")
+        return fingerprint
+
     # ---------- CRUD helpers ----------
     # Sessions
     def start_session(self) -> str:
         try:
             session_id = uuid.uuid4().hex
-            self.conn.execute(
-                'INSERT INTO sessions (id, started_at, ended_at) VALUES (?, ?, ?)',
-                (session_id, datetime.now().isoformat(timespec='seconds'), None)
+            now = datetime.now().isoformat(timespec='seconds')
+            self._execute_write(
+                'INSERT INTO sessions (id, started_at, ended_at, last_seen) VALUES (?, ?, ?, ?)',
+                (session_id, now, None, now)
             )
-            self.conn.commit()
+            self.active_session = (session_id, now)
             return session_id
         except Exception as e:
             self.logger.warning(f"start_session failed: {e}")
             # Fallback to deterministic value
             return uuid.uuid4().hex
 
+    def heartbeat(self) -> None:
+        """
+        Stamp the active session as alive: a single primary-key upsert. It also
+        re-creates the row if a restore replaced the database mid-session.
+        """
+        if not self.active_session:
+            return
+        session_id, started_at = self.active_session
+        try:
+            self._execute_write(
+                'INSERT INTO sessions (id, started_at, last_seen) VALUES (?, ?, ?) '
+                'ON CONFLICT(id) DO UPDATE SET last_seen=excluded.last_seen',
+                (session_id, started_at, datetime.now().isoformat(timespec='seconds'))
+            )
+        except Exception as e:
+            self.logger.warning(f"heartbeat failed: {e}")
+
     def end_session(self, session_id: str) -> None:
         try:
-            self.conn.execute(
-                'UPDATE sessions SET ended_at=? WHERE id=? AND (ended_at IS NULL OR ended_at="")',
-                (datetime.now().isoformat(timespec='seconds'), session_id)
+            now = datetime.now().isoformat(timespec='seconds')
+            self._execute_write(
+                'UPDATE sessions SET ended_at=?, last_seen=? WHERE id=? AND (ended_at IS NULL OR ended_at="")',
+                (now, now, session_id)
             )
-            self.conn.commit()
+            if self.active_session and self.active_session[0] == session_id:
+                self.active_session = None
         except Exception as e:
             self.logger.warning(f"end_session failed: {e}")
 
+    def get_last_session(self) -> dict | None:
+        """The newest session, found through idx_sessions_started_at without scanning the table."""
+        try:
+            row = self.conn.execute(
+                'SELECT id, started_at, ended_at, last_seen, crashed FROM sessions ORDER BY started_at DESC LIMIT 1'
+            ).fetchone()
+        except Exception as e:
+            self.logger.warning(f"get_last_session failed: {e}")
+            return None
+        if not row:
+            return None
+        return {'id': row[0], 'started_at': row[1], 'ended_at': row[2] or None,
+                'last_seen': row[3] or row[1], 'crashed': bool(row[4])}
+
+    def find_crashed_session(self) -> dict | None:
+        """The previous session if it never ended; call before start_session()."""
+        last = self.get_last_session()
+        if last and not last['ended_at'] and not (self.active_session and self.active_session[0] == last['id']):
+            return last
+        return None
+
+    def mark_session_crashed(self, session_id: str) -> None:
+        """Close a crashed session at its last heartbeat so it is reported only once."""
+        try:
+            self._execute_write(
+                "UPDATE sessions SET ended_at=COALESCE(last_seen, started_at), crashed=1 "
+                "WHERE id=? AND (ended_at IS NULL OR ended_at='')",
+                (session_id,)
+            )
+        except Exception as e:
+            self.logger.warning(f"mark_session_crashed failed: {e}")
+
     def get_unclosed_sessions_count(self) -> int:
         try:
             cur = self.conn.cursor()
@@ -441,12 +810,13 @@ class DatabaseManager:
     def get_last_backup(self) -> dict | None:
         try:
             cur = self.conn.cursor()
-            query = 'SELECT created_at, file_path, size_bytes, included_tables FROM backup_metadata ORDER BY created_at DESC LIMIT 1'
+            query = ("SELECT created_at, file_path, size_bytes, included_tables, checksum FROM backup_metadata "
+                     "WHERE COALESCE(status, 'taken') = 'taken' ORDER BY created_at DESC LIMIT 1")
             try:
                 cur.execute(query)
             except Exception:
                 # Fallback to legacy column name
-                cur.execute('SELECT created_at, backup_path, size_bytes, included_tables FROM backup_metadata ORDER BY created_at DESC LIMIT 1')
+                cur.execute('SELECT created_at, backup_path, size_bytes, included_tables, NULL FROM backup_metadata ORDER BY created_at DESC LIMIT 1')
             row = cur.fetchone()
             if not row:
                 return None
@@ -459,108 +829,120 @@ class DatabaseManager:
                 'backup_path': row[1],
                 'size_bytes': int(row[2] or 0),
                 'included_tables': tables,
+                'checksum': row[4],
             }
         except Exception as e:
             self.logger.warning(f"get_last_backup failed: {e}")
             return None
 
+    def set_backup_checksum(self, backup_path: str, checksum: str) -> None:
+        try:
+            self._execute_write('UPDATE backup_metadata SET checksum=? WHERE file_path=?', (checksum, backup_path))
+        except Exception as e:
+            self.logger.warning(f"set_backup_checksum failed: {e}")
+
+    @metrics.timed('db.write')
     def save_change(self, item: str, original_value: str, new_value: str,
                     category: str = 'system', success: bool = True,
                     error_message: str | None = None, session_id: str | None = None) -> None:
         try:
-            self.conn.execute(
+            self._execute_write(
                 'INSERT INTO changes (timestamp, category, item, original_value, new_value, success, error_message, session_id) '
                 'VALUES (datetime(\'now\'), ?, ?, ?, ?, ?, ?, ?)',
                 (category, item, original_value, new_value, 1 if success else 0, error_message or '', session_id)
             )
-            self.conn.commit()
         except Exception as e:
+            metrics.fail('db.write')
             self.logger.warning(f"save_change failed: {e}")
 
+    @metrics.timed('db.write')
     def save_game_spoof(self, game: str, spoof_type: str, original_value: str, new_value: str,
                          success: bool = True, anti_detection_level: int = 0, session_id: str | None = None) -> None:
         try:
-            self.conn.execute(
+            self._execute_write(
                 'INSERT INTO game_spoofs (timestamp, game, spoof_type, original_value, new_value, success, anti_detection_level, session_id) '
                 'VALUES (datetime(\'now\'), ?, ?, ?, ?, ?, ?, ?)',
                 (game, spoof_type, original_value, new_value, 1 if success else 0, anti_detection_level, session_id)
             )
-            self.conn.commit()
         except Exception as e:
+            metrics.fail('db.write')
             self.logger.warning(f"save_game_spoof failed: {e}")
 
+    @metrics.timed('db.write')
     def save_registry_change(self, key_path: str, value_name: str, original_value: str, new_value: str,
                              success: bool = True, session_id: str | None = None) -> None:
         try:
-            # Legacy/primary table
-            self.conn.execute(
+            # registry_spoof is a view over this table, so one insert covers both names
+            self._execute_write(
                 'INSERT INTO registry_changes (timestamp, key_path, value_name, original_value, new_value, success, session_id) '
                 'VALUES (datetime(\'now\'), ?, ?, ?, ?, ?, ?)',
                 (key_path, value_name, original_value, new_value, 1 if success else 0, session_id)
             )
-            # Requested table name mirror
-            self.conn.execute(
-                'INSERT INTO registry_spoof (timestamp, key_path, value_name, original_value, spoofed_value, success, session_id) '
-                'VALUES (datetime(\'now\'), ?, ?, ?, ?, ?, ?)',
-                (key_path, value_name, original_value, new_value, 1 if success else 0, session_id)
-            )
-            self.conn.commit()
         except Exception as e:
+            metrics.fail('db.write')
             self.logger.warning(f"save_registry_change failed: {e}")
 
+    @metrics.timed('db.write')
     def save_registry_snapshot(self, key_path: str, value_name: str, value: str, session_id: str | None = None) -> None:
         try:
-            self.conn.execute(
+            self._execute_write(
                 'INSERT INTO registry (timestamp, key_path, value_name, value, session_id) '
                 'VALUES (datetime(\'now\'), ?, ?, ?, ?)',
                 (key_path, value_name, value, session_id)
             )
-            self.conn.commit()
         except Exception as e:
+            metrics.fail('db.write')
             self.logger.warning(f"save_registry_snapshot failed: {e}")
 
+    @metrics.timed('db.write')
     def save_system_info(self, info: dict) -> None:
         try:
             # Detect schema: JSON row or key-value rows
             cur = self.conn.cursor()
             cur.execute("PRAGMA table_info(system_info)")
             cols = [row[1] for row in cur.fetchall()]
-            if 'info_json' in cols and 'collected_at' in cols:
-                self.conn.execute(
-                    'INSERT INTO system_info (collected_at, info_json) VALUES (?, ?)',
-                    (datetime.now().isoformat(timespec='seconds'), json.dumps(info))
-                )
-            elif {'category', 'info_key', 'info_value', 'timestamp'}.issubset(set(cols)):
-                # Flatten structure into key-value rows
-                def _emit(category: str, key: str, value: typing.Any):
+
+            def _insert(cur):
+                if 'info_json' in cols and 'collected_at' in cols:
+                    cur.execute(
+                        'INSERT INTO system_info (collected_at, info_json) VALUES (?, ?)',
+                        (datetime.now().isoformat(timespec='seconds'), json.dumps(info))
+                    )
+                elif {'category', 'info_key', 'info_value', 'timestamp'}.issubset(set(cols)):
+                    # Flatten structure into key-value rows
+                    def _emit(category: str, key: str, value: typing.Any):
+                        try:
+                            cur.execute(
+                                'INSERT INTO system_info (category, info_key, info_value, timestamp) '
+                                'VALUES (?, ?, ?, datetime("now"))',
+                                (category, key, json.dumps(value))
+                            )
+                        except Exception as e:
+                            # A lock must abort the whole batch so _write can retry it
+                            if _is_busy(e):
+                                raise
+                    for category, data in (info or {}).items():
+                        if isinstance(data, dict):
+                            for k, v in data.items():
+                                _emit(str(category), str(k), v)
+                        elif isinstance(data, list):
+                            for idx, item in enumerate(data):
+                                _emit(str(category), str(idx), item)
+                        else:
+                            _emit(str(category), 'value', data)
+                else:
+                    # Unknown schema: store a minimal JSON-like row if possible
                     try:
-                        self.conn.execute(
-                            'INSERT INTO system_info (category, info_key, info_value, timestamp) '
-                            'VALUES (?, ?, ?, datetime("now"))',
-                            (category, key, json.dumps(value))
+                        cur.execute(
+                            'INSERT INTO system_info (timestamp, info_value) VALUES (datetime("now"), ?)',
+                            (json.dumps(info),)
                         )
-                    except Exception:
-                        pass
-                for category, data in (info or {}).items():
-                    if isinstance(data, dict):
-                        for k, v in data.items():
-                            _emit(str(category), str(k), v)
-                    elif isinstance(data, list):
-                        for idx, item in enumerate(data):
-                            _emit(str(category), str(idx), item)
-                    else:
-                        _emit(str(category), 'value', data)
-            else:
-                # Unknown schema: store a minimal JSON-like row if possible
-                try:
-                    self.conn.execute(
-                        'INSERT INTO system_info (timestamp, info_value) VALUES (datetime("now"), ?)',
-                        (json.dumps(info),)
-                    )
-                except Exception:
-                    pass
-            self.conn.commit()
+                    except Exception as e:
+                        if _is_busy(e):
+                            raise
+            self._write(_insert)
         except Exception as e:
+            metrics.fail('db.write')
             self.logger.warning(f"save_system_info failed: {e}")
 
     def prepare_prebackup_snapshot(self) -> None:
@@ -692,17 +1074,16 @@ class DatabaseManager:
             except Exception:
                 pass
 
+    @metrics.timed('db.write')
     def save_settings(self, settings: dict) -> None:
         try:
-            cur = self.conn.cursor()
-            for k, v in settings.items():
-                cur.execute(
-                    'INSERT INTO app_settings (key, value) VALUES (?, ?) '
-                    'ON CONFLICT(key) DO UPDATE SET value=excluded.value',
-                    (str(k), json.dumps(v))
-                )
-            self.conn.commit()
+            self._write(lambda cur: cur.executemany(
+                'INSERT INTO app_settings (key, value) VALUES (?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET value=excluded.value',
+                [(str(k), json.dumps(v)) for k, v in settings.items()]
+            ))
         except Exception as e:
+            metrics.fail('db.write')
             self.logger.warning(f"save_settings failed: {e}")
 
     def get_setting(self, key: str, default=None):
@@ -719,6 +1100,7 @@ class DatabaseManager:
         except Exception:
             return default
 
+    @metrics.timed('db.settings_read')
     def load_settings(self) -> dict:
         settings: dict = {}
         try:
@@ -733,6 +1115,7 @@ class DatabaseManager:
             self.logger.warning(f"load_settings failed: {e}")
         return settings
 
+    @metrics.timed('db.stats')
     def get_statistics(self) -> dict:
         stats = {
             'total_changes': 0,
@@ -751,27 +1134,111 @@ class DatabaseManager:
             stats['failed_changes'] = int(cur.fetchone()[0])
             cur.execute('SELECT COUNT(*) FROM game_spoofs')
             stats['total_game_spoofs'] = int(cur.fetchone()[0])
-            # Prefer registry_changes; fallback to registry_spoof if empty
             cur.execute('SELECT COUNT(*) FROM registry_changes')
             stats['total_registry_changes'] = int(cur.fetchone()[0])
         except Exception as e:
             self.logger.warning(f"get_statistics failed: {e}")
         return stats
 
-    def cleanup_old_data(self, days_to_keep: int = 30) -> None:
+    @metrics.timed('db.cleanup')
+    def cleanup_old_data(self, days_to_keep: int = 30) -> dict[str, int] | None:
+        """Delete rows older than days_to_keep; returns rows removed per table, or None when the cleanup failed."""
+        removed: dict[str, int] = {}
+
+        def _delete(cur):
+            removed.clear()
+            for table, column in CLEANUP_TABLES:
+                cur.execute(f"DELETE FROM {table} WHERE datetime({column}) < datetime('now', ?)",
+                            (f'-{int(days_to_keep)} days',))
+                removed[table] = max(cur.rowcount, 0)
         try:
-            cur = self.conn.cursor()
-            cur.execute("DELETE FROM changes WHERE datetime(timestamp) < datetime('now', ?)",
-                        (f'-{int(days_to_keep)} days',))
-            cur.execute("DELETE FROM game_spoofs WHERE datetime(timestamp) < datetime('now', ?)",
-                        (f'-{int(days_to_keep)} days',))
-            cur.execute("DELETE FROM registry_changes WHERE datetime(timestamp) < datetime('now', ?)",
-                        (f'-{int(days_to_keep)} days',))
-            cur.execute("DELETE FROM registry_spoof WHERE datetime(timestamp) < datetime('now', ?)",
-                        (f'-{int(days_to_keep)} days',))
-            self.conn.commit()
+            self._write(_delete)
+            return dict(removed)
         except Exception as e:
+            metrics.fail('db.cleanup')
             self.logger.warning(f"cleanup_old_data failed: {e}")
+            return None
+
+    # ---------- History browsing ----------
+    @staticmethod
+    def _fts_query(text: str) -> str:
+        # Every word must match as a prefix; quoting keeps FTS5 operators out of user input
+        return ' '.join('"' + word.replace('"', '""') + '"*' for word in text.split())
+
+    @metrics.timed('db.history_page')
+    def history_page(self, source: str, query: str = '', before: tuple | None = None,
+                     limit: int = HISTORY_PAGE_SIZE, after: tuple | None = None) -> tuple[list[tuple], bool]:
+        """
+        Return (rows, has_more) for one page of history, newest first.
+
+        Each row is (time, key, *columns). Pass the (time, key) of the last row
+        as `before` to get the next older page, or of the first row as `after`
+        to get the page just above it (has_more then means even newer rows
+        exist); the cost of a page does not depend on how far back it is.
+        """
+        spec = HISTORY_SOURCES[source]
+        time_col, key_col = spec['time'], spec['key']
+        where: list[str] = []
+        params: list[typing.Any] = []
+        query = (query or '').strip()
+        if query:
+            if spec['fts'] and self.fts_available:
+                where.append(f"{key_col} IN (SELECT rowid FROM {spec['fts']} WHERE {spec['fts']} MATCH ?)")
+                params.append(self._fts_query(query))
+            else:
+                where.append('(' + ' OR '.join(f"{c} LIKE ?" for c in spec['search']) + ')')
+                params.extend([f"%{query}%"] * len(spec['search']))
+        if before is not None:
+            where.append(f"({time_col}, {key_col}) < (?, ?)")
+            params.extend(before)
+        order = 'DESC'
+        if after is not None:
+            where.append(f"({time_col}, {key_col}) > (?, ?)")
+            params.extend(after)
+            order = 'ASC'
+        sql = (
+            f"SELECT {time_col}, {key_col}, {', '.join(spec['columns'])} FROM {source}"
+            + (f" WHERE {' AND '.join(where)}" if where else '')
+            + f" ORDER BY {time_col} {order}, {key_col} {order} LIMIT ?"
+        )
+        params.append(int(limit) + 1)
+        try:
+            cur = self.conn.cursor()
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+        except Exception as e:
+            self.logger.warning(f"history_page({source}) failed: {e}")
+            return [], False
+        if after is not None:
+            # Nearest rows above the cursor, returned newest first like every page
+            return rows[:limit][::-1], len(rows) > limit
+        return rows[:limit], len(rows) > limit
+
+    def save_metrics(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+        try:
+            self._write(lambda cur: cur.executemany(
+                'INSERT INTO metrics (recorded_at, name, kind, count, total_ms, p50_ms, p95_ms, max_ms) '
+                'VALUES (:recorded_at, :name, :kind, :count, :total_ms, :p50_ms, :p95_ms, :max_ms)',
+                rows
+            ))
+        except Exception as e:
+            self.logger.warning(f"save_metrics failed: {e}")
+
+    def get_metric_history(self, name: str, limit: int = 100) -> list[dict]:
+        try:
+            cur = self.conn.cursor()
+            cur.execute(
+                'SELECT recorded_at, kind, count, total_ms, p50_ms, p95_ms, max_ms FROM metrics '
+                'WHERE name=? ORDER BY recorded_at DESC LIMIT ?',
+                (name, int(limit))
+            )
+            cols = ['recorded_at', 'kind', 'count', 'total_ms', 'p50_ms', 'p95_ms', 'max_ms']
+            return [dict(zip(cols, row)) for row in cur.fetchall()]
+        except Exception as e:
+            self.logger.warning(f"get_metric_history failed: {e}")
+            return []
 
     def close(self) -> None:
         try:
@@ -0,0 +1,291 @@
+"""
+Streaming export and import of history tables as NDJSON or CSV.
+
+Exports read from a single cursor in fixed-size batches and write each
+row as soon as it is fetched, so memory stays flat however large the table
+is. A ".gz" suffix (or compress=True) gzips the output; imports detect gzip
+from the file's magic bytes.
+
+NDJSON files can hold several tables: every line is one row with a "_table"
+field. CSV holds one table per file, so a multi-table CSV export writes
+"<name>.<table>.csv" next to the requested path. NULL is written to CSV as
+\\N so it survives a round trip distinct from an empty string.
+
+Imports insert with executemany in large transactions. By default integer
+row ids are dropped so imported rows are appended; keep_ids=True preserves
+them and skips rows whose id already exists.
+"""
+import csv
+import gzip
+import json
+import time
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# table -> time column used for --since/--until filtering
+EXPORT_TABLES = {
+    'changes': 'timestamp',
+    'game_spoofs': 'timestamp',
+    'registry_changes': 'timestamp',
+    'registry': 'timestamp',
+    'sessions': 'started_at',
+    'system_info': 'collected_at',
+    'metrics': 'recorded_at',
+}
+FORMATS = ('ndjson', 'csv')
+FETCH_SIZE = 5000
+IMPORT_BATCH = 50000
+CSV_NULL = '\\N'
+TABLE_FIELD = '_table'
+
+
+@dataclass
+class TransferResult:
+    rows: Dict[str, int] = field(default_factory=dict)
+    files: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+    skipped: int = 0
+
+    @property
+    def total_rows(self) -> int:
+        return sum(self.rows.values())
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.total_rows / self.seconds if self.seconds > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'rows': dict(self.rows), 'total_rows': self.total_rows, 'skipped': self.skipped,
+            'files': list(self.files), 'seconds': round(self.seconds, 3), 'rows_per_s': round(self.rows_per_s, 1),
+        }
+
+
+def detect_format(path: str, fmt: Optional[str] = None) -> Tuple[str, bool]:
+    """Return (format, gzipped) from an explicit format or the file name."""
+    suffixes = [s.lower() for s in Path(path).suffixes]
+    gz = bool(suffixes) and suffixes[-1] == '.gz'
+    if gz:
+        suffixes = suffixes[:-1]
+    if fmt is None:
+        fmt = 'csv' if suffixes and suffixes[-1] == '.csv' else 'ndjson'
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    return fmt, gz
+
+
+def _open_write(path: Path, gz: bool):
+    if gz:
+        return gzip.open(path, 'wt', encoding='utf-8', newline='', compresslevel=6)
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def _open_read(path: Path):
+    with open(path, 'rb') as f:
+        magic = f.read(2)
+    if magic == b'\x1f\x8b':
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def _table_columns(conn, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+
+
+def _select(conn, table: str, since: Optional[str], until: Optional[str]) -> Tuple[List[str], Any]:
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Unknown table {table!r}")
+    columns = _table_columns(conn, table)
+    time_col = EXPORT_TABLES[table]
+    where, params = [], []
+    # datetime() normalises the two timestamp formats in use ('T' and ' ' separators)
+    if since:
+        where.append(f"datetime({time_col}) >= datetime(?)")
+        params.append(since)
+    if until:
+        where.append(f"datetime({time_col}) < datetime(?)")
+        params.append(until)
+    sql = f"SELECT {', '.join(columns)} FROM {table}" + (f" WHERE {' AND '.join(where)}" if where else '') + " ORDER BY rowid"
+    return columns, conn.execute(sql, params)
+
+
+def _batches(cur) -> Iterator[List[tuple]]:
+    while True:
+        rows = cur.fetchmany(FETCH_SIZE)
+        if not rows:
+            return
+        yield rows
+
+
+def _csv_path(path: Path, table: str, multi: bool) -> Path:
+    if not multi:
+        return path
+    name = path.name
+    for suffix in ('.gz', '.csv'):
+        if name.lower().endswith(suffix):
+            name = name[:-len(suffix)]
+    tail = '.csv.gz' if path.name.lower().endswith('.gz') else '.csv'
+    return path.with_name(f"{name}.{table}{tail}")
+
+
+@metrics.timed('history.export')
+def export_history(db_manager, path: str, tables: Optional[List[str]] = None, since: Optional[str] = None,
+                   until: Optional[str] = None, fmt: Optional[str] = None, compress: bool = False,
+                   progress: Optional[Callable[[str, int], None]] = None) -> TransferResult:
+    """Stream the chosen tables (default: all history tables) to NDJSON or CSV."""
+    tables = list(tables or EXPORT_TABLES)
+    fmt, gz = detect_format(path, fmt)
+    dest = Path(path)
+    if compress and not gz:
+        dest = dest.with_name(dest.name + '.gz')
+        gz = True
+    conn = db_manager.conn
+    result = TransferResult()
+    started = time.perf_counter()
+
+    if fmt == 'ndjson':
+        with _open_write(dest, gz) as out:
+            for table in tables:
+                columns, cur = _select(conn, table, since, until)
+                count = 0
+                for rows in _batches(cur):
+                    out.writelines(json.dumps({TABLE_FIELD: table, **dict(zip(columns, row))}, ensure_ascii=False) + '\n'
+                                   for row in rows)
+                    count += len(rows)
+                    if progress:
+                        progress(table, count)
+                result.rows[table] = count
+        result.files.append(str(dest))
+    else:
+        for table in tables:
+            table_path = _csv_path(dest, table, len(tables) > 1)
+            columns, cur = _select(conn, table, since, until)
+            count = 0
+            with _open_write(table_path, gz) as out:
+                writer = csv.writer(out)
+                writer.writerow(columns)
+                for rows in _batches(cur):
+                    writer.writerows([CSV_NULL if v is None else v for v in row] for row in rows)
+                    count += len(rows)
+                    if progress:
+                        progress(table, count)
+            result.rows[table] = count
+            result.files.append(str(table_path))
+
+    result.seconds = time.perf_counter() - started
+    metrics.incr('history.export.rows', result.total_rows)
+    logger.info(f"Exported {result.total_rows} rows to {', '.join(result.files)} "
+                f"in {result.seconds:.2f}s ({result.rows_per_s:,.0f} rows/s)")
+    return result
+
+
+def _read_ndjson(f, default_table: Optional[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for line_no, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"line {line_no}: invalid JSON ({e})")
+        table = record.pop(TABLE_FIELD, None) or default_table
+        if not table:
+            raise ValueError(f"line {line_no}: no {TABLE_FIELD} field and no table given")
+        yield table, record
+
+
+def _read_csv(f, table: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for row in csv.DictReader(f):
+        yield table, {k: (None if v == CSV_NULL else v) for k, v in row.items()}
+
+
+def _csv_table_from_name(path: Path) -> Optional[str]:
+    # "history.changes.csv[.gz]" or "changes.csv"
+    parts = [p for p in path.name.split('.') if p.lower() not in ('csv', 'gz')]
+    for part in reversed(parts):
+        if part in EXPORT_TABLES:
+            return part
+    return None
+
+
+@metrics.timed('history.import')
+def import_history(db_manager, path: str, table: Optional[str] = None, fmt: Optional[str] = None,
+                   keep_ids: bool = False, batch_size: int = IMPORT_BATCH,
+                   progress: Optional[Callable[[str, int], None]] = None) -> TransferResult:
+    """
+    Bulk-load rows written by export_history.
+
+    Rows are grouped per table and inserted with executemany, one transaction
+    per batch. Unknown columns are ignored; a failing batch is rolled back and
+    the error raised, leaving earlier batches committed.
+    """
+    src = Path(path)
+    fmt, _ = detect_format(path, fmt)
+    if fmt == 'csv':
+        table = table or _csv_table_from_name(src)
+        if not table:
+            raise ValueError(f"Cannot tell which table {src.name} belongs to; pass table=")
+    if table and table not in EXPORT_TABLES:
+        raise ValueError(f"Unknown table {table!r}")
+
+    conn = db_manager.conn
+    columns_cache: Dict[str, List[str]] = {}
+    pending: Dict[str, Dict[Tuple[str, ...], List[tuple]]] = {}
+    pending_count = 0
+    result = TransferResult()
+    started = time.perf_counter()
+
+    def _flush():
+        nonlocal pending_count
+        if not pending_count:
+            return
+        try:
+            with conn:
+                for tbl, groups in pending.items():
+                    for cols, rows in groups.items():
+                        verb = 'INSERT OR IGNORE' if 'id' in cols else 'INSERT'
+                        cur = conn.executemany(
+                            f"{verb} INTO {tbl} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})", rows)
+                        # rowcount excludes trigger writes, so it is the number of rows actually inserted
+                        inserted = cur.rowcount if cur.rowcount >= 0 else len(rows)
+                        result.skipped += len(rows) - inserted
+                        result.rows[tbl] = result.rows.get(tbl, 0) + inserted
+                        if progress:
+                            progress(tbl, result.rows[tbl])
+        finally:
+            pending.clear()
+            pending_count = 0
+
+    with _open_read(src) as f:
+        records = _read_csv(f, table) if fmt == 'csv' else _read_ndjson(f, table)
+        for tbl, record in records:
+            if tbl not in EXPORT_TABLES:
+                result.skipped += 1
+                continue
+            if tbl not in columns_cache:
+                columns_cache[tbl] = _table_columns(conn, tbl)
+            allowed = columns_cache[tbl]
+            # sessions.id is the natural key and is always kept
+            drop_id = not keep_ids and tbl != 'sessions'
+            cols = tuple(c for c in allowed if c in record and not (drop_id and c == 'id'))
+            if not cols:
+                result.skipped += 1
+                continue
+            pending.setdefault(tbl, {}).setdefault(cols, []).append(tuple(record[c] for c in cols))
+            pending_count += 1
+            if pending_count >= batch_size:
+                _flush()
+        _flush()
+
+    result.files.append(str(src))
+    result.seconds = time.perf_counter() - started
+    metrics.incr('history.import.rows', result.total_rows)
+    logger.info(f"Imported {result.total_rows} rows from {src} in {result.seconds:.2f}s "
+                f"({result.rows_per_s:,.0f} rows/s, {result.skipped} skipped)")
+    return result
@@ -0,0 +1,239 @@
+"""
+Background integrity checking for the live database and the newest backup.
+
+A scan pass is split into small steps so it can run in idle moments on a
+low-priority worker: one PRAGMA quick_check per table (each covering the
+table and its indexes), then one step for the newest backup, which is
+checked against the SHA-256 recorded when it was written and quick_checked
+through a read-only, immutable connection. Every step opens its own
+read-only connection, so the app's connection is never blocked by a check.
+
+A failed live check means new backups would copy the damage, so callers
+should hold automatic backups (see BackupScheduler.hold) until it is
+resolved and keep the last good backup. A table that cannot be read because
+another process holds the database lock is not a problem: the step raises
+IntegrityBusy and the table is checked again on the next step.
+"""
+import time
+import sqlite3
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from core.metrics import metrics
+from core.database_manager import file_sha256, _is_busy
+
+logger = logging.getLogger(__name__)
+
+MAX_MESSAGES = 20
+# SQLite VM steps between cancellation checks
+PROGRESS_STEPS = 100000
+BACKUP_STEP = '__newest_backup__'
+# run_pass() waits this long between attempts while the database is locked
+BUSY_RETRY_DELAY_S = 1.0
+BUSY_RETRY_LIMIT = 30
+
+
+class IntegrityBusy(Exception):
+    """The database was locked by another process; the step was put back to run again later."""
+
+
+@dataclass
+class IntegrityIssue:
+    source: str  # 'database' or 'backup'
+    target: str
+    message: str
+
+
+@dataclass
+class IntegrityReport:
+    started_at: str = ''
+    finished_at: str = ''
+    tables_checked: int = 0
+    backup_path: str = ''
+    backup_status: str = 'none'  # ok, mismatch, corrupt, missing, unverified, none
+    issues: List[IntegrityIssue] = field(default_factory=list)
+
+    @property
+    def database_ok(self) -> bool:
+        return not any(i.source == 'database' for i in self.issues)
+
+    @property
+    def backup_ok(self) -> bool:
+        return not any(i.source == 'backup' for i in self.issues)
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+
+def _ro_connect(path, immutable: bool = False) -> sqlite3.Connection:
+    uri = Path(path).resolve().as_uri() + '?mode=ro' + ('&immutable=1' if immutable else '')
+    return sqlite3.connect(uri, uri=True, check_same_thread=False, timeout=5)
+
+
+def _quick_check(conn: sqlite3.Connection, table: Optional[str] = None,
+                 should_stop: Optional[Callable[[], bool]] = None) -> List[str]:
+    """Problems reported by quick_check (empty when it says 'ok')."""
+    if should_stop:
+        conn.set_progress_handler(lambda: 1 if should_stop() else 0, PROGRESS_STEPS)
+    try:
+        sql = f'PRAGMA quick_check("{table}")' if table else f'PRAGMA quick_check({MAX_MESSAGES})'
+        rows = [str(r[0]) for r in conn.execute(sql).fetchall()]
+    except sqlite3.OperationalError:
+        if should_stop and should_stop():
+            raise InterruptedError('integrity check cancelled')
+        raise
+    if rows == ['ok']:
+        return []
+    # Problems can arrive as one multi-line row headed "*** in database main ***"
+    lines = [line for row in rows for line in row.splitlines() if line.strip() and not line.startswith('***')]
+    return lines[:MAX_MESSAGES]
+
+
+def _check_tables(db_path) -> List[str]:
+    conn = _ro_connect(db_path)
+    try:
+        return [r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' "
+            "AND sql NOT LIKE 'CREATE VIRTUAL%' ORDER BY name")]
+    finally:
+        conn.close()
+
+
+def verify_backup(path: str, expected_sha256: Optional[str],
+                  should_stop: Optional[Callable[[], bool]] = None) -> tuple[str, List[str]]:
+    """
+    Return (status, problems) for one backup file: 'ok', 'mismatch' (file
+    changed since it was written), 'corrupt', 'missing' or 'unverified' (no
+    checksum on record, content passed quick_check).
+    """
+    if not Path(path).is_file():
+        return 'missing', [f"{path} does not exist"]
+    if expected_sha256:
+        actual = file_sha256(path)
+        if actual != expected_sha256:
+            return 'mismatch', [f"checksum {actual[:12]}… does not match recorded {expected_sha256[:12]}…"]
+    try:
+        conn = _ro_connect(path, immutable=True)
+        try:
+            problems = _quick_check(conn, should_stop=should_stop)
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError as e:
+        problems = [str(e)]
+    if problems:
+        return 'corrupt', problems
+    return ('ok' if expected_sha256 else 'unverified'), []
+
+
+class IntegrityScanner:
+    """Runs quick_check one table at a time, then verifies the newest backup."""
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.report: Optional[IntegrityReport] = None
+        self.last_report: Optional[IntegrityReport] = None
+        self._plan: List[str] = []
+
+    @property
+    def active(self) -> bool:
+        return self.report is not None
+
+    def start_pass(self) -> None:
+        report = IntegrityReport(started_at=datetime.now().isoformat(timespec='seconds'))
+        try:
+            self._plan = _check_tables(self.db_manager.db_path) + [BACKUP_STEP]
+        except sqlite3.DatabaseError as e:
+            if _is_busy(e):
+                raise IntegrityBusy('schema') from e
+            report.issues.append(IntegrityIssue('database', 'schema', str(e)))
+            self._plan = [BACKUP_STEP]
+        self.report = report
+
+    def step(self, should_stop: Optional[Callable[[], bool]] = None) -> bool:
+        """Run the next check; returns True when the pass is complete."""
+        if self.report is None:
+            self.start_pass()
+        if self._plan:
+            target = self._plan.pop(0)
+            try:
+                with metrics.timer('integrity.step'):
+                    if target == BACKUP_STEP:
+                        self._check_backup(should_stop)
+                    else:
+                        self._check_table(target, should_stop)
+            except (InterruptedError, IntegrityBusy):
+                # Cancelled or locked out: the target still has to be checked in this pass
+                self._plan.insert(0, target)
+                raise
+        if self._plan:
+            return False
+        self._finish()
+        return True
+
+    def run_pass(self, should_stop: Optional[Callable[[], bool]] = None) -> IntegrityReport:
+        busy = 0
+        started = False
+        while True:
+            try:
+                if not started:
+                    self.start_pass()
+                    started = True
+                if self.step(should_stop):
+                    return self.last_report
+            except IntegrityBusy:
+                busy += 1
+                if busy > BUSY_RETRY_LIMIT:
+                    raise
+                time.sleep(BUSY_RETRY_DELAY_S)
+
+    def _check_table(self, table: str, should_stop) -> None:
+        try:
+            conn = _ro_connect(self.db_manager.db_path)
+            try:
+                problems = _quick_check(conn, table, should_stop)
+            finally:
+                conn.close()
+        except sqlite3.DatabaseError as e:
+            if _is_busy(e):
+                raise IntegrityBusy(table) from e
+            problems = [str(e)]
+        self.report.tables_checked += 1
+        for message in problems:
+            self.report.issues.append(IntegrityIssue('database', table, message))
+
+    def _check_backup(self, should_stop) -> None:
+        last = self.db_manager.get_last_backup()
+        if not last or not last.get('backup_path'):
+            self.report.backup_status = 'none'
+            return
+        recorded = path = last['backup_path']
+        if not Path(path).is_absolute():
+            path = (Path(self.db_manager.base_dir) / path).as_posix()
+        self.report.backup_path = path
+        try:
+            status, problems = verify_backup(path, last.get('checksum'), should_stop)
+        except OSError as e:
+            status, problems = 'missing', [str(e)]
+        if status == 'unverified':
+            # Backups from before checksums were recorded: trust the file as it is now
+            self.db_manager.set_backup_checksum(recorded, file_sha256(path))
+        self.report.backup_status = status
+        for message in problems:
+            self.report.issues.append(IntegrityIssue('backup', Path(path).name, message))
+
+    def _finish(self) -> None:
+        report = self.report
+        report.finished_at = datetime.now().isoformat(timespec='seconds')
+        self.report = None
+        self.last_report = report
+        metrics.incr('integrity.pass')
+        if report.ok:
+            logger.info(f"Integrity check passed: {report.tables_checked} tables, newest backup {report.backup_status}")
+        else:
+            metrics.incr('integrity.failed')
+            for issue in report.issues:
+                logger.error(f"Integrity problem in {issue.source} {issue.target}: {issue.message}")
@@ -0,0 +1,329 @@
+"""
+Hardware inventory collection for the Serial Checker.
+
+Collection is split into sections so callers can show results as each WMI
+query (or fallback command) completes instead of waiting for all of them.
+Nothing in here depends on Qt, so it can run on any worker thread.
+"""
+import time
+import logging
+import subprocess
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def empty_serials_info() -> Dict[str, Any]:
+    return {
+        "BIOS": {},
+        "Baseboard": {},
+        "ComputerSystem": {},
+        "CPU": {},
+        "GPU": [],
+        "Disks": [],
+        "NetworkAdapters": [],
+        "AllMACs": [],
+        "OS": {},
+        "UUID": {},
+        "Registry": {},
+        "Volumes": {},
+        "MemoryChips": [],
+        "Monitors": [],
+    }
+
+
+def _s(obj, attr: str) -> str:
+    return str(getattr(obj, attr, '') or '')
+
+
+def _bios(w) -> Dict[str, Any]:
+    bios = w.Win32_BIOS()
+    if not bios:
+        return {}
+    b = bios[0]
+    return {
+        "SerialNumber": _s(b, 'SerialNumber'),
+        "SMBIOSBIOSVersion": _s(b, 'SMBIOSBIOSVersion'),
+        "Version": _s(b, 'Version'),
+        "ReleaseDate": _s(b, 'ReleaseDate'),
+    }
+
+
+def _baseboard(w) -> Dict[str, Any]:
+    boards = w.Win32_BaseBoard()
+    if not boards:
+        return {}
+    bb = boards[0]
+    return {
+        "SerialNumber": _s(bb, 'SerialNumber'),
+        "Product": _s(bb, 'Product'),
+        "Manufacturer": _s(bb, 'Manufacturer'),
+        "Version": _s(bb, 'Version'),
+    }
+
+
+def _computer_system(w) -> Dict[str, Any]:
+    cs = w.Win32_ComputerSystem()
+    if not cs:
+        return {}
+    c0 = cs[0]
+    return {
+        "Manufacturer": _s(c0, 'Manufacturer'),
+        "Model": _s(c0, 'Model'),
+        "SystemFamily": _s(c0, 'SystemFamily'),
+        "TotalPhysicalMemory": _s(c0, 'TotalPhysicalMemory'),
+    }
+
+
+def _uuid(w) -> Dict[str, Any]:
+    csp = w.Win32_ComputerSystemProduct()
+    if not csp:
+        return {}
+    p0 = csp[0]
+    return {
+        "UUID": _s(p0, 'UUID'),
+        "IdentifyingNumber": _s(p0, 'IdentifyingNumber'),
+        "Name": _s(p0, 'Name'),
+    }
+
+
+def _cpu(w) -> Dict[str, Any]:
+    cpus = w.Win32_Processor()
+    if not cpus:
+        return {}
+    p = cpus[0]
+    return {
+        "Name": _s(p, 'Name'),
+        "ProcessorId": _s(p, 'ProcessorId'),
+        "NumberOfCores": int(getattr(p, 'NumberOfCores', 0) or 0),
+        "NumberOfLogicalProcessors": int(getattr(p, 'NumberOfLogicalProcessors', 0) or 0),
+        "MaxClockSpeed": int(getattr(p, 'MaxClockSpeed', 0) or 0),
+    }
+
+
+def _gpu(w) -> List[Dict[str, Any]]:
+    return [
+        {"Name": _s(g, 'Name'), "DriverVersion": _s(g, 'DriverVersion'), "PNPDeviceID": _s(g, 'PNPDeviceID')}
+        for g in w.Win32_VideoController() or []
+    ]
+
+
+def _disks(w) -> List[Dict[str, Any]]:
+    return [
+        {"Model": _s(d, 'Model'), "SerialNumber": _s(d, 'SerialNumber'), "Size": _s(d, 'Size'), "PNPDeviceID": _s(d, 'PNPDeviceID')}
+        for d in w.Win32_DiskDrive() or []
+    ]
+
+
+def _memory_chips(w) -> List[Dict[str, Any]]:
+    chips = []
+    if w is not None:
+        try:
+            for m in w.Win32_PhysicalMemory() or []:
+                sn = _s(m, 'SerialNumber')
+                if sn:
+                    chips.append({"SerialNumber": sn})
+        except Exception:
+            pass
+    # Fallback for Win11/permission issues: use PowerShell CIM
+    if not chips:
+        ps_cmd = [
+            "powershell", "-NoProfile", "-ExecutionPolicy", "Bypass",
+            "Get-CimInstance Win32_PhysicalMemory | Select-Object -ExpandProperty SerialNumber"
+        ]
+        proc = subprocess.run(ps_cmd, capture_output=True, text=True, shell=False)
+        for line in (proc.stdout or "").strip().splitlines():
+            sn = line.strip()
+            if sn:
+                chips.append({"SerialNumber": sn})
+    return chips
+
+
+def _network_adapters(w) -> List[Dict[str, Any]]:
+    adapters = []
+    for na in w.Win32_NetworkAdapterConfiguration() or []:
+        if getattr(na, 'IPEnabled', False):
+            adapters.append({
+                "Description": _s(na, 'Description'),
+                "MACAddress": _s(na, 'MACAddress'),
+                "IPAddresses": list(getattr(na, 'IPAddress', None) or []),
+            })
+    return adapters
+
+
+def _all_macs(w) -> List[Dict[str, Any]]:
+    macs = []
+    if w is not None:
+        try:
+            for na in w.Win32_NetworkAdapter() or []:
+                mac = _s(na, 'MACAddress')
+                desc = _s(na, 'Name') or _s(na, 'Description')
+                if mac:
+                    macs.append({"Description": desc, "MACAddress": mac})
+        except Exception:
+            pass
+    # Fallback to getmac command if WMI yields none
+    if not macs:
+        proc = subprocess.run(["getmac", "/v", "/fo", "list"], capture_output=True, text=True, shell=True)
+        cur_desc = None
+        for line in (proc.stdout or "").splitlines():
+            if "Network Adapter" in line:
+                cur_desc = line.split(":", 1)[-1].strip()
+            elif "Physical Address" in line:
+                mac = line.split(":", 1)[-1].strip()
+                if mac and cur_desc:
+                    macs.append({"Description": cur_desc, "MACAddress": mac})
+    return macs
+
+
+def _os(w) -> Dict[str, Any]:
+    os_list = w.Win32_OperatingSystem()
+    if not os_list:
+        return {}
+    o = os_list[0]
+    return {
+        "Caption": _s(o, 'Caption'),
+        "Version": _s(o, 'Version'),
+        "BuildNumber": _s(o, 'BuildNumber'),
+        "OSArchitecture": _s(o, 'OSArchitecture'),
+        "InstallDate": _s(o, 'InstallDate'),
+        "LastBootUpTime": _s(o, 'LastBootUpTime'),
+        "SerialNumber": _s(o, 'SerialNumber'),
+    }
+
+
+def _monitors(_w) -> List[Dict[str, Any]]:
+    import wmi
+    monitors = []
+    for mon in wmi.WMI(namespace="root\\wmi").WmiMonitorID() or []:
+        decode = lambda codes: "".join(chr(c) for c in (codes or []) if c)
+        monitors.append({
+            "Manufacturer": decode(mon.ManufacturerName),
+            "ProductCode": decode(mon.ProductCodeID),
+            "SerialNumber": decode(mon.SerialNumberID),
+            "InstanceName": _s(mon, 'InstanceName'),
+        })
+    return monitors
+
+
+def _registry(_w) -> Dict[str, Any]:
+    import winreg
+    with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Cryptography") as k:
+        mg, _ = winreg.QueryValueEx(k, "MachineGuid")
+    return {"MachineGuid": str(mg)}
+
+
+def _volumes(_w) -> Dict[str, Any]:
+    import ctypes
+    vol_name = ctypes.create_unicode_buffer(1024)
+    fs_name = ctypes.create_unicode_buffer(1024)
+    serial = ctypes.c_uint()
+    max_comp_len = ctypes.c_uint()
+    flags = ctypes.c_uint()
+    GetVolumeInformationW = ctypes.windll.kernel32.GetVolumeInformationW
+    r = GetVolumeInformationW(ctypes.c_wchar_p("C:\\"), vol_name, 1024, ctypes.byref(serial), ctypes.byref(max_comp_len), ctypes.byref(flags), fs_name, 1024)
+    if not r:
+        return {}
+    return {"C": {"SerialNumber": int(serial.value), "VolumeName": vol_name.value, "FileSystem": fs_name.value}}
+
+
+# (section key, collector, needs the root\cimv2 WMI client). Cheap local
+# lookups come first so the view has something to show straight away.
+SECTIONS: List[Tuple[str, Callable, bool]] = [
+    ("Registry", _registry, False),
+    ("Volumes", _volumes, False),
+    ("BIOS", _bios, True),
+    ("Baseboard", _baseboard, True),
+    ("UUID", _uuid, True),
+    ("CPU", _cpu, True),
+    ("ComputerSystem", _computer_system, True),
+    ("OS", _os, True),
+    ("Disks", _disks, True),
+    ("GPU", _gpu, True),
+    ("NetworkAdapters", _network_adapters, True),
+    ("Monitors", _monitors, False),
+    ("MemoryChips", _memory_chips, False),
+    ("AllMACs", _all_macs, False),
+]
+
+
+def apply_overrides(section: str, value: Any, settings: Optional[Dict[str, Any]]) -> Any:
+    """Apply spoof overrides stored in app settings to a collected section."""
+    if not isinstance(settings, dict):
+        return value
+    overrides = settings.get('spoof_overrides', {}) or {}
+    mapping = {
+        "BIOS": [('BIOS.SerialNumber', 'SerialNumber')],
+        "CPU": [('CPU.Serial', 'Serial'), ('CPU.ProcessorId', 'ProcessorId')],
+        "OS": [('OS.SerialNumber', 'SerialNumber')],
+        "UUID": [('EFI.Number', 'EFI')],
+    }
+    for override_key, field in mapping.get(section, []):
+        new_value = overrides.get(override_key)
+        if new_value:
+            value = dict(value or {})
+            value[field] = new_value
+    if section == "Monitors":
+        mon_overrides = settings.get('Monitor.SerialOverrides', {}) or {}
+        for mon in value or []:
+            key = f"{mon.get('Manufacturer')}-{mon.get('ProductCode')}" if (mon.get('Manufacturer') or mon.get('ProductCode')) else mon.get('InstanceName')
+            if key in mon_overrides:
+                mon['SerialNumber'] = mon_overrides[key]
+    return value
+
+
+def iter_serials_sections(settings: Optional[Dict[str, Any]] = None,
+                          should_stop: Optional[Callable[[], bool]] = None) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield (section, value) pairs as each section is collected.
+
+    Failures inside a section yield that section's empty value. When called
+    from a non-main thread on Windows, COM is initialised for the duration
+    of the iteration.
+    """
+    com_initialized = False
+    started = time.perf_counter()
+    try:
+        try:
+            import pythoncom
+            pythoncom.CoInitialize()
+            com_initialized = True
+        except Exception:
+            pass
+        wmi_client = None
+        try:
+            import wmi
+            wmi_client = wmi.WMI()
+        except Exception:
+            wmi_client = None
+        defaults = empty_serials_info()
+        for name, collector, needs_client in SECTIONS:
+            if should_stop and should_stop():
+                return
+            value = defaults[name]
+            if not needs_client or wmi_client is not None:
+                t0 = time.perf_counter()
+                try:
+                    value = collector(wmi_client)
+                except Exception as e:
+                    metrics.incr('inventory.section.failed')
+                    logger.debug(f"Inventory section {name} failed: {e}")
+                    value = defaults[name]
+                metrics.observe('inventory.section', (time.perf_counter() - t0) * 1000.0)
+            yield name, apply_overrides(name, value, settings)
+        metrics.observe('inventory.collect', (time.perf_counter() - started) * 1000.0)
+    finally:
+        if com_initialized:
+            try:
+                pythoncom.CoUninitialize()
+            except Exception:
+                pass
+
+
+def collect_serials_info(settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    result = empty_serials_info()
+    for name, value in iter_serials_sections(settings):
+        result[name] = value
+    return result
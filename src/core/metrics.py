@@ -0,0 +1,188 @@
+"""
+In-process operation metrics: counters and latency histograms.
+
+Timings are kept in memory in bounded reservoirs (for live percentiles on the
+dashboard) and in a per-interval window that drain() hands to the database as
+one aggregated row per metric, so persisting metrics costs one small write per
+flush rather than one per operation.
+"""
+import time
+import random
+import threading
+import functools
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+RESERVOIR_SIZE = 1024
+WINDOW_SAMPLES = 4096
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+class Histogram:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: deque = deque(maxlen=RESERVOIR_SIZE)
+        self._window: List[float] = []
+        self._window_count = 0
+        self._window_total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.recent.append(value)
+        self._window_count += 1
+        self._window_total += value
+        if len(self._window) < WINDOW_SAMPLES:
+            self._window.append(value)
+        else:
+            # Reservoir sampling keeps the window bounded but representative
+            j = random.randrange(self._window_count)
+            if j < WINDOW_SAMPLES:
+                self._window[j] = value
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.recent)
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count, 2) if self.count else 0.0,
+            'p50_ms': round(percentile(ordered, 50), 2),
+            'p95_ms': round(percentile(ordered, 95), 2),
+            'max_ms': round(self.max, 2),
+        }
+
+    def drain_window(self) -> Optional[Dict[str, float]]:
+        if not self._window_count:
+            return None
+        ordered = sorted(self._window)
+        row = {
+            'count': self._window_count,
+            'total_ms': round(self._window_total, 3),
+            'p50_ms': round(percentile(ordered, 50), 3),
+            'p95_ms': round(percentile(ordered, 95), 3),
+            'max_ms': round(ordered[-1], 3),
+        }
+        self._window = []
+        self._window_count = 0
+        self._window_total = 0.0
+        return row
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._counter_window: Dict[str, int] = {}
+        self._histograms: Dict[str, Histogram] = {}
+        self._local = threading.local()
+
+    def incr(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+            self._counter_window[name] = self._counter_window.get(name, 0) + n
+
+    def observe(self, name: str, ms: float) -> None:
+        with self._lock:
+            hist = self._histograms.get(name)
+            if hist is None:
+                hist = self._histograms[name] = Histogram()
+            hist.observe(ms)
+
+    @contextmanager
+    def timer(self, name: str):
+        """
+        Time a block in milliseconds. Blocks that raise, or that call fail(name)
+        after handling their own error, are counted under <name>.errors and
+        left out of the latency histogram.
+        """
+        t0 = time.perf_counter()
+        frame = [name, False]
+        stack = self._active_timers()
+        stack.append(frame)
+        try:
+            yield
+        except Exception:
+            frame[1] = True
+            raise
+        finally:
+            stack.remove(frame)
+            if frame[1]:
+                self.incr(f"{name}.errors")
+            else:
+                self.observe(name, (time.perf_counter() - t0) * 1000.0)
+
+    def fail(self, name: str) -> None:
+        """Mark the innermost running timer(name) on this thread as failed; counts directly when none is running."""
+        for frame in reversed(self._active_timers()):
+            if frame[0] == name:
+                frame[1] = True
+                return
+        self.incr(f"{name}.errors")
+
+    def _active_timers(self) -> list:
+        stack = getattr(self._local, 'timers', None)
+        if stack is None:
+            stack = self._local.timers = []
+        return stack
+
+    def timed(self, name: str):
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def counter(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def summary(self, name: str) -> Optional[Dict[str, float]]:
+        with self._lock:
+            hist = self._histograms.get(name)
+            return hist.summary() if hist else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'timers': {name: h.summary() for name, h in self._histograms.items()},
+            }
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Aggregate rows for everything recorded since the previous drain."""
+        recorded_at = datetime.now().isoformat(timespec='seconds')
+        rows: List[Dict[str, Any]] = []
+        with self._lock:
+            for name, hist in self._histograms.items():
+                row = hist.drain_window()
+                if row:
+                    rows.append({'recorded_at': recorded_at, 'name': name, 'kind': 'timer', **row})
+            for name, value in self._counter_window.items():
+                if value:
+                    rows.append({'recorded_at': recorded_at, 'name': name, 'kind': 'counter', 'count': value,
+                                 'total_ms': None, 'p50_ms': None, 'p95_ms': None, 'max_ms': None})
+            self._counter_window.clear()
+        return rows
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._counter_window.clear()
+            self._histograms.clear()
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,264 @@
+"""
+In-process registry backups, one archive per session.
+
+Keys are read with winreg (subkeys included, as `reg export` does) and
+appended to backups/registry/registry_<time>_<session>.jsonl.gz. Each backup
+is one JSON line in its own gzip member, so appending never rewrites the
+file and a torn write at the end loses only the last record. Every record
+carries the SHA-256 of its own canonical JSON, so read_archive() can tell
+intact records from damaged ones.
+
+A key is captured once per session: the first capture is the state before
+this session touched it, and later requests for the same key are no-ops.
+write_reg() turns records back into standard regedit .reg files when one is
+needed, e.g. to restore by hand with `reg import`.
+"""
+import os
+import gzip
+import json
+import time
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import winreg  # type: ignore
+except Exception:  # pragma: no cover
+    winreg = None
+
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+ARCHIVE_GLOB = 'registry_*.jsonl.gz'
+MAX_DEPTH = 32
+
+HIVES = {
+    'HKLM': 'HKEY_LOCAL_MACHINE',
+    'HKEY_LOCAL_MACHINE': 'HKEY_LOCAL_MACHINE',
+    'HKCU': 'HKEY_CURRENT_USER',
+    'HKEY_CURRENT_USER': 'HKEY_CURRENT_USER',
+    'HKCR': 'HKEY_CLASSES_ROOT',
+    'HKEY_CLASSES_ROOT': 'HKEY_CLASSES_ROOT',
+    'HKU': 'HKEY_USERS',
+    'HKEY_USERS': 'HKEY_USERS',
+}
+
+# winreg value types (numbers are fixed by Windows, so they work without winreg)
+REG_NONE, REG_SZ, REG_EXPAND_SZ, REG_BINARY, REG_DWORD, REG_DWORD_BIG_ENDIAN, REG_MULTI_SZ, REG_QWORD = 0, 1, 2, 3, 4, 5, 7, 11
+
+
+def split_key(key_path: str) -> Tuple[str, str]:
+    """Return (full hive name, subkey path); paths without a hive are HKLM, as the spoofers assume."""
+    head, _, rest = key_path.strip('\\').partition('\\')
+    hive = HIVES.get(head.upper())
+    if hive is None:
+        return 'HKEY_LOCAL_MACHINE', key_path.strip('\\')
+    return hive, rest
+
+
+def _encode(data: Any) -> Any:
+    if isinstance(data, (bytes, bytearray)):
+        return {'hex': bytes(data).hex()}
+    return data
+
+
+def _decode(data: Any) -> Any:
+    if isinstance(data, dict) and 'hex' in data:
+        return bytes.fromhex(data['hex'])
+    return data
+
+
+def read_key_tree(key_path: str) -> List[Dict[str, Any]]:
+    """All values of a key and its subkeys, parents first: [{'path', 'values': [[name, type, data]]}]."""
+    if winreg is None:
+        raise OSError('winreg is not available on this platform')
+    hive_name, subkey = split_key(key_path)
+    hive = getattr(winreg, hive_name)
+    keys: List[Dict[str, Any]] = []
+
+    def _walk(path: str, depth: int):
+        with winreg.OpenKey(hive, path, 0, winreg.KEY_READ) as k:
+            n_subkeys, n_values, _ = winreg.QueryInfoKey(k)
+            values = []
+            for i in range(n_values):
+                name, data, vtype = winreg.EnumValue(k, i)
+                values.append([name, vtype, _encode(data)])
+            keys.append({'path': f"{hive_name}\\{path}" if path else hive_name, 'values': values})
+            children = [winreg.EnumKey(k, i) for i in range(n_subkeys)]
+        if depth < MAX_DEPTH:
+            for child in children:
+                try:
+                    _walk(f"{path}\\{child}" if path else child, depth + 1)
+                except OSError as e:
+                    # Some subkeys (e.g. Properties under device classes) deny read access even to admins
+                    logger.debug(f"Skipping {hive_name}\\{path}\\{child}: {e}")
+
+    _walk(subkey, 0)
+    return keys
+
+
+def _checksum(record: Dict[str, Any]) -> str:
+    body = {k: v for k, v in record.items() if k != 'sha256'}
+    return hashlib.sha256(json.dumps(body, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+class RegistryArchive:
+    """Append-only backup archive for one session."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._captured: Dict[str, str] = {}
+
+    def backup_key(self, key_path: str, label: str = '') -> bool:
+        hive, subkey = split_key(key_path)
+        full = f"{hive}\\{subkey}"
+        with self._lock:
+            if full.upper() in self._captured:
+                return True
+            t0 = time.perf_counter()
+            try:
+                keys = read_key_tree(full)
+            except OSError as e:
+                metrics.incr('registry.backup.failed')
+                logger.warning(f"Registry backup failed for {full}: {e}")
+                return False
+            record = {
+                'v': FORMAT_VERSION, 'label': label or full, 'key': full,
+                'taken_at': datetime.now().isoformat(timespec='seconds'), 'keys': keys,
+            }
+            record['read_ms'] = round((time.perf_counter() - t0) * 1000.0, 3)
+            record['sha256'] = _checksum(record)
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with gzip.open(self.path, 'at', encoding='utf-8') as f:
+                    f.write(json.dumps(record, separators=(',', ':')) + '\n')
+            except OSError as e:
+                metrics.incr('registry.backup.failed')
+                logger.warning(f"Could not write registry backup {self.path}: {e}")
+                return False
+            elapsed_ms = (time.perf_counter() - t0) * 1000.0
+            metrics.observe('registry.backup', elapsed_ms)
+            self._captured[full.upper()] = record['sha256']
+            logger.info(f"Registry backup of {full} ({len(keys)} keys) to {self.path.name} in {elapsed_ms:.1f} ms")
+            return True
+
+
+_archives: Dict[str, RegistryArchive] = {}
+_archives_lock = threading.Lock()
+
+
+def registry_backup_dir(db_manager=None) -> Path:
+    base = Path(db_manager.base_dir) if db_manager is not None else Path(__file__).resolve().parents[2]
+    return base / 'backups' / 'registry'
+
+
+def session_archive(db_manager=None) -> RegistryArchive:
+    """The archive of the current session, shared by every spoofer in this process."""
+    session = getattr(db_manager, 'active_session', None)
+    session_key = session[0] if session else f"pid{os.getpid()}"
+    directory = registry_backup_dir(db_manager)
+    with _archives_lock:
+        archive = _archives.get(f"{directory}|{session_key}")
+        if archive is None:
+            name = f"registry_{datetime.now():%Y%m%d_%H%M%S}_{session_key[:8]}.jsonl.gz"
+            archive = _archives[f"{directory}|{session_key}"] = RegistryArchive(directory / name)
+        return archive
+
+
+def read_archive(path: str) -> Tuple[List[Dict[str, Any]], int]:
+    """Return (intact records, number of damaged or truncated ones)."""
+    records: List[Dict[str, Any]] = []
+    damaged = 0
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    damaged += 1
+                    continue
+                if record.get('sha256') == _checksum(record):
+                    records.append(record)
+                else:
+                    damaged += 1
+    except (OSError, EOFError) as e:
+        # A gzip member cut short by a crash: keep what was read before it
+        logger.warning(f"Registry archive {path} is truncated: {e}")
+        damaged += 1
+    return records, damaged
+
+
+def list_archives(db_manager=None) -> List[Dict[str, Any]]:
+    directory = registry_backup_dir(db_manager)
+    entries = []
+    for path in sorted(directory.glob(ARCHIVE_GLOB), reverse=True) if directory.is_dir() else []:
+        records, damaged = read_archive(path.as_posix())
+        entries.append({
+            'path': path.as_posix(), 'name': path.name, 'size_bytes': path.stat().st_size,
+            'records': len(records), 'damaged': damaged, 'keys': [r['key'] for r in records],
+        })
+    return entries
+
+
+# ---------- .reg output ----------
+def _reg_string(text: str) -> str:
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _reg_hex(kind: str, data: bytes) -> str:
+    return f"{kind}:" + ','.join(f"{b:02x}" for b in data)
+
+
+def _reg_value(vtype: int, data: Any) -> str:
+    if vtype == REG_SZ and isinstance(data, str) and not any(c in data for c in '\r\n\0'):
+        return _reg_string(data)
+    if vtype == REG_DWORD and isinstance(data, int):
+        return f"dword:{data & 0xFFFFFFFF:08x}"
+    if vtype == REG_BINARY and isinstance(data, bytes):
+        return _reg_hex('hex', data)
+    if isinstance(data, str):
+        raw = (data + '\0').encode('utf-16-le')
+    elif isinstance(data, list):
+        raw = ''.join(s + '\0' for s in data).encode('utf-16-le') + b'\0\0'
+    elif isinstance(data, int):
+        raw = data.to_bytes(4, 'big') if vtype == REG_DWORD_BIG_ENDIAN else \
+            data.to_bytes(8 if vtype == REG_QWORD else 4, 'little')
+    elif isinstance(data, bytes):
+        raw = data
+    else:
+        raw = b''
+    return _reg_hex(f"hex({vtype:x})", raw)
+
+
+def reg_text(record: Dict[str, Any]) -> str:
+    lines = ['Windows Registry Editor Version 5.00', '']
+    for key in record['keys']:
+        lines.append(f"[{key['path']}]")
+        for name, vtype, data in key['values']:
+            lines.append(f"{'@' if name == '' else _reg_string(name)}={_reg_value(vtype, _decode(data))}")
+        lines.append('')
+    return '\r\n'.join(lines) + '\r\n'
+
+
+def write_reg(record: Dict[str, Any], path: str) -> str:
+    """Write one archived key as a regedit-compatible .reg file (UTF-16 LE with BOM)."""
+    with open(path, 'w', encoding='utf-16', newline='') as f:
+        f.write(reg_text(record))
+    return path
+
+
+def iter_reg_exports(archive_path: str, out_dir: str, match: Optional[str] = None) -> Iterator[str]:
+    """Write a .reg file per record whose key or label contains `match` (all when None)."""
+    records, _ = read_archive(archive_path)
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    for record in records:
+        if match and match.lower() not in (record['key'] + ' ' + record['label']).lower():
+            continue
+        safe = ''.join(c if c.isalnum() or c in '._-' else '_' for c in record['label'])
+        yield write_reg(record, os.path.join(out_dir, f"{safe}.reg"))
@@ -3,7 +3,6 @@ import os
 import json
 import random
 import string
-import subprocess
 import logging
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
@@ -50,26 +49,9 @@ class GameSpoofer:
     
     def backup_registry_key(self, key_path: str, backup_name: str) -> bool:
         
+        from core.registry_backup import session_archive
         try:
-            backup_path = f"backups/registry/{backup_name}.reg"
-            os.makedirs(os.path.dirname(backup_path), exist_ok=True)
-            import re
-            # Ensure hive prefix for reg.exe
-            upper = key_path.upper()
-            if not (upper.startswith('HKLM\\') or upper.startswith('HKEY_LOCAL_MACHINE\\') or upper.startswith('HKCU\\') or upper.startswith('HKEY_CURRENT_USER\\')):
-                hk_prefix = "HKLM\\"
-                full_key = hk_prefix + key_path
-            else:
-                full_key = key_path
-            # Sanitize filename
-            safe_backup_path = re.sub(r"[^A-Za-z0-9_\\/:.-]", "_", backup_path)
-            subprocess.run([
-                'reg', 'export', full_key, safe_backup_path, '/y'
-            ], check=True, capture_output=True, shell=False)
-            
-            self.logger.info(f"Registry backup created: {backup_path}")
-            return True
-            
+            return session_archive(self.db_manager).backup_key(key_path, backup_name)
         except Exception as e:
             self.logger.error(f"Failed to backup registry key {key_path}: {e}")
             return False
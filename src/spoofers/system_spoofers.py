@@ -6,7 +6,7 @@ import time
 import json
 import os
 import sys
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Optional
 
 try:
     import wmi  # type: ignore
@@ -18,7 +18,8 @@ try:
 except Exception:
     reg = None
 
-from core.database_manager import DatabaseManager
+if TYPE_CHECKING:
+    from core.database_manager import DatabaseManager
 
 class SystemSpoofer:
 
@@ -26,8 +27,12 @@ class SystemSpoofer:
     MACHINE_GUID_KEY = r"SOFTWARE\Microsoft\Cryptography"
     MACHINE_GUID_VALUE = "MachineGuid"
 
-    def __init__(self, db_manager: Optional[DatabaseManager] = None):
-        self.db_manager = db_manager or DatabaseManager()
+    def __init__(self, db_manager: Optional['DatabaseManager'] = None):
+        if db_manager is None:
+            # Only standalone use needs its own connection; the GUI passes its manager in
+            from core.database_manager import DatabaseManager
+            db_manager = DatabaseManager()
+        self.db_manager = db_manager
         self.logger = logging.getLogger(__name__)
         try:
             info = self._get_os_info()
@@ -127,22 +132,9 @@ class SystemSpoofer:
             return {"success": False, "error": str(e)}
 
     def _backup_registry_key(self, key_path: str, label: str) -> bool:
-        import subprocess
+        from core.registry_backup import session_archive
         try:
-            out_dir = self._ensure_backups_dir()
-            safe_label = label.replace('\\', '_').replace(':', '_').replace('/', '_')
-            fname = f"{safe_label}.reg"
-            target = os.path.join(out_dir, fname)
-            upper = key_path.upper()
-            if not (upper.startswith('HKLM\\') or upper.startswith('HKEY_LOCAL_MACHINE\\') or upper.startswith('HKCU\\') or upper.startswith('HKEY_CURRENT_USER\\')):
-                full_key = 'HKLM\\' + key_path
-            else:
-                full_key = key_path
-            r = subprocess.run(["reg", "export", full_key, target, "/y"], capture_output=True, text=True, shell=False)
-            ok = (r.returncode == 0)
-            if not ok:
-                self.logger.warning(f"Backup failed for {key_path}: {r.stderr.strip()[:200]}")
-            return ok
+            return session_archive(self.db_manager).backup_key(key_path, label)
         except Exception as e:
             self.logger.warning(f"Backup error for {key_path}: {e}")
             return False
@@ -217,29 +209,64 @@ class SystemSpoofer:
             self.logger.error(f"Failed setting registry {path} {name}: {e}")
             return False
 
-    def _find_adapter_subkey_by_guid(self, guid: str) -> Optional[str]:
-        
+    def _scan_adapter_subkeys(self) -> Dict[str, str]:
+        """One pass over the network class key: {lower-case NetCfgInstanceId: subkey path}."""
+        index: Dict[str, str] = {}
         if reg is None:
-            return None
-        try:
-            with self._open_key(reg.HKEY_LOCAL_MACHINE, self.NETWORK_CLASS_KEY, False) as class_key:
-                i = 0
-                while True:
-                    try:
-                        subname = reg.EnumKey(class_key, i)
-                    except OSError:
-                        break
-                    i += 1
-                    subpath = f"{self.NETWORK_CLASS_KEY}\\{subname}"
-                    try:
+            return index
+        from core.metrics import metrics
+        with metrics.timer('registry.adapter_scan'):
+            try:
+                with self._open_key(reg.HKEY_LOCAL_MACHINE, self.NETWORK_CLASS_KEY, False) as class_key:
+                    i = 0
+                    while True:
+                        try:
+                            subname = reg.EnumKey(class_key, i)
+                        except OSError:
+                            break
+                        i += 1
+                        subpath = f"{self.NETWORK_CLASS_KEY}\\{subname}"
                         val = self._get_reg_value(reg.HKEY_LOCAL_MACHINE, subpath, "NetCfgInstanceId")
-                        if val and val.lower() == guid.lower():
-                            return subpath
-                    except Exception:
-                        continue
-        except Exception:
+                        if val:
+                            index[val.lower()] = subpath
+            except Exception as e:
+                self.logger.warning(f"Failed to enumerate network adapters: {e}")
+        return index
+
+    def _adapter_subkey_index(self, guids) -> Dict[str, str]:
+        """
+        Map each GUID (lower-cased) to its adapter subkey, scanning the class key at most once.
+
+        The map from the last scan is kept in the adapter_subkey_index setting.
+        Each cached entry is checked by reading NetCfgInstanceId from that one
+        subkey; the class key is only enumerated again when an entry is missing
+        or no longer points at its adapter (drivers reinstalled, NIC replaced).
+        """
+        wanted = {str(g).lower() for g in guids if g}
+        if reg is None or not wanted:
+            return {}
+        cached: Dict[str, str] = {}
+        if self.db_manager:
+            cached = {str(k).lower(): v for k, v in (self.db_manager.get_setting("adapter_subkey_index", {}) or {}).items()}
+            for guid, subkey in (self.db_manager.get_setting("mac_subkeys", {}) or {}).items():
+                cached.setdefault(str(guid).lower(), subkey)
+        found: Dict[str, str] = {}
+        for guid in wanted:
+            subkey = cached.get(guid)
+            if subkey and (self._get_reg_value(reg.HKEY_LOCAL_MACHINE, subkey, "NetCfgInstanceId") or "").lower() == guid:
+                found[guid] = subkey
+        if len(found) == len(wanted):
+            return found
+        index = self._scan_adapter_subkeys()
+        if index and self.db_manager:
+            self.db_manager.save_settings({"adapter_subkey_index": index})
+        return {guid: index[guid] for guid in wanted if guid in index}
+
+    def _find_adapter_subkey_by_guid(self, guid: str) -> Optional[str]:
+        
+        if reg is None or not guid:
             return None
-        return None
+        return self._adapter_subkey_index([guid]).get(guid.lower())
 
     def _get_ip_enabled_adapter(self) -> Optional[Dict[str, Any]]:
         if wmi is None:
@@ -566,8 +593,9 @@ class SystemSpoofer:
             if self.db_manager:
                 mac_backups = self.db_manager.get_setting("mac_original_values", {})
             restored = []
+            subkeys = self._adapter_subkey_index(mac_backups.keys())
             for guid, original in mac_backups.items():
-                subkey = self._find_adapter_subkey_by_guid(guid)
+                subkey = subkeys.get(str(guid).lower())
                 if subkey:
                     self._set_reg_value(reg.HKEY_LOCAL_MACHINE, subkey, "NetworkAddress", original if original else None)
                     restored.append(guid)
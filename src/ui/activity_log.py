@@ -0,0 +1,133 @@
+from collections import deque
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, QTimer
+from PySide6.QtWidgets import QAbstractItemView, QListView, QStyle, QStyledItemDelegate
+
+DEFAULT_MAX_LINES = 500
+FLUSH_INTERVAL_MS = 16
+
+
+class ActivityLogModel(QAbstractListModel):
+    """Fixed-size ring buffer of activity lines.
+
+    Appends are buffered and flushed at most once per frame, so a burst of
+    log_activity calls costs one row insertion and one repaint. Once the cap
+    is reached the oldest lines are dropped.
+    """
+
+    def __init__(self, max_lines: int = DEFAULT_MAX_LINES, parent=None):
+        super().__init__(parent)
+        self._lines = deque(maxlen=max(1, int(max_lines)))
+        self._pending = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self.flush)
+
+    @property
+    def max_lines(self) -> int:
+        return self._lines.maxlen
+
+    def set_max_lines(self, max_lines: int) -> None:
+        max_lines = max(1, int(max_lines))
+        if max_lines == self._lines.maxlen:
+            return
+        self.flush()
+        self.beginResetModel()
+        self._lines = deque(self._lines, maxlen=max_lines)
+        self.endResetModel()
+
+    def append(self, line: str) -> None:
+        self._pending.append(line)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        cap = self._lines.maxlen
+        if len(batch) > cap:
+            batch = batch[-cap:]
+        overflow = len(self._lines) + len(batch) - cap
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                self._lines.popleft()
+            self.endRemoveRows()
+        first = len(self._lines)
+        self.beginInsertRows(QModelIndex(), first, first + len(batch) - 1)
+        self._lines.extend(batch)
+        self.endInsertRows()
+
+    def lines(self) -> list:
+        return list(self._lines) + list(self._pending)
+
+    def to_text(self) -> str:
+        return "\n".join(self.lines())
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._lines)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._lines):
+            return None
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self._lines[index.row()]
+        return None
+
+
+class LineDelegate(QStyledItemDelegate):
+    """Paints one line of text per row, reading only the DisplayRole.
+
+    The stock delegate queries the model for about ten roles per row on
+    every paint; log-style views only need the text and an optional colour,
+    which color_for(text) supplies.
+    """
+
+    def __init__(self, color_for=None, parent=None):
+        super().__init__(parent)
+        self.color_for = color_for
+
+    def paint(self, painter, option, index):
+        text = index.data(Qt.DisplayRole) or ""
+        painter.save()
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+            color = option.palette.highlightedText().color()
+        else:
+            color = (self.color_for(text) if self.color_for else None) or option.palette.text().color()
+        painter.setPen(color)
+        rect = option.rect.adjusted(4, 0, -4, 0)
+        elided = option.fontMetrics.elidedText(text, Qt.TextElideMode.ElideRight, rect.width())
+        painter.drawText(rect, int(Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft), elided)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), option.fontMetrics.height() + 4)
+
+
+class ActivityLogView(QListView):
+    """List view for ActivityLogModel that follows new lines while scrolled to the bottom."""
+
+    def __init__(self, model: ActivityLogModel, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setItemDelegate(LineDelegate(parent=self))
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setWordWrap(False)
+        self.setTextElideMode(Qt.TextElideMode.ElideRight)
+        self._follow = True
+        self.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+        model.rowsInserted.connect(self._on_rows_inserted)
+
+    def _on_scrolled(self, value: int):
+        bar = self.verticalScrollBar()
+        self._follow = value >= bar.maximum()
+
+    def _on_rows_inserted(self, *_):
+        if self._follow:
+            self.scrollToBottom()
@@ -0,0 +1,283 @@
+from pathlib import Path
+
+from PySide6.QtCore import QObject, Qt, Signal
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import (
+    QDialog, QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView, QLabel,
+    QPushButton, QAbstractItemView, QFileDialog, QSplitter
+)
+
+from core.backup_inspector import list_backups, inspect_backup, diff_backup
+
+DIFF_COLUMNS = ["Table", "Backup rows", "Live rows", "Added", "Removed", "Changed", "Status"]
+STATUS_COLORS = {
+    "differs": QColor("#ffd166"),
+    "only in live": QColor("#9aa4af"),
+    "only in backup": QColor("#ff6b6b"),
+}
+
+
+def _size_text(size_bytes: int) -> str:
+    if size_bytes >= 1024 * 1024:
+        return f"{size_bytes / (1024 * 1024):,.1f} MB"
+    return f"{size_bytes / 1024:,.0f} KB"
+
+
+def _count_text(value) -> str:
+    return "—" if value is None else f"{value:,}"
+
+
+def _item(text: str, align_right: bool = False) -> QTableWidgetItem:
+    item = QTableWidgetItem(text)
+    item.setFlags(Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable)
+    if align_right:
+        item.setTextAlignment(int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter))
+    return item
+
+
+class BackupDiffWorker(QObject):
+    """Compares one backup with the live database on the job pool."""
+    progress = Signal(str, int, int)
+    finished = Signal(str, object, str)
+
+    def __init__(self, live_path: str, backup_path: str):
+        super().__init__()
+        self.spoofer_type = "backup_diff"
+        self.live_path = live_path
+        self.backup_path = backup_path
+        self.should_stop = False
+
+    def stop(self):
+        self.should_stop = True
+
+    def run(self):
+        try:
+            results = diff_backup(self.live_path, self.backup_path,
+                                  progress=lambda table, done, total: self.progress.emit(table, done, total),
+                                  should_stop=lambda: self.should_stop)
+            self.finished.emit(self.backup_path, results, "")
+        except InterruptedError:
+            self.finished.emit(self.backup_path, None, "cancelled")
+        except Exception as e:
+            self.finished.emit(self.backup_path, None, str(e))
+
+
+class BackupBrowserDialog(QDialog):
+    """Lists backups and shows what each holds and how it differs from the live database, without restoring."""
+
+    restore_requested = Signal(str)
+
+    def __init__(self, db_manager, jobs, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Backups")
+        self.setMinimumSize(960, 560)
+        self.db_manager = db_manager
+        self.jobs = jobs
+        self._extra_paths = []
+        self._diff_job = None
+        self._diff_worker = None
+        self._diffs = {}
+
+        layout = QVBoxLayout(self)
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+
+        self.backup_table = QTableWidget(0, 3)
+        self.backup_table.setHorizontalHeaderLabels(["Created", "Reason", "Size"])
+        self._setup_table(self.backup_table)
+        self.backup_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.backup_table.itemSelectionChanged.connect(self._on_backup_selected)
+        splitter.addWidget(self.backup_table)
+
+        detail = QVBoxLayout()
+        detail_widget = QWidget()
+        self.info_label = QLabel("Select a backup")
+        self.info_label.setObjectName("desc_label")
+        self.info_label.setWordWrap(True)
+        self.info_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        detail.addWidget(self.info_label)
+        self.diff_table = QTableWidget(0, len(DIFF_COLUMNS))
+        self.diff_table.setHorizontalHeaderLabels(DIFF_COLUMNS)
+        self._setup_table(self.diff_table)
+        detail.addWidget(self.diff_table, 1)
+        detail_widget.setLayout(detail)
+        splitter.addWidget(detail_widget)
+        splitter.setStretchFactor(1, 2)
+        layout.addWidget(splitter, 1)
+
+        bottom = QHBoxLayout()
+        self.status_label = QLabel()
+        bottom.addWidget(self.status_label, 1)
+        open_btn = QPushButton("Open File…")
+        open_btn.clicked.connect(self._open_file)
+        bottom.addWidget(open_btn)
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        bottom.addWidget(refresh_btn)
+        self.restore_btn = QPushButton("Restore…")
+        self.restore_btn.setEnabled(False)
+        self.restore_btn.clicked.connect(self._request_restore)
+        bottom.addWidget(self.restore_btn)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.reject)
+        bottom.addWidget(close_btn)
+        layout.addLayout(bottom)
+
+        self.refresh()
+
+    @staticmethod
+    def _setup_table(table: QTableWidget):
+        table.setShowGrid(False)
+        table.setWordWrap(False)
+        table.verticalHeader().hide()
+        table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        table.verticalHeader().setDefaultSectionSize(table.fontMetrics().height() + 8)
+        table.horizontalHeader().setStretchLastSection(True)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setObjectName("history_table")
+
+    def selected_path(self):
+        rows = self.backup_table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        return self.backup_table.item(rows[0].row(), 0).data(Qt.ItemDataRole.UserRole)
+
+    def refresh(self):
+        entries = list_backups(self.db_manager)
+        listed = {e['path'] for e in entries}
+        for path in self._extra_paths:
+            if path not in listed:
+                st = Path(path).stat()
+                entries.insert(0, {'path': path, 'name': Path(path).name, 'size_bytes': st.st_size,
+                                   'created_at': Path(path).name, 'reason': 'opened'})
+        self.backup_table.setRowCount(0)
+        for entry in entries:
+            row = self.backup_table.rowCount()
+            self.backup_table.insertRow(row)
+            created = _item(entry['created_at'].replace('T', ' '))
+            created.setData(Qt.ItemDataRole.UserRole, entry['path'])
+            created.setToolTip(entry['path'])
+            self.backup_table.setItem(row, 0, created)
+            self.backup_table.setItem(row, 1, _item(entry['reason']))
+            self.backup_table.setItem(row, 2, _item(_size_text(entry['size_bytes']), align_right=True))
+        self.backup_table.resizeColumnToContents(0)
+        self.status_label.setText(f"{len(entries)} backup(s)")
+        if entries:
+            self.backup_table.selectRow(0)
+
+    def _open_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Open Backup", "", "Backup Files (*.bak);;All Files (*)",
+                                              options=QFileDialog.Option.DontUseNativeDialog)
+        if path and path not in self._extra_paths:
+            self._extra_paths.append(path)
+            self.refresh()
+
+    def _on_backup_selected(self):
+        path = self.selected_path()
+        self.restore_btn.setEnabled(bool(path))
+        if not path:
+            return
+        info = inspect_backup(path)
+        if not info.ok:
+            self.info_label.setText(f"{Path(path).name}\nCannot read this backup: {info.error}")
+            self.diff_table.setRowCount(0)
+            self.restore_btn.setEnabled(False)
+            return
+        self.info_label.setText(
+            f"{Path(path).name} · {_size_text(info.size_bytes)} · {len(info.tables)} tables · "
+            f"{sum(info.tables.values()):,} rows · modified {info.modified.replace('T', ' ')}")
+        if path in self._diffs:
+            self._show_diff(self._diffs[path])
+            return
+        # Show what the backup holds straight away; live columns fill in when the comparison finishes
+        self.diff_table.setRowCount(0)
+        for table, count in sorted(info.tables.items()):
+            row = self.diff_table.rowCount()
+            self.diff_table.insertRow(row)
+            self.diff_table.setItem(row, 0, _item(table))
+            self.diff_table.setItem(row, 1, _item(f"{count:,}", align_right=True))
+            for col in range(2, len(DIFF_COLUMNS)):
+                self.diff_table.setItem(row, col, _item(""))
+        self._start_diff(path)
+
+    def _start_diff(self, path: str):
+        self._cancel_diff()
+        worker = BackupDiffWorker(self.db_manager.db_path.as_posix(), path)
+        worker.progress.connect(self._on_diff_progress)
+        worker.finished.connect(self._on_diff_finished)
+        self._diff_worker = worker
+        self._diff_job = self.jobs.submit(worker, worker.spoofer_type, groups=("database",))
+        self.status_label.setText("Comparing with live database…")
+
+    def _cancel_diff(self):
+        if self._diff_job is not None:
+            self.jobs.cancel(self._diff_job)
+        if self._diff_worker is not None:
+            self._diff_worker.finished.disconnect(self._on_diff_finished)
+            self._diff_worker.progress.disconnect(self._on_diff_progress)
+        self._diff_job = None
+        self._diff_worker = None
+
+    def _on_diff_progress(self, table: str, done: int, total: int):
+        if table:
+            self.status_label.setText(f"Comparing with live database… {table} ({done + 1}/{total})")
+
+    def _on_diff_finished(self, path: str, results, error: str):
+        self._diff_job = None
+        self._diff_worker = None
+        if results is None:
+            self.status_label.setText(f"Comparison failed: {error}" if error != "cancelled" else "Comparison cancelled")
+            return
+        self._diffs[path] = results
+        if path == self.selected_path():
+            self._show_diff(results)
+
+    def _show_diff(self, results):
+        self.diff_table.setRowCount(0)
+        for diff in results:
+            row = self.diff_table.rowCount()
+            self.diff_table.insertRow(row)
+            cells = [diff.table, _count_text(diff.backup_rows), _count_text(diff.live_rows),
+                     f"{diff.added:,}", f"{diff.removed:,}", f"{diff.changed:,}", diff.status]
+            for col, text in enumerate(cells):
+                item = _item(text, align_right=0 < col < 6)
+                color = STATUS_COLORS.get(diff.status)
+                if color is not None and col in (0, 6):
+                    item.setForeground(color)
+                self.diff_table.setItem(row, col, item)
+            tip = []
+            for kind in ("added", "removed", "changed"):
+                if diff.samples[kind]:
+                    tip.append(f"{kind}: rowid {', '.join(str(r) for r in diff.samples[kind])}")
+            if diff.columns_only_in_live or diff.columns_only_in_backup:
+                tip.append(f"columns only in live: {', '.join(diff.columns_only_in_live) or '—'}; "
+                           f"only in backup: {', '.join(diff.columns_only_in_backup) or '—'}")
+            if tip:
+                self.diff_table.item(row, 6).setToolTip("\n".join(tip))
+        differing = [d for d in results if d.status != 'identical']
+        added = sum(d.added for d in results)
+        self.status_label.setText(
+            "Identical to the live database" if not differing else
+            f"{len(differing)} table(s) differ · {added:,} live row(s) newer than this backup")
+
+    def _request_restore(self):
+        path = self.selected_path()
+        if path:
+            self.restore_requested.emit(path)
+
+    def restore_summary(self, path: str) -> str:
+        """What restoring `path` would undo, from the last comparison, for the confirmation prompt."""
+        results = self._diffs.get(path)
+        if results is None:
+            return "The comparison with the live database has not finished."
+        added = sum(d.added for d in results)
+        changed = sum(d.changed for d in results)
+        removed = sum(d.removed for d in results)
+        if not (added or changed or removed):
+            return "This backup matches the live database."
+        return (f"Restoring discards {added:,} row(s) written since the backup and reverts {changed:,} changed row(s); "
+                f"{removed:,} row(s) deleted since then come back.")
+
+    def done(self, result):
+        self._cancel_diff()
+        super().done(result)
@@ -1,8 +1,10 @@
+import time
+_IMPORT_STARTED = time.perf_counter()
+
 import sys
 import os
 import json
 import logging
-import time
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from pathlib import Path
@@ -13,147 +15,161 @@ from PySide6.QtWidgets import (
     QTextEdit, QDialog, QProgressBar, QGroupBox, QGridLayout, QCheckBox, QGraphicsDropShadowEffect,
     QComboBox, QMessageBox, QFileDialog, QInputDialog, QTabWidget, QListWidget,
     QListWidgetItem, QSplitter, QMenuBar, QMenu, QStatusBar, QStyle,
-    QLineEdit, QSpinBox
+    QLineEdit, QSpinBox, QTableView, QHeaderView, QAbstractItemView
 )
-from PySide6.QtCore import Qt, QTimer, QThread, Signal, QPropertyAnimation, QRect, QEasingCurve, QSize, QUrl
+from PySide6.QtCore import Qt, QObject, QEvent, QTimer, QThread, Signal, QPropertyAnimation, QRect, QEasingCurve, QSize, QUrl
 from PySide6.QtGui import QRegion
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from PySide6.QtGui import QFont, QPalette, QColor, QLinearGradient, QPainter, QBrush, QPen, QIcon, QPixmap, QPainterPath, QDesktopServices
+from PySide6.QtGui import QFont, QPalette, QColor, QLinearGradient, QPainter, QBrush, QPen, QIcon, QImage, QPixmap, QPainterPath, QDesktopServices
 
 from core.database_manager import DatabaseManager
-from spoofers.game_spoofers import get_game_spoofer, AntiDetectionManager
-from spoofers.system_spoofers import SystemSpoofer
-from utils.game_assets import get_game_bg_pixmap, get_text_logo_pixmap
-from utils.auto_updater import AutoUpdater
+from core.metrics import metrics
+from core.backup_scheduler import BackupScheduler, ACTION_SKIP, ACTION_TAKE
+from core.integrity import IntegrityScanner, IntegrityBusy
+from core.inventory import SECTIONS as INVENTORY_SECTIONS, empty_serials_info, iter_serials_sections
+from utils.game_assets import get_asset_service
+from utils.logging_setup import LOG_FILE, setup_logging, shutdown_logging
+from ui.widgets import ModernButton, MiniButton, GameButton
+from ui.activity_log import ActivityLogModel, ActivityLogView, DEFAULT_MAX_LINES as ACTIVITY_LOG_DEFAULT_LINES
+from ui.history_model import HistoryTableModel, HISTORY_VIEWS
+from ui.single_instance import SingleInstance
+from ui.job_scheduler import JobScheduler, PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW
+
+# Spoofer and updater modules (wmi, winreg, requests) are imported where they
+# are first used so they stay off the startup path.
+
+_IMPORTS_DONE = time.perf_counter()
+
+# (card title, metric name) pairs shown in the dashboard Performance group
+PERFORMANCE_METRICS = [
+    ("Backup", "backup.create"),
+    ("Restore", "backup.restore"),
+    ("DB Write", "db.write"),
+    ("Inventory", "inventory.collect"),
+    ("Asset Load", "asset.load"),
+    ("Update Check", "update.check"),
+]
+METRICS_REFRESH_MS = 2000
+METRICS_FLUSH_MS = 60 * 1000
+# How often the open session is stamped as alive; a crash is dated to within this interval
+SESSION_HEARTBEAT_MS = 60 * 1000
+# QTimer intervals are 32-bit milliseconds (~24.8 days), so the backup timer only ever
+# sleeps up to an hour and asks the scheduler again; the minimum delays startup catch-up.
+BACKUP_CHECK_MAX_MS = 60 * 60 * 1000
+BACKUP_CHECK_MIN_MS = 60 * 1000
+# The integrity scanner runs one quick_check step at a time, only while the job pool is
+# idle; a full pass starts shortly after launch (and before the first auto-backup) and
+# then every few hours.
+INTEGRITY_IDLE_CHECK_MS = 10 * 1000
+INTEGRITY_FIRST_SCAN_DELAY_S = 30
+INTEGRITY_SCAN_INTERVAL_S = 6 * 60 * 60
+INTEGRITY_BACKUP_STATUS = {
+    'mismatch': "no longer matches the checksum recorded when it was written",
+    'corrupt': "is damaged",
+    'missing': "is missing",
+}
+
+PAGE_TITLES = ["Dashboard", "Game Spoofing", "System Spoofing", "Serial Checker", "History", "Settings"]
+HISTORY_PAGE = 4
+SETTINGS_PAGE = 5
+
+# Completion message of a worker stopped between steps
+OPERATION_CANCELLED = "Operation cancelled"
+
+# Jobs sharing a group never run concurrently; read-only jobs have no group
+JOB_CONFLICT_GROUPS = {
+    "backup_creation": ("database",),
+    "database_cleanup": ("database",),
+    "backup_restore": ("database", "system"),
+    "restore": ("system",),
+    "system": ("system",),
+    "game": ("system",),
+    "registry": ("system",),
+    "registry_backup": ("system",),
+    "optimization": ("system",),
+}
+
+DEFAULT_SETTINGS = {
+    'auto_backup': True,
+    'backup_interval': 7,
+    'log_level': 'INFO',
+    'data_retention': 30,
+    'auto_update': True,
+    'auto_update_apply': True,
+    'spoof_mode': 'Temp',
+    'activity_log_max_lines': ACTIVITY_LOG_DEFAULT_LINES,
+}
+
+
+class StartupTimer(QObject):
+    """Records startup milestones and reports them once the window first paints."""
+
+    def __init__(self, origin: float):
+        super().__init__()
+        self.origin = origin
+        self.marks: list[tuple[str, float]] = [('imports', _IMPORTS_DONE)]
+        self._callback = None
 
-class ModernButton(QPushButton):
-    
-    def __init__(self, text, parent=None):
-        super().__init__(text, parent)
-        self.setFixedHeight(45)
-        self.setFont(QFont("Segoe UI", 11, QFont.Weight.Medium))
-        self.setObjectName("primary_button")
-        self.setCursor(Qt.PointingHandCursor)
-
-class MiniButton(QPushButton):
-    def __init__(self, text, parent=None):
-        super().__init__(text, parent)
-        self.setFixedHeight(28)
-        self.setFont(QFont("Segoe UI", 9, QFont.Weight.Medium))
-        self.setObjectName("primary_button")
-
-class GameButton(QPushButton):
-    
-    def __init__(self, game_name, icon_text, parent=None):
-        super().__init__(parent)
-        self.game_name = game_name
-        self.setFixedSize(200, 80)
-        self.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
-        self.bg_pix = get_game_bg_pixmap(game_name) or get_text_logo_pixmap(game_name, 400, 160)
-        self._hover = False
-        
-        game_styles = {
-            "FiveM": {
-                "gradient": ("rgba(255, 107, 53, 0.9)", "rgba(247, 147, 30, 0.9)"),
-                "hover_gradient": ("rgba(255, 130, 70, 0.95)", "rgba(255, 170, 50, 0.95)"),
-                "border_color": "#ff6b35"
-            },
-            "Fortnite": {
-                "gradient": ("rgba(139, 92, 246, 0.9)", "rgba(168, 85, 247, 0.9)"),
-                "hover_gradient": ("rgba(160, 110, 255, 0.95)", "rgba(190, 110, 255, 0.95)"),
-                "border_color": "#8b5cf6"
-            },
-            "Valorant": {
-                "gradient": ("rgba(239, 68, 68, 0.9)", "rgba(249, 115, 22, 0.9)"),
-                "hover_gradient": ("rgba(255, 90, 90, 0.95)", "rgba(255, 140, 40, 0.95)"),
-                "border_color": "#ef4444"
-            },
-            "Minecraft": {
-                "gradient": ("rgba(16, 185, 129, 0.9)", "rgba(5, 150, 105, 0.9)"),
-                "hover_gradient": ("rgba(30, 210, 150, 0.95)", "rgba(15, 180, 120, 0.95)"),
-                "border_color": "#10b981"
-            },
-            "Roblox": {
-                "gradient": ("rgba(59, 130, 246, 0.9)", "rgba(29, 78, 216, 0.9)"),
-                "hover_gradient": ("rgba(80, 150, 255, 0.95)", "rgba(50, 100, 235, 0.95)"),
-                "border_color": "#3b82f6"
-            },
-            "CS:GO": {
-                "gradient": ("rgba(255, 193, 7, 0.9)", "rgba(255, 152, 0, 0.9)"),
-                "hover_gradient": ("rgba(255, 210, 40, 0.95)", "rgba(255, 180, 30, 0.95)"),
-                "border_color": "#ffc107"
-            }
-        }
-        
-        style = game_styles.get(game_name, {
-            "gradient": ("rgba(102, 126, 234, 0.9)", "rgba(118, 75, 162, 0.9)"),
-            "hover_gradient": ("rgba(120, 140, 250, 0.95)", "rgba(140, 100, 180, 0.95)"),
-            "border_color": "#667eea"
-        })
-        
-        self.setObjectName("game_button")
-        self.setText("")
-        self.setToolTip(self.game_name)
-        self.setCursor(Qt.PointingHandCursor)
+    def mark(self, name: str) -> None:
+        self.marks.append((name, time.perf_counter()))
 
-        if not get_game_bg_pixmap(game_name):
-            try:
-                self._logo_loader = LogoLoader(game_name)
-                self._logo_loader.pixmap_ready.connect(self._on_pixmap_ready)
-                self._logo_loader.start()
-            except Exception:
-                pass
+    def report(self) -> str:
+        parts = [f"{name} {(t - self.origin) * 1000:.0f} ms" for name, t in self.marks]
+        return "Startup: " + ", ".join(parts)
 
-    def _on_pixmap_ready(self, pm):
-        try:
-            if pm is not None:
-                self.bg_pix = pm
-                self.update()
-        except Exception:
-            pass
+    def watch_first_paint(self, widget: QWidget, callback) -> None:
+        self._callback = callback
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and self._callback is not None:
+            obj.removeEventFilter(self)
+            self.mark('first paint')
+            callback, self._callback = self._callback, None
+            QTimer.singleShot(0, lambda: callback(self.report()))
+        return False
+
+
+_qss_cache: dict[str, tuple[int, str]] = {}
+
+
+def read_qss(path: Path) -> str:
+    """Return a stylesheet's text, re-reading the file only when its mtime changes."""
+    key = str(path)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return ""
+    cached = _qss_cache.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    _qss_cache[key] = (mtime, text)
+    return text
+
+
+startup_timer = StartupTimer(_IMPORT_STARTED)
+
+class SpooferWorker(QObject):
+    """One spoofing/maintenance operation, executed by the JobScheduler's thread pool."""
 
-    def paintEvent(self, event):
-        super().paintEvent(event)
-        if hasattr(self, 'bg_pix') and self.bg_pix:
-            painter = QPainter(self)
-            painter.setRenderHint(QPainter.Antialiasing)
-            rect = self.rect()
-            path = QPainterPath()
-            path.addRoundedRect(rect, 12, 12)
-            painter.setClipPath(path)
-            base_scale = 0.92
-            hover_scale = 0.98
-            scale_ratio = hover_scale if getattr(self, '_hover', False) else base_scale
-            target_size = QSize(int(rect.width() * scale_ratio), int(rect.height() * scale_ratio))
-            scaled = self.bg_pix.scaled(target_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            target_x = rect.x() + (rect.width() - scaled.width()) // 2
-            target_y = rect.y() + (rect.height() - scaled.height()) // 2
-            painter.drawPixmap(target_x, target_y, scaled)
-
-    def enterEvent(self, event):
-        self._hover = True
-        self.update()
-        super().enterEvent(event)
-
-    def leaveEvent(self, event):
-        self._hover = False
-        self.update()
-        super().leaveEvent(event)
-
-class SpooferWorker(QThread):
     progress_updated = Signal(int)
     status_updated = Signal(str)
     operation_completed = Signal(bool, str)
     
     def __init__(self, spoofer_type, game_name=None, backup_path=None, system_options=None):
         super().__init__()
+        self.job_id = None
         self.spoofer_type = spoofer_type
         self.game_name = game_name
         self.backup_path = backup_path
         self.system_options = system_options or []
         self.db_manager = None
+        self.backup_reason = 'manual'
+        self.backup_scheduler = None
         self.should_stop = False
         
     def set_db_manager(self, db_manager):
@@ -161,13 +177,20 @@ class SpooferWorker(QThread):
         
     def stop(self):
         self.should_stop = True
+
+    def _cancelled(self) -> bool:
+        """Checked between steps; once stop() was called, reports the cancellation so the UI resets."""
+        if self.should_stop:
+            self.operation_completed.emit(False, OPERATION_CANCELLED)
+            return True
+        return False
         
     def run(self):
         try:
             self.status_updated.emit("Initializing spoofing process...")
             self.progress_updated.emit(10)
             
-            if self.should_stop:
+            if self._cancelled():
                 return
                 
             if self.spoofer_type == "game" and self.game_name:
@@ -204,11 +227,14 @@ class SpooferWorker(QThread):
             self.status_updated.emit(f"Spoofing {self.game_name} identifiers...")
             self.progress_updated.emit(30)
             
+            from spoofers.game_spoofers import get_game_spoofer
             spoofer = get_game_spoofer(self.game_name, self.db_manager)
             if not spoofer:
                 self.operation_completed.emit(False, f"Game spoofer not found for {self.game_name}")
                 return
             
+            if self._cancelled():
+                return
             name = self.game_name.lower()
             if name == "fivem":
                 results = spoofer.spoof_fivem_identifiers()
@@ -243,6 +269,7 @@ class SpooferWorker(QThread):
             self.status_updated.emit("Spoofing system identifiers...")
             self.progress_updated.emit(20)
 
+            from spoofers.system_spoofers import SystemSpoofer
             spoofer = SystemSpoofer(self.db_manager)
             results = []
             if any(opt == "MAC Address" for opt in self.system_options):
@@ -251,22 +278,30 @@ class SpooferWorker(QThread):
                 results.append(("MAC Address", res))
                 self.progress_updated.emit(35)
 
+            if self._cancelled():
+                return
             if any(opt == "IP Address" for opt in self.system_options):
                 self.status_updated.emit("Renewing DHCP / IP...")
                 res = spoofer.spoof_ip()
                 results.append(("IP Address", res))
                 self.progress_updated.emit(50)
 
+            if self._cancelled():
+                return
             if any(opt == "HWID" for opt in self.system_options):
                 self.status_updated.emit("Changing MachineGuid (HWID)...")
                 res = spoofer.spoof_hwid()
                 results.append(("HWID", res))
                 self.progress_updated.emit(65)
+            if self._cancelled():
+                return
             if any(opt == "Monitor Serial" for opt in self.system_options):
                 self.status_updated.emit("Setting monitor serial overrides...")
                 res = spoofer.spoof_monitor_serials()
                 results.append(("Monitor Serial", res))
                 self.progress_updated.emit(80)
+            if self._cancelled():
+                return
             need_bios = any(opt == "BIOS Serial" for opt in self.system_options)
             need_cpu_serial = any(opt == "CPU Serial" for opt in self.system_options)
             need_processor_id = any(opt == "Processor ID" for opt in self.system_options)
@@ -291,7 +326,10 @@ class SpooferWorker(QThread):
         try:
             self.status_updated.emit("Simulating system spoofing...")
             self.progress_updated.emit(20)
+            from spoofers.system_spoofers import SystemSpoofer
             spoofer = SystemSpoofer(self.db_manager)
+            if self._cancelled():
+                return
             res = spoofer.simulate_system(self.system_options)
             self.progress_updated.emit(90)
             ok = bool(res.get("success", False))
@@ -319,7 +357,10 @@ class SpooferWorker(QThread):
         try:
             self.status_updated.emit("Restoring original identifiers...")
             self.progress_updated.emit(25)
+            from spoofers.system_spoofers import SystemSpoofer
             spoofer = SystemSpoofer(self.db_manager)
+            if self._cancelled():
+                return
             res = spoofer.restore_all()
             self.progress_updated.emit(90)
             ok = bool(res.get("success", False))
@@ -363,8 +404,11 @@ class SpooferWorker(QThread):
             self.status_updated.emit(f"Removing entries older than {days_to_keep} days...")
             self.progress_updated.emit(60)
             
-            if self.db_manager:
-                self.db_manager.cleanup_old_data(days_to_keep)
+            if self._cancelled():
+                return
+            if self.db_manager and self.db_manager.cleanup_old_data(days_to_keep) is None:
+                self.operation_completed.emit(False, "Database cleanup failed (see log for details)")
+                return
             
             self.status_updated.emit("Optimizing database...")
             self.progress_updated.emit(85)
@@ -380,6 +424,8 @@ class SpooferWorker(QThread):
         self.status_updated.emit("Creating backup...")
         self.progress_updated.emit(0)
         try:
+            if self._cancelled():
+                return
             backup_path = None
             if self.db_manager:
                 # Fast backup: skip deep verification for speed
@@ -390,8 +436,13 @@ class SpooferWorker(QThread):
                         self.progress_updated.emit(pct)
                     except Exception:
                         pass
-                backup_path = self.db_manager.create_backup(verify=False, progress_cb=_progress_cb)
+                backup_path = self.db_manager.create_backup(verify=False, progress_cb=_progress_cb, reason=self.backup_reason)
             if backup_path:
+                if self.backup_scheduler:
+                    try:
+                        self.backup_scheduler.note_backup_taken()
+                    except Exception:
+                        pass
                 self.status_updated.emit(f"Backup created: {backup_path}")
                 self.progress_updated.emit(100)
                 self.operation_completed.emit(True, "Backup created successfully")
@@ -408,6 +459,8 @@ class SpooferWorker(QThread):
             if not self.backup_path:
                 self.operation_completed.emit(False, "No backup file provided")
                 return
+            if self._cancelled():
+                return
             ok = False
             if self.db_manager:
                 ok = self.db_manager.restore_backup(self.backup_path)
@@ -420,6 +473,52 @@ class SpooferWorker(QThread):
         except Exception as e:
             self.operation_completed.emit(False, f"Restore error: {str(e)}")
 
+class SerialsWorker(QObject):
+    """Collects inventory sections off the GUI thread, emitting each as it completes."""
+    section_ready = Signal(str, object)
+    collection_finished = Signal(object)
+
+    def __init__(self, settings=None):
+        super().__init__()
+        self.settings = settings
+        self.should_stop = False
+        self.spoofer_type = "serials_scan"
+
+    def stop(self):
+        self.should_stop = True
+
+    def run(self):
+        info = empty_serials_info()
+        for name, value in iter_serials_sections(self.settings, lambda: self.should_stop):
+            info[name] = value
+            self.section_ready.emit(name, value)
+        if not self.should_stop:
+            self.collection_finished.emit(info)
+
+class IntegrityStepWorker(QObject):
+    """Runs one integrity scanner step (a table or the newest backup) on the job pool."""
+    step_finished = Signal(bool, str)
+
+    def __init__(self, scanner: IntegrityScanner):
+        super().__init__()
+        self.scanner = scanner
+        self.should_stop = False
+        self.spoofer_type = "integrity_check"
+
+    def stop(self):
+        self.should_stop = True
+
+    def run(self):
+        try:
+            done = self.scanner.step(lambda: self.should_stop)
+            self.step_finished.emit(done, "")
+        except InterruptedError:
+            self.step_finished.emit(False, "cancelled")
+        except IntegrityBusy:
+            self.step_finished.emit(False, "busy")
+        except Exception as e:
+            self.step_finished.emit(False, str(e))
+
 class CustomTitleBar(QWidget):
     
     def __init__(self, parent=None):
@@ -495,18 +594,38 @@ class PhantomIDGUI(QMainWindow):
     def __init__(self):
         super().__init__()
         self.db_manager = DatabaseManager()
-        self.anti_detection = AntiDetectionManager()
+        self._anti_detection = None
+        self._auto_updater = None
         self.current_session = None
         self.current_operation = None
-        self.worker = None
+        self.activity_model = ActivityLogModel(parent=self)
+        self.jobs = JobScheduler(parent=self)
+        self.jobs.stats_changed.connect(self.update_job_stats)
+        # Operation workers whose operation_completed has not arrived yet, by job id
+        self._operation_jobs: Dict[int, SpooferWorker] = {}
+        self.jobs.job_finished.connect(self._on_operation_job_finished)
         self.auto_backup_enabled = True
+        self.backup_scheduler = BackupScheduler(self.db_manager)
         self.backup_timer = QTimer(self)
-        self.backup_timer.setSingleShot(False)
+        self.backup_timer.setSingleShot(True)
         self.backup_timer.timeout.connect(self.on_backup_timer_timeout)
-        self.auto_updater = AutoUpdater(Path(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))), self.db_manager, logging.getLogger(__name__))
+        self.integrity_scanner = IntegrityScanner(self.db_manager)
+        self.integrity_job = None
+        self.integrity_next_pass = time.monotonic() + INTEGRITY_FIRST_SCAN_DELAY_S
+        self.integrity_timer = QTimer(self)
+        self.integrity_timer.timeout.connect(self.on_integrity_tick)
+        self.integrity_timer.start(INTEGRITY_IDLE_CHECK_MS)
         self.update_timer = QTimer(self)
         self.update_timer.setSingleShot(False)
         self.update_timer.timeout.connect(self.on_update_timer_timeout)
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.timeout.connect(self.update_performance_cards)
+        self.metrics_timer.start(METRICS_REFRESH_MS)
+        self.metrics_flush_timer = QTimer(self)
+        self.metrics_flush_timer.timeout.connect(self.flush_metrics)
+        self.metrics_flush_timer.start(METRICS_FLUSH_MS)
+        self.heartbeat_timer = QTimer(self)
+        self.heartbeat_timer.timeout.connect(self.db_manager.heartbeat)
         
         self.setup_ui()
         self.setup_logging()
@@ -516,6 +635,92 @@ class PhantomIDGUI(QMainWindow):
         self.prompt_rollback_if_needed()
         self.start_session()
 
+    @property
+    def anti_detection(self):
+        if self._anti_detection is None:
+            from spoofers.game_spoofers import AntiDetectionManager
+            self._anti_detection = AntiDetectionManager()
+        return self._anti_detection
+
+    @property
+    def auto_updater(self):
+        if self._auto_updater is None:
+            from utils.auto_updater import AutoUpdater
+            app_dir = Path(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+            self._auto_updater = AutoUpdater(app_dir, self.db_manager, logging.getLogger(__name__))
+        return self._auto_updater
+
+    def submit_worker(self, worker: SpooferWorker, track_progress: bool = True, priority: int = PRIORITY_NORMAL) -> int:
+        worker.set_db_manager(self.db_manager)
+        if track_progress:
+            worker.progress_updated.connect(self.on_worker_progress_updated)
+            worker.status_updated.connect(self.on_worker_status_updated)
+        worker.operation_completed.connect(self.on_operation_completed)
+        groups = JOB_CONFLICT_GROUPS.get(worker.spoofer_type, ())
+        unique = worker.spoofer_type in ("backup_creation", "database_cleanup")
+        worker.job_id = self.jobs.submit(worker, worker.spoofer_type, priority=priority, groups=groups, unique=unique)
+        # A unique job already queued keeps its own worker; this one never runs
+        self._operation_jobs.setdefault(worker.job_id, worker)
+        if self.jobs.find_pending(worker.spoofer_type) == worker.job_id:
+            self.log_activity(f"Queued {worker.spoofer_type} (job {worker.job_id}) behind running work")
+        return worker.job_id
+
+    def update_job_stats(self):
+        label = getattr(self, 'job_stats_label', None)
+        if label is None:
+            return
+        st = self.jobs.stats()
+        label.setText(
+            f"Jobs — running {st['running']}, queued {st['queued']}, done {st['completed']}, "
+            f"cancelled {st['cancelled']} · avg wait {st['avg_wait_ms']:.0f} ms · avg run {st['avg_run_ms']:.0f} ms"
+        )
+
+    def update_performance_cards(self):
+        labels = getattr(self, 'performance_labels', None)
+        if not labels or not self.isVisible():
+            return
+        for name, (value_label, detail_label) in labels.items():
+            summary = metrics.summary(name)
+            errors = metrics.counter(f"{name}.errors")
+            if not summary or not summary['count']:
+                value_label.setText("—")
+                detail_label.setText(f"{errors} failed" if errors else "no samples yet")
+                continue
+            value_label.setText(f"{summary['p50_ms']:.0f} ms")
+            detail = f"p95 {summary['p95_ms']:.0f} ms · n={summary['count']}"
+            if errors:
+                detail += f" · {errors} failed"
+            detail_label.setText(detail)
+
+    def flush_metrics(self):
+        try:
+            rows = metrics.drain()
+            if rows:
+                self.db_manager.save_metrics(rows)
+        except Exception as e:
+            logging.getLogger(__name__).debug(f"Metrics flush failed: {e}")
+
+    def _on_operation_job_finished(self, job_id: int, name: str, ok: bool):
+        worker = self._operation_jobs.pop(job_id, None)
+        if worker is None:
+            return
+        # Cancelled while still queued (the worker never ran) or ended without reporting
+        self.on_operation_finished_without_result(worker, cancelled=not ok)
+
+    def on_operation_finished_without_result(self, worker, cancelled: bool):
+        self.on_worker_status_updated(OPERATION_CANCELLED if cancelled else "Operation ended")
+        self.on_worker_progress_updated(0)
+        self.log_activity(f"{worker.spoofer_type} (job {worker.job_id}) {'cancelled' if cancelled else 'ended without a result'}")
+        if self.current_operation == worker.spoofer_type:
+            self.current_operation = None
+
+    def cancel_queued_jobs(self):
+        cancelled = 0
+        for job_id in self.jobs.pending_ids():
+            if self.jobs.cancel(job_id):
+                cancelled += 1
+        self.log_activity(f"Cancelled {cancelled} queued job(s)")
+
     def on_worker_status_updated(self, text: str):
         try:
             import shiboken6
@@ -612,11 +817,18 @@ class PhantomIDGUI(QMainWindow):
         
         main_layout.addWidget(content_widget)
         
-        self.create_dashboard_page()
-        self.create_game_spoofing_page()
-        self.create_system_spoofing_page()
-        self.create_serial_checker_page()
-        self.create_settings_page()
+        # Pages are built on first visit; empty widgets hold their slots until then
+        self._page_builders = [
+            self.create_dashboard_page,
+            self.create_game_spoofing_page,
+            self.create_system_spoofing_page,
+            self.create_serial_checker_page,
+            self.create_history_page,
+            self.create_settings_page,
+        ]
+        self._pages: list[QWidget | None] = [None] * len(self._page_builders)
+        for _ in self._page_builders:
+            self.content_stack.addWidget(QWidget())
         
         self.create_status_bar()
         
@@ -642,7 +854,8 @@ class PhantomIDGUI(QMainWindow):
             ("Game Spoofing", 1),
             ("System Spoofing", 2),
             ("Serial Checker", 3),
-            ("Settings", 4)
+            ("History", 4),
+            ("Settings", SETTINGS_PAGE)
         ]
         
         self.nav_buttons = []
@@ -666,7 +879,7 @@ class PhantomIDGUI(QMainWindow):
         layout.addWidget(backup_btn)
 
         restore_btn = ModernButton("Restore")
-        restore_btn.clicked.connect(self.restore_backup)
+        restore_btn.clicked.connect(self.browse_backups)
         layout.addWidget(restore_btn)
         
         return sidebar
@@ -677,18 +890,52 @@ class PhantomIDGUI(QMainWindow):
         layout.setContentsMargins(40, 40, 40, 40)
         layout.setSpacing(20)
 
+        self.integrity_warning = QLabel()
+        self.integrity_warning.setObjectName("integrity_warning")
+        self.integrity_warning.setWordWrap(True)
+        self.integrity_warning.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        self.integrity_warning.hide()
+        layout.addWidget(self.integrity_warning)
+
         activity_group = QGroupBox("Recent Activity")
         activity_group.setObjectName("group_card")
         
         activity_layout = QVBoxLayout(activity_group)
         
-        self.activity_text = QTextEdit()
-        self.activity_text.setReadOnly(True)
-        self.activity_text.setMaximumHeight(200)
-        self.activity_text.setObjectName("activity_text")
-        activity_layout.addWidget(self.activity_text)
+        self.activity_view = ActivityLogView(self.activity_model)
+        self.activity_view.setMaximumHeight(200)
+        self.activity_view.setObjectName("activity_log")
+        activity_layout.addWidget(self.activity_view)
         
         layout.addWidget(activity_group)
+
+        jobs_row = QHBoxLayout()
+        self.job_stats_label = QLabel()
+        self.job_stats_label.setObjectName("desc_label")
+        jobs_row.addWidget(self.job_stats_label, 1)
+        cancel_jobs_btn = MiniButton("Cancel Queued")
+        cancel_jobs_btn.clicked.connect(self.cancel_queued_jobs)
+        jobs_row.addWidget(cancel_jobs_btn)
+        layout.addLayout(jobs_row)
+        self.update_job_stats()
+
+        performance_group = QGroupBox("Performance (p50 latency)")
+        performance_group.setObjectName("group_card")
+        performance_layout = QGridLayout(performance_group)
+        performance_layout.setSpacing(15)
+        self.performance_labels = {}
+        for i, (title, name) in enumerate(PERFORMANCE_METRICS):
+            card = self.create_stat_card(title, "—", "#00d4ff")
+            card.setFixedHeight(110)
+            value_label = card.findChild(QLabel, "stat_value")
+            value_label.setFont(QFont("Segoe UI", 20, QFont.Weight.Bold))
+            detail_label = QLabel("no samples yet")
+            detail_label.setObjectName("desc_label")
+            card.layout().addWidget(detail_label)
+            self.performance_labels[name] = (value_label, detail_label)
+            performance_layout.addWidget(card, i // 3, i % 3)
+        layout.addWidget(performance_group)
+        self.update_performance_cards()
         
         quick_actions_group = QGroupBox("Quick Actions")
         quick_actions_group.setObjectName("group_card")
@@ -725,7 +972,7 @@ class PhantomIDGUI(QMainWindow):
         layout.addWidget(additional_actions_group)
         layout.addStretch()
         
-        self.content_stack.addWidget(page)
+        return page
         
     def create_game_spoofing_page(self):
         page = QWidget()
@@ -752,8 +999,7 @@ class PhantomIDGUI(QMainWindow):
         ]
 
         try:
-            for g, _, _ in games:
-                _ = get_game_bg_pixmap(g)
+            get_asset_service().prefetch([g for g, _, _ in games])
         except Exception:
             pass
         
@@ -803,7 +1049,7 @@ class PhantomIDGUI(QMainWindow):
         self.progress_group = None
         layout.addStretch()
         
-        self.content_stack.addWidget(page)
+        return page
         
     def create_system_spoofing_page(self):
         page = QWidget()
@@ -855,7 +1101,7 @@ class PhantomIDGUI(QMainWindow):
         layout.addLayout(button_layout)
         layout.addStretch()
         
-        self.content_stack.addWidget(page)
+        return page
         
 
     def create_serial_checker_page(self):
@@ -873,6 +1119,10 @@ class PhantomIDGUI(QMainWindow):
         self.serials_text.setMinimumHeight(260)
         self.serials_text.setObjectName("serials_text")
         info_layout.addWidget(self.serials_text)
+        self._serials_job = None
+        self._serials_info = None
+        self._serials_export_pending = False
+        self.jobs.job_finished.connect(self._on_serials_job_finished)
 
         actions_layout = QHBoxLayout()
         refresh_btn = ModernButton("Refresh Serials")
@@ -892,25 +1142,157 @@ class PhantomIDGUI(QMainWindow):
 
         layout.addWidget(info_group)
         layout.addStretch()
-        self.content_stack.addWidget(page)
+        return page
+
+    def create_history_page(self):
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(40, 40, 40, 40)
+        layout.setSpacing(20)
+
+        history_group = QGroupBox("History")
+        history_group.setObjectName("group_card")
+        history_layout = QVBoxLayout(history_group)
+
+        filter_row = QHBoxLayout()
+        self.history_source_combo = QComboBox()
+        for key, label, _ in HISTORY_VIEWS:
+            self.history_source_combo.addItem(label, key)
+        filter_row.addWidget(self.history_source_combo)
+        self.history_search_edit = QLineEdit()
+        self.history_search_edit.setPlaceholderText("Search item, registry key or error…")
+        filter_row.addWidget(self.history_search_edit, 1)
+        history_layout.addLayout(filter_row)
+
+        self.history_model = HistoryTableModel(self.db_manager, self)
+        self.history_view = QTableView()
+        self.history_view.setModel(self.history_model)
+        self.history_view.setObjectName("history_table")
+        self.history_view.setShowGrid(False)
+        self.history_view.setWordWrap(False)
+        self.history_view.verticalHeader().hide()
+        self.history_view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.history_view.verticalHeader().setDefaultSectionSize(self.history_view.fontMetrics().height() + 8)
+        self.history_view.horizontalHeader().setStretchLastSection(True)
+        self.history_view.horizontalHeader().setDefaultSectionSize(140)
+        self.history_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.history_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.history_view.setMinimumHeight(320)
+        history_layout.addWidget(self.history_view, 1)
+
+        nav_row = QHBoxLayout()
+        self.history_status_label = QLabel()
+        self.history_status_label.setObjectName("desc_label")
+        nav_row.addWidget(self.history_status_label, 1)
+        self.history_newest_btn = MiniButton("Newest")
+        self.history_newest_btn.clicked.connect(lambda: self._history_step(self.history_model.reload))
+        nav_row.addWidget(self.history_newest_btn)
+        history_layout.addLayout(nav_row)
+        layout.addWidget(history_group, 1)
+
+        # Searching waits for a pause in typing so each keystroke is not a query
+        self._history_search_timer = QTimer(page)
+        self._history_search_timer.setSingleShot(True)
+        self._history_search_timer.setInterval(300)
+        self._history_search_timer.timeout.connect(
+            lambda: self._history_step(lambda: self.history_model.set_query(self.history_search_edit.text())))
+        self.history_search_edit.textChanged.connect(lambda _: self._history_search_timer.start())
+        self.history_source_combo.currentIndexChanged.connect(
+            lambda _: self._history_step(lambda: self.history_model.set_source(self.history_source_combo.currentData())))
+        # Older rows are fetched by the view (canFetchMore); newer ones when scrolled back to the top
+        self.history_view.verticalScrollBar().valueChanged.connect(self._on_history_scrolled)
+        for signal in (self.history_model.rowsInserted, self.history_model.rowsRemoved, self.history_model.modelReset):
+            signal.connect(self._update_history_status)
+        self._history_step(self.history_model.reload)
+        return page
+
+    def _history_step(self, action):
+        try:
+            action()
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"History query failed: {e}")
+        self.history_view.scrollToTop()
+        self._update_history_status()
+
+    def _on_history_scrolled(self, value: int):
+        model = self.history_model
+        if value != self.history_view.verticalScrollBar().minimum() or not model.has_newer:
+            return
+        try:
+            added = model.fetch_newer()
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"History query failed: {e}")
+            return
+        if added:
+            # Keep the row that was at the top in place
+            self.history_view.scrollTo(model.index(added, 0), QAbstractItemView.ScrollHint.PositionAtTop)
+
+    def _update_history_status(self, *_):
+        model = self.history_model
+        self.history_newest_btn.setEnabled(model.has_newer)
+        shown = model.rowCount()
+        if shown:
+            first = model.skipped + 1
+            text = f"Rows {first:,}–{model.skipped + shown:,}" + (" · scroll for older" if model.has_older else "")
+        else:
+            text = "No matching history"
+        if model.query:
+            text += f" · filter “{model.query}”"
+        self.history_status_label.setText(text)
 
     def refresh_serials(self):
-        self.serials_text.clear()
+        if getattr(self, '_serials_job', None) is not None:
+            self.log_activity("Serial refresh already in progress")
+            return
         try:
-            info = self.collect_serials_info()
-            rendered = self.format_serials_text(info)
-            # Render as themed HTML for readability similar to WMIC output
-            self.serials_text.setHtml(rendered)
+            settings = None
             try:
-                if hasattr(self, 'db_manager') and self.db_manager:
-                    self.db_manager.save_system_info(info)
-                    self.log_activity("System info snapshot saved")
+                settings = self.db_manager.load_settings()
             except Exception:
                 pass
-            self.log_activity("Serials refreshed")
+            self._serials_info = empty_serials_info()
+            self._serials_done = 0
+            self.serials_text.setHtml(self.format_serials_text(self._serials_info, pending=True))
+            worker = SerialsWorker(settings)
+            worker.section_ready.connect(self.on_serials_section_ready)
+            worker.collection_finished.connect(self.on_serials_collected)
+            self._serials_job = self.jobs.submit(worker, worker.spoofer_type, unique=True)
         except Exception as e:
+            self._serials_job = None
             self.message_warning("Serial Checker", f"Error fetching serials: {e}")
 
+    def on_serials_section_ready(self, name: str, value):
+        self._serials_info[name] = value
+        self._serials_done += 1
+        # Render as themed HTML for readability similar to WMIC output
+        bar = self.serials_text.verticalScrollBar()
+        pos = bar.value()
+        self.serials_text.setHtml(self.format_serials_text(self._serials_info, pending=True))
+        bar.setValue(pos)
+
+    def on_serials_collected(self, info):
+        self._serials_info = info
+        self.serials_text.setHtml(self.format_serials_text(info))
+        try:
+            if hasattr(self, 'db_manager') and self.db_manager:
+                self.db_manager.save_system_info(info)
+                self.log_activity("System info snapshot saved")
+        except Exception:
+            pass
+        self.log_activity("Serials refreshed")
+        if getattr(self, '_serials_export_pending', False):
+            self._serials_export_pending = False
+            QTimer.singleShot(0, self.export_serials_to_json)
+
+    def _on_serials_job_finished(self, job_id: int, name: str, ok: bool):
+        if job_id != getattr(self, '_serials_job', None):
+            return
+        self._serials_job = None
+        if getattr(self, '_serials_export_pending', False):
+            # The scan was cancelled or failed before it delivered a result
+            self._serials_export_pending = False
+            self.message_warning("Export Error", "The serial scan did not finish; refresh and try again.")
+
     def copy_serials_to_clipboard(self):
         try:
             cb = QApplication.clipboard()
@@ -921,7 +1303,14 @@ class PhantomIDGUI(QMainWindow):
 
     def export_serials_to_json(self):
         try:
-            info = self.collect_serials_info()
+            info = getattr(self, '_serials_info', None)
+            if not info or getattr(self, '_serials_job', None) is not None:
+                # Never collect on the GUI thread: export once the background scan has finished
+                self._serials_export_pending = True
+                if getattr(self, '_serials_job', None) is None:
+                    self.refresh_serials()
+                self.log_activity("Export will continue when the serial scan finishes")
+                return
             dlg = QFileDialog(self, "Export Serials JSON", str(Path.home() / "serials.json"), "JSON Files (*.json)")
             dlg.setAcceptMode(QFileDialog.AcceptMode.AcceptSave)
             dlg.setOption(QFileDialog.Option.DontUseNativeDialog, True)
@@ -945,250 +1334,7 @@ class PhantomIDGUI(QMainWindow):
         except Exception as e:
             self.message_warning("Export Error", f"Failed to export JSON: {e}")
 
-    def collect_serials_info(self) -> Dict[str, Any]:
-        result: Dict[str, any] = {
-            "BIOS": {},
-            "Baseboard": {},
-            "ComputerSystem": {},
-            "CPU": {},
-            "GPU": [],
-            "Disks": [],
-            "NetworkAdapters": [],
-            "AllMACs": [],
-            "OS": {},
-            "UUID": {},
-            "Registry": {},
-            "Volumes": {},
-            "MemoryChips": [],
-        }
-        wmi_client = None
-        try:
-            import wmi
-            wmi_client = wmi.WMI()
-        except Exception:
-            wmi_client = None
-
-        try:
-            if wmi_client:
-                bios = wmi_client.Win32_BIOS()
-                if bios:
-                    b = bios[0]
-                    result["BIOS"] = {
-                        "SerialNumber": str(getattr(b, 'SerialNumber', '') or ''),
-                        "SMBIOSBIOSVersion": str(getattr(b, 'SMBIOSBIOSVersion', '') or ''),
-                        "Version": str(getattr(b, 'Version', '') or ''),
-                        "ReleaseDate": str(getattr(b, 'ReleaseDate', '') or ''),
-                    }
-        except Exception:
-            pass
-
-        try:
-            if wmi_client:
-                boards = wmi_client.Win32_BaseBoard()
-                if boards:
-                    bb = boards[0]
-                    result["Baseboard"] = {
-                        "SerialNumber": str(getattr(bb, 'SerialNumber', '') or ''),
-                        "Product": str(getattr(bb, 'Product', '') or ''),
-                        "Manufacturer": str(getattr(bb, 'Manufacturer', '') or ''),
-                        "Version": str(getattr(bb, 'Version', '') or ''),
-                    }
-        except Exception:
-            pass
-
-        try:
-            if wmi_client:
-                cs = wmi_client.Win32_ComputerSystem()
-                if cs:
-                    c0 = cs[0]
-                    result["ComputerSystem"] = {
-                        "Manufacturer": str(getattr(c0, 'Manufacturer', '') or ''),
-                        "Model": str(getattr(c0, 'Model', '') or ''),
-                        "SystemFamily": str(getattr(c0, 'SystemFamily', '') or ''),
-                        "TotalPhysicalMemory": str(getattr(c0, 'TotalPhysicalMemory', '') or ''),
-                    }
-                csp = wmi_client.Win32_ComputerSystemProduct()
-                if csp:
-                    p0 = csp[0]
-                    result["UUID"] = {
-                        "UUID": str(getattr(p0, 'UUID', '') or ''),
-                        "IdentifyingNumber": str(getattr(p0, 'IdentifyingNumber', '') or ''),
-                        "Name": str(getattr(p0, 'Name', '') or ''),
-                    }
-        except Exception:
-            pass
-
-        try:
-            if wmi_client:
-                cpus = wmi_client.Win32_Processor()
-                if cpus:
-                    p = cpus[0]
-                    result["CPU"] = {
-                        "Name": str(getattr(p, 'Name', '') or ''),
-                        "ProcessorId": str(getattr(p, 'ProcessorId', '') or ''),
-                        "NumberOfCores": int(getattr(p, 'NumberOfCores', 0) or 0),
-                        "NumberOfLogicalProcessors": int(getattr(p, 'NumberOfLogicalProcessors', 0) or 0),
-                        "MaxClockSpeed": int(getattr(p, 'MaxClockSpeed', 0) or 0),
-                    }
-        except Exception:
-            pass
-
-        try:
-            if wmi_client:
-                gpus = wmi_client.Win32_VideoController()
-                for g in gpus or []:
-                    result["GPU"].append({
-                        "Name": str(getattr(g, 'Name', '') or ''),
-                        "DriverVersion": str(getattr(g, 'DriverVersion', '') or ''),
-                        "PNPDeviceID": str(getattr(g, 'PNPDeviceID', '') or ''),
-                    })
-        except Exception:
-            pass
-
-        try:
-            if wmi_client:
-                for d in wmi_client.Win32_DiskDrive() or []:
-                    result["Disks"].append({
-                        "Model": str(getattr(d, 'Model', '') or ''),
-                        "SerialNumber": str(getattr(d, 'SerialNumber', '') or ''),
-                        "Size": str(getattr(d, 'Size', '') or ''),
-                        "PNPDeviceID": str(getattr(d, 'PNPDeviceID', '') or ''),
-                    })
-        except Exception:
-            pass
-
-        # Memory chips (RAM) serial numbers
-        try:
-            if wmi_client:
-                for m in wmi_client.Win32_PhysicalMemory() or []:
-                    sn = str(getattr(m, 'SerialNumber', '') or '')
-                    if sn:
-                        result["MemoryChips"].append({"SerialNumber": sn})
-            # Fallback for Win11/permission issues: use PowerShell CIM
-            if not result["MemoryChips"]:
-                try:
-                    import subprocess
-                    ps_cmd = [
-                        "powershell", "-NoProfile", "-ExecutionPolicy", "Bypass",
-                        "Get-CimInstance Win32_PhysicalMemory | Select-Object -ExpandProperty SerialNumber"
-                    ]
-                    proc = subprocess.run(ps_cmd, capture_output=True, text=True, shell=False)
-                    out = (proc.stdout or "").strip()
-                    for line in out.splitlines():
-                        sn = line.strip()
-                        if sn:
-                            result["MemoryChips"].append({"SerialNumber": sn})
-                except Exception:
-                    pass
-        except Exception:
-            pass
-
-        try:
-            if wmi_client:
-                for na in wmi_client.Win32_NetworkAdapterConfiguration() or []:
-                    if getattr(na, 'IPEnabled', False):
-                        ips = getattr(na, 'IPAddress', None) or []
-                        result["NetworkAdapters"].append({
-                            "Description": str(getattr(na, 'Description', '') or ''),
-                            "MACAddress": str(getattr(na, 'MACAddress', '') or ''),
-                            "IPAddresses": list(ips),
-                        })
-        except Exception:
-            pass
-
-        # Collect MAC addresses for all adapters (enabled or not)
-        try:
-            if wmi_client:
-                for na in wmi_client.Win32_NetworkAdapter() or []:
-                    mac = str(getattr(na, 'MACAddress', '') or '')
-                    desc = str(getattr(na, 'Name', '') or getattr(na, 'Description', '') or '')
-                    if mac:
-                        result["AllMACs"].append({"Description": desc, "MACAddress": mac})
-            # Fallback to getmac command if WMI yields none
-            if not result["AllMACs"]:
-                import subprocess, re
-                proc = subprocess.run(["getmac", "/v", "/fo", "list"], capture_output=True, text=True, shell=True)
-                out = proc.stdout or ""
-                lines = out.splitlines()
-                cur_desc = None
-                for line in lines:
-                    if "Network Adapter" in line:
-                        cur_desc = line.split(":", 1)[-1].strip()
-                    elif "Physical Address" in line:
-                        mac = line.split(":", 1)[-1].strip()
-                        if mac and cur_desc:
-                            result["AllMACs"].append({"Description": cur_desc, "MACAddress": mac})
-        except Exception:
-            pass
-
-        try:
-            if wmi_client:
-                os_list = wmi_client.Win32_OperatingSystem()
-                if os_list:
-                    o = os_list[0]
-                    result["OS"] = {
-                        "Caption": str(getattr(o, 'Caption', '') or ''),
-                        "Version": str(getattr(o, 'Version', '') or ''),
-                        "BuildNumber": str(getattr(o, 'BuildNumber', '') or ''),
-                        "OSArchitecture": str(getattr(o, 'OSArchitecture', '') or ''),
-                        "InstallDate": str(getattr(o, 'InstallDate', '') or ''),
-                        "LastBootUpTime": str(getattr(o, 'LastBootUpTime', '') or ''),
-                        "SerialNumber": str(getattr(o, 'SerialNumber', '') or ''),
-                    }
-        except Exception:
-            pass
-
-        try:
-            import winreg
-            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Cryptography") as k:
-                mg, _ = winreg.QueryValueEx(k, "MachineGuid")
-                result["Registry"]["MachineGuid"] = str(mg)
-        except Exception:
-            pass
-
-        try:
-            import ctypes
-            vol_name = ctypes.create_unicode_buffer(1024)
-            fs_name = ctypes.create_unicode_buffer(1024)
-            serial = ctypes.c_uint()
-            max_comp_len = ctypes.c_uint()
-            flags = ctypes.c_uint()
-            GetVolumeInformationW = ctypes.windll.kernel32.GetVolumeInformationW
-            r = GetVolumeInformationW(ctypes.c_wchar_p("C:\\"), vol_name, 1024, ctypes.byref(serial), ctypes.byref(max_comp_len), ctypes.byref(flags), fs_name, 1024)
-            if r:
-                result["Volumes"]["C"] = {
-                    "SerialNumber": int(serial.value),
-                    "VolumeName": vol_name.value,
-                    "FileSystem": fs_name.value,
-                }
-        except Exception:
-            pass
-
-        try:
-            settings = self.db_manager.load_settings()
-            overrides = settings.get('spoof_overrides', {}) if isinstance(settings, dict) else {}
-            if overrides:
-                bios_sn = overrides.get('BIOS.SerialNumber')
-                if bios_sn:
-                    result.setdefault('BIOS', {})['SerialNumber'] = bios_sn
-                cpu_serial = overrides.get('CPU.Serial')
-                if cpu_serial:
-                    result.setdefault('CPU', {})['Serial'] = cpu_serial
-                proc_id = overrides.get('CPU.ProcessorId')
-                if proc_id:
-                    result.setdefault('CPU', {})['ProcessorId'] = proc_id
-                os_sn = overrides.get('OS.SerialNumber')
-                if os_sn:
-                    result.setdefault('OS', {})['SerialNumber'] = os_sn
-                efi_num = overrides.get('EFI.Number')
-                if efi_num:
-                    result.setdefault('UUID', {})['EFI'] = efi_num
-        except Exception:
-            pass
-
-        return result
-
-    def format_serials_text(self, info: Dict[str, Any]) -> str:
+    def format_serials_text(self, info: Dict[str, Any], pending: bool = False) -> str:
         # Build HTML content mimicking WMIC-style sections with app theme colors
         def h(title: str, color: str) -> str:
             return f"<div style='color:{color}; font-weight:600; font-size:16px; margin-top:12px;'>{title}</div>" \
@@ -1198,8 +1344,11 @@ class PhantomIDGUI(QMainWindow):
             return f"<div style='margin-left:6px;'><span style='color:#e0f7ff;'>{label}</span>: <span style='color:#cfe9f5;'>{v}</span></div>"
         parts: List[str] = [
             "<div style='font-family:Segoe UI, sans-serif; font-size:13px'>",
-            h("Disk Number", "#ff4d4d"),
         ]
+        if pending:
+            done = getattr(self, '_serials_done', 0)
+            parts.append(f"<div style='color:#9aa4af;'>Collecting… {done}/{len(INVENTORY_SECTIONS)} sections</div>")
+        parts.append(h("Disk Number", "#ff4d4d"))
         disks = info.get("Disks", [])
         if disks:
             for d in disks:
@@ -1246,6 +1395,15 @@ class PhantomIDGUI(QMainWindow):
         else:
             parts.append(row("Adapter", "N/A"))
 
+        parts.append(h("Monitors", "#06d6a0"))
+        monitors = info.get("Monitors", [])
+        if monitors:
+            for m in monitors:
+                label = " ".join(x for x in (m.get("Manufacturer"), m.get("ProductCode")) if x) or "Monitor"
+                parts.append(row(label, m.get("SerialNumber")))
+        else:
+            parts.append(row("SerialNumber", "N/A"))
+
         parts.append("</div>")
         return "\n".join(parts) 
         disks = info.get("Disks", [])
@@ -1326,8 +1484,20 @@ class PhantomIDGUI(QMainWindow):
         self.log_level_combo.addItems(["DEBUG", "INFO", "WARNING", "ERROR"])
         self.log_level_combo.setCurrentIndex(1)
         log_layout.addWidget(self.log_level_combo)
+        view_logs_btn = MiniButton("View Logs")
+        view_logs_btn.clicked.connect(self.view_logs)
+        log_layout.addWidget(view_logs_btn)
         log_layout.addStretch()
         general_layout.addLayout(log_layout)
+
+        activity_layout = QHBoxLayout()
+        activity_layout.addWidget(QLabel("Activity log lines:"))
+        self.activity_lines_combo = QComboBox()
+        self.activity_lines_combo.addItems(["200", "500", "1000", "5000"])
+        self.activity_lines_combo.setCurrentIndex(1)
+        activity_layout.addWidget(self.activity_lines_combo)
+        activity_layout.addStretch()
+        general_layout.addLayout(activity_layout)
         
         layout.addWidget(general_group)
         
@@ -1372,7 +1542,7 @@ class PhantomIDGUI(QMainWindow):
         
         layout.addStretch()
         
-        self.content_stack.addWidget(page)
+        return page
 
     def on_spoof_mode_changed(self, text):
         try:
@@ -1588,8 +1758,7 @@ class PhantomIDGUI(QMainWindow):
                 path = styles_dir / name
                 if path.exists():
                     try:
-                        with open(path, 'r', encoding='utf-8') as f:
-                            parts.append(f.read())
+                        parts.append(read_qss(path))
                     except Exception:
                         continue
             # Conditional neon theme in PERMA mode
@@ -1603,8 +1772,7 @@ class PhantomIDGUI(QMainWindow):
                 if str(mode).lower() == 'perma':
                     neon_path = styles_dir / 'theme_neon.qss'
                     if neon_path.exists():
-                        with open(neon_path, 'r', encoding='utf-8') as f:
-                            parts.append(f.read())
+                        parts.append(read_qss(neon_path))
             except Exception:
                 pass
             qss = "\n\n".join(parts)
@@ -1639,6 +1807,9 @@ class PhantomIDGUI(QMainWindow):
         backup_action = file_menu.addAction("Create Backup")
         backup_action.triggered.connect(self.create_backup)
         
+        browse_action = file_menu.addAction("Browse Backups…")
+        browse_action.triggered.connect(self.browse_backups)
+
         restore_action = file_menu.addAction("Restore Backup")
         restore_action.triggered.connect(self.restore_backup)
         
@@ -1690,8 +1861,7 @@ class PhantomIDGUI(QMainWindow):
             fname = 'theme_popups_neon.qss' if str(mode).lower() == 'perma' else 'theme_popups.qss'
             path = styles_dir / fname
             if path.exists():
-                with open(path, 'r', encoding='utf-8') as f:
-                    return f.read()
+                return read_qss(path)
         except Exception:
             pass
         return ""
@@ -1755,44 +1925,91 @@ class PhantomIDGUI(QMainWindow):
         
     def setup_logging(self):
         level = logging.INFO
+        settings = {}
         try:
-            settings = self.db_manager.load_settings()
+            settings = self.db_manager.load_settings() or {}
             level_str = str(settings.get('log_level', 'INFO')).upper()
             level = getattr(logging, level_str, logging.INFO)
         except Exception:
             pass
-        logging.basicConfig(
-            level=level,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('phantomid.log'),
-                logging.StreamHandler()
-            ]
-        )
+        try:
+            setup_logging(
+                level=level,
+                log_file=LOG_FILE,
+                max_bytes=int(float(settings.get('log_max_mb', 5)) * 1024 * 1024),
+                backup_count=int(settings.get('log_backups', 5)),
+                rotate_hours=float(settings.get('log_rotate_hours', 24)),
+                compress=bool(settings.get('log_compress', True)),
+            )
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Failed to set up logging: {e}")
 
-    def apply_settings(self):
+    def load_settings_with_defaults(self) -> dict:
+        settings = dict(DEFAULT_SETTINGS)
+        try:
+            settings.update(self.db_manager.load_settings() or {})
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Failed to load settings: {e}")
+        return settings
+
+    def current_settings(self) -> dict:
+        """Settings as shown in the Settings page, or as stored if it was never opened."""
+        settings = self.load_settings_with_defaults()
+        if not self.page_built(SETTINGS_PAGE):
+            return settings
+        try:
+            settings.update({
+                'auto_backup': self.auto_backup_check.isChecked(),
+                'backup_interval': int(self.backup_interval_spin.currentText()),
+                'log_level': self.log_level_combo.currentText(),
+                'data_retention': int(self.data_retention_spin.currentText()),
+                'auto_update': bool(self.auto_update_check.isChecked()),
+                'auto_update_apply': bool(self.update_auto_apply_check.isChecked()),
+                'spoof_mode': self.spoof_mode_combo.currentText(),
+                'activity_log_max_lines': int(self.activity_lines_combo.currentText()),
+            })
+        except Exception:
+            pass
+        return settings
+
+    def populate_settings_widgets(self, settings: dict):
+        widgets = [
+            self.auto_backup_check, self.backup_interval_spin, self.log_level_combo,
+            self.data_retention_spin, self.auto_update_check, self.update_auto_apply_check,
+            self.spoof_mode_combo, self.activity_lines_combo,
+        ]
+        for w in widgets:
+            w.blockSignals(True)
         try:
-            settings = self.db_manager.load_settings()
             self.auto_backup_check.setChecked(bool(settings.get('auto_backup', True)))
-            backup_interval = str(settings.get('backup_interval', 7))
-            idx = self.backup_interval_spin.findText(backup_interval)
-            if idx != -1:
-                self.backup_interval_spin.setCurrentIndex(idx)
-            log_level = str(settings.get('log_level', 'INFO')).upper()
-            idx = self.log_level_combo.findText(log_level)
-            if idx != -1:
-                self.log_level_combo.setCurrentIndex(idx)
-            retention = str(settings.get('data_retention', 30))
-            idx = self.data_retention_spin.findText(retention)
-            if idx != -1:
-                self.data_retention_spin.setCurrentIndex(idx)
+            combos = [
+                (self.backup_interval_spin, settings.get('backup_interval', 7)),
+                (self.log_level_combo, str(settings.get('log_level', 'INFO')).upper()),
+                (self.data_retention_spin, settings.get('data_retention', 30)),
+                (self.spoof_mode_combo, settings.get('spoof_mode', 'Temp')),
+                (self.activity_lines_combo, settings.get('activity_log_max_lines', ACTIVITY_LOG_DEFAULT_LINES)),
+            ]
+            for combo, value in combos:
+                idx = combo.findText(str(value))
+                if idx != -1:
+                    combo.setCurrentIndex(idx)
             self.auto_update_check.setChecked(bool(settings.get('auto_update', True)))
             self.update_auto_apply_check.setChecked(bool(settings.get('auto_update_apply', True)))
-            self.auto_backup_enabled = self.auto_backup_check.isChecked()
-            mode = str(settings.get('spoof_mode', 'Temp'))
-            m_idx = self.spoof_mode_combo.findText(mode)
-            if m_idx != -1:
-                self.spoof_mode_combo.setCurrentIndex(m_idx)
+        finally:
+            for w in widgets:
+                w.blockSignals(False)
+
+    def apply_settings(self):
+        try:
+            settings = self.load_settings_with_defaults()
+            if self.page_built(SETTINGS_PAGE):
+                self.populate_settings_widgets(settings)
+            self.auto_backup_enabled = bool(settings.get('auto_backup', True))
+            try:
+                self.activity_model.set_max_lines(int(settings.get('activity_log_max_lines', ACTIVITY_LOG_DEFAULT_LINES)))
+            except (TypeError, ValueError):
+                pass
+            log_level = str(settings.get('log_level', 'INFO')).upper()
             level_map = {
                 'DEBUG': logging.DEBUG,
                 'INFO': logging.INFO,
@@ -1807,10 +2024,12 @@ class PhantomIDGUI(QMainWindow):
         
     def start_session(self):
         self.current_session = self.db_manager.start_session()
+        self.heartbeat_timer.start(SESSION_HEARTBEAT_MS)
         self.session_label.setText(f"Session: {self.current_session[:8]}...")
         self.log_activity(f"Session started: {self.current_session}")
         
     def end_session(self):
+        self.heartbeat_timer.stop()
         if self.current_session:
             self.db_manager.end_session(self.current_session)
             self.log_activity(f"Session ended: {self.current_session}")
@@ -1822,27 +2041,37 @@ class PhantomIDGUI(QMainWindow):
                 return
             if self.auto_backup_enabled:
                 try:
-                    interval_days = int(self.backup_interval_spin.currentText())
+                    interval_days = int(self.current_settings().get('backup_interval', 7))
                 except Exception:
                     interval_days = 7
-                interval_ms = max(1, interval_days) * 24 * 60 * 60 * 1000
-                self.backup_timer.stop()
-                self.backup_timer.start(interval_ms)
-                self.log_activity(f"Auto-backup scheduled every {interval_days} day(s)")
+                self.backup_scheduler.configure(interval_days, enabled=True)
+                self.arm_backup_timer()
+                due = self.backup_scheduler.next_due()
+                self.log_activity(f"Auto-backup every {interval_days} day(s), next due {due:%Y-%m-%d %H:%M}")
             else:
+                self.backup_scheduler.configure(1, enabled=False)
                 self.backup_timer.stop()
                 self.log_activity("Auto-backup disabled")
         except Exception as e:
             logging.getLogger(__name__).warning(f"Failed to schedule auto-backup: {e}")
 
+    def arm_backup_timer(self, delay_ms: int | None = None):
+        if delay_ms is None:
+            seconds = self.backup_scheduler.seconds_until_due()
+            if seconds is None:
+                self.backup_timer.stop()
+                return
+            delay_ms = int(seconds * 1000)
+        self.backup_timer.start(max(BACKUP_CHECK_MIN_MS, min(BACKUP_CHECK_MAX_MS, delay_ms)))
+
     def schedule_auto_update(self):
         try:
             if not hasattr(self, 'update_timer'):
                 return
-            enabled = bool(self.auto_update_check.isChecked())
+            settings = self.current_settings()
+            enabled = bool(settings.get('auto_update', True))
             interval_min = 60
             try:
-                settings = self.db_manager.load_settings()
                 interval_min = int(settings.get('update_interval', interval_min))
             except Exception:
                 pass
@@ -1861,7 +2090,7 @@ class PhantomIDGUI(QMainWindow):
             updated, message = self.auto_updater.perform_update_if_available()
             if updated:
                 self.log_activity(message)
-                if bool(self.update_auto_apply_check.isChecked()):
+                if bool(self.current_settings().get('auto_update_apply', True)):
                     self.message_info("Update", "An update was applied. The application will restart.")
                     self.auto_updater.restart_application()
                     QApplication.instance().quit()
@@ -1871,63 +2100,153 @@ class PhantomIDGUI(QMainWindow):
             logging.getLogger(__name__).warning(f"Update check failed: {e}")
 
     def on_backup_timer_timeout(self):
-        try:
-            self.log_activity("Auto-backup timer triggered")
-            self.create_backup()
+        delay_ms = None
+        try:
+            action, detail = self.backup_scheduler.evaluate()
+            if action == ACTION_SKIP:
+                self.backup_scheduler.record_skip(detail)
+                self.log_activity(f"Auto-backup skipped ({detail})")
+            elif action == ACTION_TAKE and self.integrity_scanner.last_report is None:
+                # Don't back up before this session has checked the database once
+                self.integrity_next_pass = 0
+                delay_ms = BACKUP_CHECK_MIN_MS
+            elif action == ACTION_TAKE:
+                self.log_activity(f"Auto-backup started ({detail})")
+                self.start_backup(priority=PRIORITY_LOW, reason=detail)
+                # The schedule moves once the job finishes; don't re-check before then
+                delay_ms = BACKUP_CHECK_MAX_MS
         except Exception as e:
             logging.getLogger(__name__).warning(f"Auto-backup error: {e}")
+        if self.auto_backup_enabled:
+            self.arm_backup_timer(delay_ms)
+
+    def on_integrity_tick(self):
+        if self.integrity_job is not None:
+            return
+        if not self.integrity_scanner.active and time.monotonic() < self.integrity_next_pass:
+            return
+        st = self.jobs.stats()
+        if st['queued'] or st['running']:
+            return
+        worker = IntegrityStepWorker(self.integrity_scanner)
+        worker.step_finished.connect(self.on_integrity_step_finished)
+        self.integrity_job = self.jobs.submit(worker, worker.spoofer_type, priority=PRIORITY_LOW, groups=("database",))
+
+    def on_integrity_step_finished(self, done: bool, error: str):
+        self.integrity_job = None
+        if error == "busy":
+            # Another process holds the lock; the same table is retried on the next idle tick
+            logging.getLogger(__name__).debug("Integrity check step deferred: database locked")
+        elif error and error != "cancelled":
+            logging.getLogger(__name__).warning(f"Integrity check step failed: {error}")
+        if done:
+            self.integrity_next_pass = time.monotonic() + INTEGRITY_SCAN_INTERVAL_S
+            self.show_integrity_report(self.integrity_scanner.last_report)
+        elif not error:
+            # Carry on with the next table straight away if nothing else is waiting
+            QTimer.singleShot(0, self.on_integrity_tick)
+
+    def show_integrity_report(self, report):
+        if report is None:
+            return
+        if report.database_ok:
+            self.backup_scheduler.release()
+        else:
+            # Backing up now would replace good copies with damaged ones
+            self.backup_scheduler.hold("integrity check failed")
+        if report.ok:
+            self.integrity_warning.hide()
+            self.log_activity(f"Integrity check passed ({report.tables_checked} tables, newest backup {report.backup_status})")
+            return
+        lines = []
+        if not report.database_ok:
+            tables = sorted({i.target for i in report.issues if i.source == 'database'})
+            lines.append(f"⚠ Database integrity check failed in {', '.join(tables)}. "
+                         f"Auto-backups are paused so existing backups stay intact; restore from a backup or run a repair.")
+        if not report.backup_ok:
+            state = INTEGRITY_BACKUP_STATUS.get(report.backup_status, report.backup_status)
+            lines.append(f"⚠ Newest backup {Path(report.backup_path).name} {state}."
+                         + (" Take a new backup to replace it." if report.database_ok else ""))
+        self.integrity_warning.setText("\n".join(lines))
+        self.integrity_warning.setToolTip("\n".join(f"{i.source} {i.target}: {i.message}" for i in report.issues))
+        self.integrity_warning.show()
+        self.log_activity(f"Integrity check found {len(report.issues)} problem(s)")
 
     def prompt_rollback_if_needed(self):
         try:
-            unclosed = 0
+            crashed = self.db_manager.find_crashed_session()
+            if not crashed:
+                return
+            # Report each crash once, whatever the answer
+            self.db_manager.mark_session_crashed(crashed['id'])
+            last_seen = crashed['last_seen'].replace('T', ' ')
+            self.log_activity(f"Previous session {crashed['id'][:8]} ended unexpectedly (last active {last_seen})")
+            last_backup = None
             try:
-                unclosed = self.db_manager.get_unclosed_sessions_count()
+                last_backup = self.db_manager.get_last_backup()
             except Exception:
-                unclosed = 0
-            if unclosed > 0:
                 last_backup = None
-                try:
-                    last_backup = self.db_manager.get_last_backup()
-                except Exception:
-                    last_backup = None
-                backup_path = (last_backup or {}).get('backup_path')
-                msg = "It looks like the last session didn't end cleanly."
-                if backup_path:
-                    msg += f"\nRestore from last backup?\n{backup_path}"
-                reply = self.message_question(
-                    "Unclosed Session Detected",
-                    msg,
-                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                    QMessageBox.StandardButton.No,
-                )
-                if reply == QMessageBox.StandardButton.Yes and backup_path:
-                    self.worker = SpooferWorker("backup_restore", backup_path=backup_path)
-                    self.worker.set_db_manager(self.db_manager)
-                    self.worker.progress_updated.connect(self.on_worker_progress_updated)
-                    self.worker.status_updated.connect(self.on_worker_status_updated)
-                    self.worker.operation_completed.connect(self.on_operation_completed)
-                    self.worker.start()
-                    self.log_activity("Initiated rollback from last backup")
+            backup_path = (last_backup or {}).get('backup_path')
+            msg = f"It looks like the last session didn't end cleanly.\nIt was last active at {last_seen}."
+            if backup_path:
+                msg += f"\nRestore from last backup ({(last_backup.get('created_at') or '').replace('T', ' ')})?\n{backup_path}"
+            reply = self.message_question(
+                "Unclosed Session Detected",
+                msg,
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No,
+            )
+            if reply == QMessageBox.StandardButton.Yes and backup_path:
+                self.submit_worker(SpooferWorker("backup_restore", backup_path=backup_path), priority=PRIORITY_HIGH)
+                self.log_activity("Initiated rollback from last backup")
         except Exception as e:
             logging.getLogger(__name__).warning(f"Rollback prompt failed: {e}")
             
+    def page_built(self, index: int) -> bool:
+        return 0 <= index < len(self._pages) and self._pages[index] is not None
+
+    def _ensure_page(self, index: int):
+        if not 0 <= index < len(self._pages) or self._pages[index] is not None:
+            return
+        t0 = time.perf_counter()
+        page = self._page_builders[index]()
+        placeholder = self.content_stack.widget(index)
+        self.content_stack.insertWidget(index, page)
+        if placeholder is not None:
+            self.content_stack.removeWidget(placeholder)
+            placeholder.deleteLater()
+        self._pages[index] = page
+        if index == SETTINGS_PAGE:
+            self.populate_settings_widgets(self.load_settings_with_defaults())
+        logging.getLogger(__name__).debug(f"Built page '{PAGE_TITLES[index]}' in {(time.perf_counter() - t0) * 1000:.1f} ms")
+
     def switch_page(self, index):
+        if index == HISTORY_PAGE and self.page_built(HISTORY_PAGE):
+            # Pick up rows written while another page was showing
+            self._history_step(self.history_model.reload)
+        self._ensure_page(index)
         self.content_stack.setCurrentIndex(index)
         for i, btn in enumerate(self.nav_buttons):
             btn.setProperty("active", i == index)
             btn.style().unpolish(btn)
             btn.style().polish(btn)
         try:
-            titles = ["Dashboard", "Game Spoofing", "System Spoofing", "Serial Checker", "Settings"]
             if hasattr(self, 'title_bar') and hasattr(self.title_bar, 'title_label'):
-                page_title = titles[index] if 0 <= index < len(titles) else "PhantomID"
+                page_title = PAGE_TITLES[index] if 0 <= index < len(PAGE_TITLES) else "PhantomID"
                 self.title_bar.title_label.setText(f"PhantomID — {page_title}")
         except Exception:
             pass
                 
     def log_activity(self, message):
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.activity_text.append(f"[{timestamp}] {message}")   
+        self.activity_model.append(f"[{timestamp}] {message}")
+
+    def anti_detect_enabled(self, option: str) -> bool:
+        # Options default to on, which is what the game page shows before it is built
+        checks = getattr(self, 'anti_detect_checks', None)
+        if not checks or option not in checks:
+            return True
+        return bool(checks[option].isChecked())
     
             
     def spoof_game(self, game_name):
@@ -1939,16 +2258,13 @@ class PhantomIDGUI(QMainWindow):
                     self.message_info("Game Not Found", f"{game_name} spoofing cancelled. Please install the game first.")
                     return
             self.current_operation = "game"
-            if self.anti_detect_checks.get("Randomize Timing"):
+            if self.anti_detect_enabled("Randomize Timing"):
                 self.anti_detection.randomize_timing()
-            if self.anti_detect_checks.get("Clear System Traces"):
+            if self.anti_detect_enabled("Clear System Traces"):
                 self.anti_detection.clear_system_traces()
-            if self.anti_detect_checks.get("Spoof File Timestamps"):
+            if self.anti_detect_enabled("Spoof File Timestamps"):
                 self.anti_detection.spoof_file_timestamps(".")
-            self.worker = SpooferWorker("game", game_name)
-            self.worker.set_db_manager(self.db_manager)
-            self.worker.operation_completed.connect(self.on_operation_completed)
-            self.worker.start()
+            self.submit_worker(SpooferWorker("game", game_name), track_progress=False)
             self.log_activity(f"Started spoofing {game_name}")
             
         except Exception as e:
@@ -1972,18 +2288,13 @@ class PhantomIDGUI(QMainWindow):
             
             self.on_worker_status_updated(f"Spoofing {len(selected_options)} system identifiers...")
             self.on_worker_progress_updated(0)
-            if self.anti_detect_checks.get("Randomize Timing"):
+            if self.anti_detect_enabled("Randomize Timing"):
                 self.anti_detection.randomize_timing()
-            if self.anti_detect_checks.get("Clear System Traces"):
+            if self.anti_detect_enabled("Clear System Traces"):
                 self.anti_detection.clear_system_traces()
-            if self.anti_detect_checks.get("Spoof File Timestamps"):
+            if self.anti_detect_enabled("Spoof File Timestamps"):
                 self.anti_detection.spoof_file_timestamps(".")
-            self.worker = SpooferWorker("system", system_options=selected_options)
-            self.worker.set_db_manager(self.db_manager)
-            self.worker.progress_updated.connect(self.on_worker_progress_updated)
-            self.worker.status_updated.connect(self.on_worker_status_updated)
-            self.worker.operation_completed.connect(self.on_operation_completed)
-            self.worker.start()
+            self.submit_worker(SpooferWorker("system", system_options=selected_options))
             self.log_activity(f"Started spoofing {len(selected_options)} system identifiers")
             
         except Exception as e:
@@ -2000,12 +2311,7 @@ class PhantomIDGUI(QMainWindow):
                 return
             self.on_worker_status_updated(f"Simulating {len(selected_options)} system identifiers...")
             self.on_worker_progress_updated(0)
-            self.worker = SpooferWorker("system_dry_run", system_options=selected_options)
-            self.worker.set_db_manager(self.db_manager)
-            self.worker.progress_updated.connect(self.on_worker_progress_updated)
-            self.worker.status_updated.connect(self.on_worker_status_updated)
-            self.worker.operation_completed.connect(self.on_operation_completed)
-            self.worker.start()
+            self.submit_worker(SpooferWorker("system_dry_run", system_options=selected_options))
         except Exception as e:
             self.message_error("Dry Run Error", f"Error: {str(e)}")
 
@@ -2022,12 +2328,7 @@ class PhantomIDGUI(QMainWindow):
         try:
             self.on_worker_status_updated("Restoring original system identifiers...")
             self.on_worker_progress_updated(0)
-            self.worker = SpooferWorker("restore")
-            self.worker.set_db_manager(self.db_manager)
-            self.worker.progress_updated.connect(self.on_worker_progress_updated)
-            self.worker.status_updated.connect(self.on_worker_status_updated)
-            self.worker.operation_completed.connect(self.on_operation_completed)
-            self.worker.start()
+            self.submit_worker(SpooferWorker("restore"))
             self.log_activity("Started restoring original system identifiers")
             
         except Exception as e:
@@ -2143,12 +2444,7 @@ class PhantomIDGUI(QMainWindow):
         try:
             self.on_worker_status_updated("Scanning registry...")
             self.on_worker_progress_updated(0)
-            self.worker = SpooferWorker("registry_scan")
-            self.worker.set_db_manager(self.db_manager)
-            self.worker.progress_updated.connect(self.on_worker_progress_updated)
-            self.worker.status_updated.connect(self.on_worker_status_updated)
-            self.worker.operation_completed.connect(self.on_operation_completed)
-            self.worker.start()
+            self.submit_worker(SpooferWorker("registry_scan"))
             self.log_activity("Started registry scan")
             
         except Exception as e:
@@ -2158,12 +2454,7 @@ class PhantomIDGUI(QMainWindow):
         try:
             self.on_worker_status_updated("Backing up registry...")
             self.on_worker_progress_updated(0)
-            self.worker = SpooferWorker("registry_backup")
-            self.worker.set_db_manager(self.db_manager)
-            self.worker.progress_updated.connect(self.on_worker_progress_updated)
-            self.worker.status_updated.connect(self.on_worker_status_updated)
-            self.worker.operation_completed.connect(self.on_operation_completed)
-            self.worker.start()
+            self.submit_worker(SpooferWorker("registry_backup"))
             self.log_activity("Started registry backup")
             
         except Exception as e:
@@ -2173,12 +2464,7 @@ class PhantomIDGUI(QMainWindow):
         try:
             self.on_worker_status_updated("Analyzing system...")
             self.on_worker_progress_updated(0)
-            self.worker = SpooferWorker("system_analysis")
-            self.worker.set_db_manager(self.db_manager)
-            self.worker.progress_updated.connect(self.on_worker_progress_updated)
-            self.worker.status_updated.connect(self.on_worker_status_updated)
-            self.worker.operation_completed.connect(self.on_operation_completed)
-            self.worker.start()
+            self.submit_worker(SpooferWorker("system_analysis"))
             self.log_activity("Started system analysis")
             
         except Exception as e:
@@ -2195,12 +2481,7 @@ class PhantomIDGUI(QMainWindow):
             if reply == QMessageBox.StandardButton.Yes:
                 self.on_worker_status_updated("Cleaning up database...")
                 self.on_worker_progress_updated(0)
-                self.worker = SpooferWorker("database_cleanup")
-                self.worker.set_db_manager(self.db_manager)
-                self.worker.progress_updated.connect(self.on_worker_progress_updated)
-                self.worker.status_updated.connect(self.on_worker_status_updated)
-                self.worker.operation_completed.connect(self.on_operation_completed)
-                self.worker.start()
+                self.submit_worker(SpooferWorker("database_cleanup"))
                 self.log_activity("Started database cleanup")
                 
         except Exception as e:
@@ -2216,8 +2497,10 @@ class PhantomIDGUI(QMainWindow):
                 'auto_update': bool(self.auto_update_check.isChecked()),
                 'auto_update_apply': bool(self.update_auto_apply_check.isChecked()),
                 'spoof_mode': self.spoof_mode_combo.currentText(),
+                'activity_log_max_lines': int(self.activity_lines_combo.currentText()),
             }
             self.db_manager.save_settings(settings)
+            self.activity_model.set_max_lines(settings['activity_log_max_lines'])
             try:
                 self.apply_stylesheets()
                 self.update()
@@ -2225,6 +2508,7 @@ class PhantomIDGUI(QMainWindow):
                 pass
             try:
                 if settings.get('spoof_mode', 'Temp') == 'Temp':
+                    from spoofers.system_spoofers import SystemSpoofer
                     spoofer = SystemSpoofer(self.db_manager)
                     spoofer.regenerate_restore_script()
                     ensured = spoofer.ensure_temp_restore_task()
@@ -2241,6 +2525,9 @@ class PhantomIDGUI(QMainWindow):
             self.message_error("Settings Error", f"Error saving settings: {str(e)}")
 
     def create_backup(self):
+        self.start_backup()
+
+    def start_backup(self, priority: int = PRIORITY_NORMAL, reason: str = 'manual'):
         try:
             # Prepare snapshot so backup contains system, registry, and settings
             self.on_worker_status_updated("Preparing backup snapshot...")
@@ -2252,19 +2539,15 @@ class PhantomIDGUI(QMainWindow):
                         self.db_manager.prepare_prebackup_snapshot()
                     except Exception:
                         pass
-                    # Save current app settings silently (no dialog)
-                    try:
-                        settings = {
-                            'auto_backup': self.auto_backup_check.isChecked(),
-                            'backup_interval': int(self.backup_interval_spin.currentText()),
-                            'log_level': self.log_level_combo.currentText(),
-                            'data_retention': int(self.data_retention_spin.currentText()),
-                            'auto_update': bool(self.auto_update_check.isChecked()),
-                            'auto_update_apply': bool(self.update_auto_apply_check.isChecked()),
-                        }
-                        self.db_manager.save_settings(settings)
-                    except Exception:
-                        pass
+                    # Save current app settings silently (no dialog); when the
+                    # Settings page was never opened the stored values are current
+                    if self.page_built(SETTINGS_PAGE):
+                        try:
+                            settings = self.current_settings()
+                            settings.pop('spoof_mode', None)
+                            self.db_manager.save_settings(settings)
+                        except Exception:
+                            pass
             except Exception as e:
                 try:
                     logging.getLogger(__name__).warning(f"Pre-backup snapshot failed: {e}")
@@ -2273,12 +2556,10 @@ class PhantomIDGUI(QMainWindow):
             # Begin backup creation
             self.on_worker_status_updated("Creating backup...")
             self.on_worker_progress_updated(0)
-            self.worker = SpooferWorker("backup_creation")
-            self.worker.set_db_manager(self.db_manager)
-            self.worker.progress_updated.connect(self.on_worker_progress_updated)
-            self.worker.status_updated.connect(self.on_worker_status_updated)
-            self.worker.operation_completed.connect(self.on_operation_completed)
-            self.worker.start()
+            worker = SpooferWorker("backup_creation")
+            worker.backup_reason = reason
+            worker.backup_scheduler = self.backup_scheduler
+            self.submit_worker(worker, priority=priority)
             self.log_activity("Started backup creation")
             
         except Exception as e:
@@ -2295,29 +2576,41 @@ class PhantomIDGUI(QMainWindow):
                 if selected:
                     file_path = selected[0]
             if file_path:
-                self.on_worker_status_updated("Restoring backup...")
-                self.on_worker_progress_updated(0)
-                self.worker = SpooferWorker("backup_restore", backup_path=file_path)
-                self.worker.set_db_manager(self.db_manager)
-                self.worker.progress_updated.connect(self.on_worker_progress_updated)
-                self.worker.status_updated.connect(self.on_worker_status_updated)
-                self.worker.operation_completed.connect(self.on_operation_completed)
-                self.worker.start()
-                self.log_activity("Started backup restoration")
+                self.start_restore(file_path)
                 
         except Exception as e:
             self.message_error("Restore Error", f"Error restoring backup: {str(e)}")
 
+    def start_restore(self, file_path: str):
+        self.on_worker_status_updated("Restoring backup...")
+        self.on_worker_progress_updated(0)
+        self.submit_worker(SpooferWorker("backup_restore", backup_path=file_path), priority=PRIORITY_HIGH)
+        self.log_activity("Started backup restoration")
+
+    def browse_backups(self):
+        try:
+            from ui.backup_browser import BackupBrowserDialog
+            dlg = BackupBrowserDialog(self.db_manager, self.jobs, self)
+            self.style_popup(dlg)
+
+            def _confirm_restore(path: str):
+                answer = self.message_question(
+                    "Restore Backup",
+                    f"Replace the live database with {Path(path).name}?\n\n{dlg.restore_summary(path)}")
+                if answer == QMessageBox.StandardButton.Yes:
+                    dlg.accept()
+                    self.start_restore(path)
+
+            dlg.restore_requested.connect(_confirm_restore)
+            dlg.exec()
+        except Exception as e:
+            self.message_error("Backup Error", f"Error opening backups: {str(e)}")
+
     def optimize_system(self):
         try:
             self.on_worker_status_updated("Optimizing system...")
             self.on_worker_progress_updated(0)
-            self.worker = SpooferWorker("optimization")
-            self.worker.set_db_manager(self.db_manager)
-            self.worker.progress_updated.connect(self.on_worker_progress_updated)
-            self.worker.status_updated.connect(self.on_worker_status_updated)
-            self.worker.operation_completed.connect(self.on_operation_completed)
-            self.worker.start()
+            self.submit_worker(SpooferWorker("optimization"))
             self.log_activity("Started system optimization")
             
         except Exception as e:
@@ -2327,12 +2620,7 @@ class PhantomIDGUI(QMainWindow):
         try:
             self.on_worker_status_updated("Cleaning registry...")
             self.on_worker_progress_updated(0)
-            self.worker = SpooferWorker("registry")
-            self.worker.set_db_manager(self.db_manager)
-            self.worker.progress_updated.connect(self.on_worker_progress_updated)
-            self.worker.status_updated.connect(self.on_worker_status_updated)
-            self.worker.operation_completed.connect(self.on_operation_completed)
-            self.worker.start()
+            self.submit_worker(SpooferWorker("registry"))
             self.log_activity("Started registry cleaning")
             
         except Exception as e:
@@ -2340,12 +2628,7 @@ class PhantomIDGUI(QMainWindow):
 
     def spoof_system(self):
         try:
-            self.worker = SpooferWorker("system")
-            self.worker.set_db_manager(self.db_manager)
-            self.worker.progress_updated.connect(self.on_worker_progress_updated)
-            self.worker.status_updated.connect(self.on_worker_status_updated)
-            self.worker.operation_completed.connect(self.on_operation_completed)
-            self.worker.start()
+            self.submit_worker(SpooferWorker("system"))
             self.log_activity("Started system spoofing")
             
         except Exception as e:
@@ -2353,19 +2636,23 @@ class PhantomIDGUI(QMainWindow):
             
     def cleanup_system(self):
         try:
-            self.worker = SpooferWorker("optimization")
-            self.worker.set_db_manager(self.db_manager)
-            self.worker.progress_updated.connect(self.on_worker_progress_updated)
-            self.worker.status_updated.connect(self.on_worker_status_updated)
-            self.worker.operation_completed.connect(self.on_operation_completed)
-            self.worker.start()
+            self.submit_worker(SpooferWorker("optimization"))
             self.log_activity("Started system cleanup")
             
         except Exception as e:
             self.message_error("Cleanup Error", f"Error: {str(e)}")
             
     def on_operation_completed(self, success, message):
-        if getattr(self, 'current_operation', None) == 'game':
+        sender = self.sender()
+        self._operation_jobs.pop(getattr(sender, 'job_id', None), None)
+        operation = getattr(sender, 'spoofer_type', None) or getattr(self, 'current_operation', None)
+        if message == OPERATION_CANCELLED:
+            self.on_worker_status_updated(OPERATION_CANCELLED)
+            self.on_worker_progress_updated(0)
+            self.log_activity(f"{operation or 'Operation'} cancelled")
+            self.current_operation = None
+            return
+        if operation == 'game':
             if success:
                 self.message_info("Success", message)
             else:
@@ -2409,20 +2696,11 @@ class PhantomIDGUI(QMainWindow):
         
     def view_logs(self):
         try:
-            with open('phantomid.log', 'r') as f:
-                logs = f.read()
-                
-            dlg = QDialog(self)
-            dlg.setWindowTitle("Application Logs")
-            layout = QVBoxLayout(dlg)
-            text = QTextEdit()
-            text.setPlainText(logs)
-            text.setReadOnly(True)
-            text.setMinimumSize(800, 600)
-            layout.addWidget(text)
-            close_btn = QPushButton("Close")
-            close_btn.clicked.connect(dlg.accept)
-            layout.addWidget(close_btn)
+            if not os.path.exists(LOG_FILE):
+                self.message_info("Application Logs", "No log file has been written yet.")
+                return
+            from ui.log_viewer import LogViewerDialog
+            dlg = LogViewerDialog(LOG_FILE, self)
             self.style_popup(dlg)
             dlg.exec()
             
@@ -2441,6 +2719,17 @@ class PhantomIDGUI(QMainWindow):
     def show_help(self):
         self.message_info("User Guide", "User guide will be displayed here. For now, please refer to the README.md file.")
             
+    def on_startup_report(self, report: str):
+        logging.getLogger(__name__).info(report)
+        self.log_activity(report)
+
+    def bring_to_front(self):
+        if self.isMinimized():
+            self.showNormal()
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
     def closeEvent(self, event):
         reply = self.message_question(
             'Exit Confirmation',
@@ -2450,7 +2739,11 @@ class PhantomIDGUI(QMainWindow):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
+            self.integrity_timer.stop()
+            self.jobs.shutdown()
             self.end_session()
+            self.flush_metrics()
+            shutdown_logging()
             event.accept()
         else:
             event.ignore()
@@ -2459,17 +2752,31 @@ def main():
     print("Starting application")
     try:
         app = QApplication(sys.argv)
+        startup_timer.mark('qapplication')
         print("Application created")
         app.setApplicationName("PhantomID")
         app.setApplicationVersion("2.0")
+        instance = SingleInstance(DatabaseManager.default_path())
+        if not instance.acquire():
+            print("PhantomID is already running; activated the existing window")
+            sys.exit(0)
+        try:
+            get_asset_service().device_pixel_ratio = float(app.devicePixelRatio())
+        except Exception:
+            pass
         
         
         print("Creating window...")
         window = PhantomIDGUI()
+        startup_timer.mark('window')
         print("Window created")
+        startup_timer.watch_first_paint(window, window.on_startup_report)
+        instance.activation_requested.connect(window.bring_to_front)
         window.show()
         print("Window shown, entering event loop")
-        sys.exit(app.exec())
+        code = app.exec()
+        instance.release()
+        sys.exit(code)
     except Exception as e:
         print(f"Error in main: {str(e)}")
         import traceback
@@ -2478,58 +2785,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-class LogoLoader(QThread):
-    pixmap_ready = Signal(QPixmap)
-
-    def __init__(self, game_name: str):
-        super().__init__()
-        self.game_name = game_name
-
-    def run(self):
-        pm = None
-        try:
-            pm = get_game_bg_pixmap(self.game_name)
-        except Exception:
-            pm = None
-        if pm is None:
-            try:
-                pm = get_text_logo_pixmap(self.game_name, 400, 160)
-            except Exception:
-                pm = None
-        try:
-            self.pixmap_ready.emit(pm)
-        except Exception:
-            pass
-        # Monitors (EDID) info with overrides
-        try:
-            if wmi_client:
-                monitors = []
-                try:
-                    w = wmi.WMI(namespace="root\\wmi")
-                except Exception:
-                    w = None
-                if w is not None:
-                    for mon in w.WmiMonitorID() or []:
-                        try:
-                            mf = "".join(chr(c) for c in (mon.ManufacturerName or []) if c)
-                            pc = "".join(chr(c) for c in (mon.ProductCodeID or []) if c)
-                            sn = "".join(chr(c) for c in (mon.SerialNumberID or []) if c)
-                            key = f"{mf}-{pc}" if mf or pc else (getattr(mon, 'InstanceName', 'MONITOR'))
-                            monitors.append({"Key": key, "Manufacturer": mf, "Product": pc, "SerialNumber": sn})
-                        except Exception:
-                            continue
-                # Apply overrides from settings
-                try:
-                    overrides = {}
-                    if hasattr(self, 'db_manager') and self.db_manager:
-                        s = self.db_manager.load_settings()
-                        overrides = s.get('Monitor.SerialOverrides', {}) if isinstance(s, dict) else {}
-                    for m in monitors:
-                        ov = overrides.get(m.get('Key'))
-                        if ov:
-                            m['SerialNumber'] = ov
-                    result['Monitors'] = monitors
-                except Exception:
-                    result['Monitors'] = monitors
-        except Exception:
-            pass
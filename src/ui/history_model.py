@@ -0,0 +1,168 @@
+from typing import Any, List
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QColor
+
+from core.database_manager import HISTORY_PAGE_SIZE
+
+# (source key, label, [(column header, column name), ...])
+HISTORY_VIEWS = [
+    ("changes", "System Changes", [
+        ("Time", "timestamp"), ("Item", "item"), ("Original", "original_value"), ("New", "new_value"),
+        ("Status", "success"), ("Error", "error_message"), ("Session", "session_id"),
+    ]),
+    ("registry_changes", "Registry Changes", [
+        ("Time", "timestamp"), ("Key", "key_path"), ("Value", "value_name"), ("Original", "original_value"),
+        ("New", "new_value"), ("Status", "success"), ("Session", "session_id"),
+    ]),
+    ("sessions", "Sessions", [
+        ("Started", "started_at"), ("Ended", "ended_at"), ("Session", "id"),
+    ]),
+]
+FAILED_COLOR = QColor("#ff6b6b")
+# Rows held at once; scrolling past this drops pages from the far end of the window
+MAX_WINDOW_ROWS = 10 * HISTORY_PAGE_SIZE
+
+
+def _cell(column: str, value: Any) -> str:
+    if column == "success":
+        return "OK" if value in (1, '1', True) else "Failed"
+    if value is None:
+        return ""
+    return str(value)
+
+
+class HistoryTableModel(QAbstractTableModel):
+    """History rows fetched lazily with keyset pagination as the view scrolls.
+
+    The view asks for more through canFetchMore()/fetchMore(), which loads
+    the page older than the last row using its (time, key) as the cursor.
+    At most MAX_WINDOW_ROWS rows are held: once the window is full, pages are
+    dropped from the newer end, and fetch_newer() brings them back (cursor on
+    the first row) when the view is scrolled to the top. Memory stays bounded
+    however far back the history is scrolled, and no query uses OFFSET.
+    """
+
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.page_size = HISTORY_PAGE_SIZE
+        self.max_rows = MAX_WINDOW_ROWS
+        self.source = HISTORY_VIEWS[0][0]
+        self.query = ""
+        self._headers: List[str] = []
+        self._columns: List[str] = []
+        # (cursor, display cells, failed) per row, newest first
+        self._rows: List[tuple] = []
+        self.skipped = 0
+        self.has_older = False
+        self._apply_columns()
+
+    @property
+    def has_newer(self) -> bool:
+        """Rows above the window were dropped and can be fetched again."""
+        return self.skipped > 0
+
+    def _apply_columns(self) -> None:
+        for key, _, columns in HISTORY_VIEWS:
+            if key == self.source:
+                self._headers = [h for h, _ in columns]
+                self._columns = [c for _, c in columns]
+                return
+
+    # ---------- Qt model interface ----------
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal \
+                and 0 <= section < len(self._headers):
+            return self._headers[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        _, cells, failed = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return cells[index.column()]
+        if role == Qt.ItemDataRole.ForegroundRole and failed and self._columns[index.column()] == "success":
+            return FAILED_COLOR
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self.has_older
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        if parent.isValid() or not self.has_older:
+            return
+        before = self._rows[-1][0] if self._rows else None
+        rows, self.has_older = self.db_manager.history_page(self.source, self.query, before, self.page_size)
+        if rows:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self._rows.extend(self._convert(rows))
+            self.endInsertRows()
+        excess = len(self._rows) - self.max_rows
+        if excess > 0:
+            self.beginRemoveRows(QModelIndex(), 0, excess - 1)
+            del self._rows[:excess]
+            self.skipped += excess
+            self.endRemoveRows()
+
+    # ---------- Navigation ----------
+    def set_source(self, source: str) -> None:
+        if source not in {key for key, _, _ in HISTORY_VIEWS}:
+            return
+        self.beginResetModel()
+        self.source = source
+        self._apply_columns()
+        self._rows = []
+        self.endResetModel()
+        self.reload()
+
+    def set_query(self, query: str) -> None:
+        self.query = (query or "").strip()
+        self.reload()
+
+    def reload(self) -> None:
+        """Start again from the newest row."""
+        self.beginResetModel()
+        self._rows = []
+        self.skipped = 0
+        self.has_older = True
+        self.endResetModel()
+        self.fetchMore()
+
+    def fetch_newer(self) -> int:
+        """Load the page above the window; returns the number of rows inserted at the top."""
+        if not self.has_newer or not self._rows:
+            return 0
+        rows, more = self.db_manager.history_page(self.source, self.query, None, self.page_size,
+                                                  after=self._rows[0][0])
+        if not rows:
+            self.skipped = 0
+            return 0
+        self.beginInsertRows(QModelIndex(), 0, len(rows) - 1)
+        self._rows[:0] = self._convert(rows)
+        # Rows written since the window moved make the count approximate; the query is exact
+        self.skipped = max(self.skipped - len(rows), 1) if more else 0
+        self.endInsertRows()
+        excess = len(self._rows) - self.max_rows
+        if excess > 0:
+            self.beginRemoveRows(QModelIndex(), len(self._rows) - excess, len(self._rows) - 1)
+            del self._rows[-excess:]
+            self.has_older = True
+            self.endRemoveRows()
+        return len(rows)
+
+    def _convert(self, rows) -> List[tuple]:
+        converted = []
+        for r in rows:
+            cells = [_cell(column, value) for column, value in zip(self._columns, r[2:])]
+            failed = "success" in self._columns and cells[self._columns.index("success")] == "Failed"
+            converted.append((tuple(r[:2]), cells, failed))
+        return converted
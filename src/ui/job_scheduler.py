@@ -0,0 +1,188 @@
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+
+@dataclass
+class Job:
+    job_id: int
+    name: str
+    worker: Any
+    priority: int
+    groups: frozenset
+    submitted_at: float = field(default_factory=time.perf_counter)
+    started_at: Optional[float] = None
+    runnable: Optional[QRunnable] = None
+    cancelled: bool = False
+
+
+class _RunnableSignals(QObject):
+    finished = Signal(int)
+
+
+class _JobRunnable(QRunnable):
+    def __init__(self, job: Job, signals: _RunnableSignals):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.job = job
+        self.signals = signals
+
+    def run(self):
+        try:
+            self.job.worker.run()
+        except Exception as e:
+            logger.error(f"Job {self.job.job_id} ({self.job.name}) raised: {e}")
+        finally:
+            self.signals.finished.emit(self.job.job_id)
+
+
+class JobScheduler(QObject):
+    """Runs worker objects on a thread pool in priority order.
+
+    Jobs that share a conflict group (for example two jobs touching the
+    database file) never run at the same time; the later one waits in the
+    queue until the group is free. Workers need a ``run()`` method and may
+    expose ``stop()`` for cooperative cancellation.
+    """
+
+    job_started = Signal(int, str)
+    job_finished = Signal(int, str, bool)
+    stats_changed = Signal()
+
+    def __init__(self, max_threads: int = 4, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(1, max_threads))
+        self._signals = _RunnableSignals()
+        self._signals.finished.connect(self._on_runnable_finished)
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._pending: List[tuple] = []
+        self._running: Dict[int, Job] = {}
+        self._busy_groups: Dict[str, int] = {}
+        self._wait_ms: deque = deque(maxlen=100)
+        self._run_ms: deque = deque(maxlen=100)
+        self.completed = 0
+        self.cancelled = 0
+
+    def submit(self, worker, name: str, priority: int = PRIORITY_NORMAL, groups=(), unique: bool = False) -> int:
+        if unique:
+            existing = self.find_pending(name)
+            if existing is not None:
+                return existing
+        job = Job(next(self._ids), name, worker, priority, frozenset(groups or ()))
+        heapq.heappush(self._pending, (priority, next(self._seq), job))
+        logger.debug(f"Queued job {job.job_id} ({name}), priority {priority}, groups {sorted(job.groups)}")
+        self._dispatch()
+        self.stats_changed.emit()
+        return job.job_id
+
+    def find_pending(self, name: str) -> Optional[int]:
+        for _, _, job in self._pending:
+            if job.name == name and not job.cancelled:
+                return job.job_id
+        return None
+
+    def pending_ids(self) -> List[int]:
+        return [job.job_id for _, _, job in sorted(self._pending) if not job.cancelled]
+
+    def cancel(self, job_id: int) -> bool:
+        for _, _, job in self._pending:
+            if job.job_id == job_id and not job.cancelled:
+                job.cancelled = True
+                self._pending = [entry for entry in self._pending if entry[2] is not job]
+                heapq.heapify(self._pending)
+                self.cancelled += 1
+                self.job_finished.emit(job_id, job.name, False)
+                self.stats_changed.emit()
+                return True
+        job = self._running.get(job_id)
+        if job is not None:
+            job.cancelled = True
+            stop = getattr(job.worker, 'stop', None)
+            if callable(stop):
+                stop()
+            return True
+        return False
+
+    def shutdown(self, wait_ms: int = 3000) -> None:
+        for _, _, job in list(self._pending):
+            self.cancel(job.job_id)
+        for job_id in list(self._running):
+            self.cancel(job_id)
+        self.pool.waitForDone(wait_ms)
+
+    def is_busy(self, group: str) -> bool:
+        return group in self._busy_groups
+
+    def stats(self) -> Dict[str, Any]:
+        def _mean(values):
+            return round(sum(values) / len(values), 1) if values else 0.0
+        return {
+            'queued': len(self._pending),
+            'running': len(self._running),
+            'completed': self.completed,
+            'cancelled': self.cancelled,
+            'avg_wait_ms': _mean(self._wait_ms),
+            'avg_run_ms': _mean(self._run_ms),
+            'last_run_ms': round(self._run_ms[-1], 1) if self._run_ms else 0.0,
+        }
+
+    def _dispatch(self):
+        deferred = []
+        while self._pending:
+            entry = heapq.heappop(self._pending)
+            job = entry[2]
+            if any(g in self._busy_groups for g in job.groups):
+                deferred.append(entry)
+                continue
+            self._start(job)
+        for entry in deferred:
+            heapq.heappush(self._pending, entry)
+
+    def _start(self, job: Job):
+        job.started_at = time.perf_counter()
+        wait_ms = (job.started_at - job.submitted_at) * 1000.0
+        self._wait_ms.append(wait_ms)
+        metrics.observe('job.wait', wait_ms)
+        for g in job.groups:
+            self._busy_groups[g] = job.job_id
+        self._running[job.job_id] = job
+        job.runnable = _JobRunnable(job, self._signals)
+        self.pool.start(job.runnable, -job.priority)
+        self.job_started.emit(job.job_id, job.name)
+
+    def _on_runnable_finished(self, job_id: int):
+        job = self._running.pop(job_id, None)
+        if job is None:
+            return
+        for g in job.groups:
+            if self._busy_groups.get(g) == job_id:
+                del self._busy_groups[g]
+        elapsed = (time.perf_counter() - (job.started_at or job.submitted_at)) * 1000.0
+        self._run_ms.append(elapsed)
+        metrics.observe(f'job.{job.name}', elapsed)
+        if job.cancelled:
+            self.cancelled += 1
+            metrics.incr('job.cancelled')
+        else:
+            self.completed += 1
+        logger.debug(f"Job {job_id} ({job.name}) finished in {elapsed:.0f} ms")
+        job.runnable = None
+        self.job_finished.emit(job_id, job.name, not job.cancelled)
+        self._dispatch()
+        self.stats_changed.emit()
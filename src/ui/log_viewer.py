@@ -0,0 +1,377 @@
+import os
+import time
+from array import array
+from collections import OrderedDict
+from typing import Optional
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer
+from PySide6.QtGui import QFont, QColor
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableView, QHeaderView, QLineEdit, QComboBox,
+    QCheckBox, QLabel, QPushButton, QAbstractItemView
+)
+
+from ui.activity_log import LineDelegate
+
+INDEX_CHUNK_BYTES = 4 * 1024 * 1024
+# Longer lines (e.g. a dumped payload) are shown cut at this many bytes
+MAX_LINE_BYTES = 64 * 1024
+BLOCK_LINES = 256
+MAX_CACHED_BLOCKS = 64
+SCAN_SLICE_SECONDS = 0.02
+POLL_INTERVAL_MS = 500
+
+LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+LEVEL_COLORS = {
+    "WARNING": QColor("#ffd166"),
+    "ERROR": QColor("#ff6b6b"),
+    "CRITICAL": QColor("#ff4d4d"),
+    "DEBUG": QColor("#9aa4af"),
+}
+
+
+class LogFileIndex:
+    """Byte offsets of every complete line in a growing text file.
+
+    Only offsets are kept in memory (8 bytes per line); text is read back in
+    blocks of BLOCK_LINES lines and cached in a small LRU. The index grows
+    incrementally with update() and resets itself if the file is truncated
+    or replaced (for example after log rotation).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.reset()
+
+    def reset(self):
+        self.starts = array('q', [0])
+        self.indexed_size = 0
+        # Where the search for the next newline resumes; ahead of indexed_size inside an over-long line
+        self._scan_pos = 0
+        self._identity = None
+        self._blocks: OrderedDict = OrderedDict()
+
+    @property
+    def line_count(self) -> int:
+        return len(self.starts) - 1
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+            return st.st_size, (st.st_ino, getattr(st, 'st_dev', 0))
+        except OSError:
+            return 0, None
+
+    def update(self, max_bytes: int = INDEX_CHUNK_BYTES) -> str:
+        """Index up to max_bytes of new data.
+
+        Returns 'reset' when the file was replaced or truncated, 'more' when
+        unindexed data remains, otherwise 'done'.
+        """
+        size, identity = self._stat()
+        if size < self.indexed_size or (self._identity and identity and identity != self._identity and identity[0]):
+            self.reset()
+            self._identity = identity
+            return 'reset'
+        self._identity = identity
+        if size == self.indexed_size:
+            return 'done'
+        base = max(self._scan_pos, self.indexed_size)
+        if base >= size:
+            # Only the unterminated tail of a long line is left; wait for its newline
+            return 'done'
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(base)
+                chunk = f.read(min(max_bytes, size - base))
+        except OSError:
+            return 'done'
+        last_nl = chunk.rfind(b'\n')
+        if last_nl == -1:
+            # Part of a line longer than the chunk: keep looking for its newline further on
+            self._scan_pos = base + len(chunk)
+            return 'more' if self._scan_pos < size else 'done'
+        pos = chunk.find(b'\n')
+        starts = self.starts
+        while pos != -1 and pos <= last_nl:
+            starts.append(base + pos + 1)
+            pos = chunk.find(b'\n', pos + 1)
+        self.indexed_size = self._scan_pos = base + last_nl + 1
+        return 'more' if self.indexed_size < size else 'done'
+
+    def _block(self, block_no: int) -> list:
+        cached = self._blocks.get(block_no)
+        if cached is not None and len(cached) == min(BLOCK_LINES, self.line_count - block_no * BLOCK_LINES):
+            self._blocks.move_to_end(block_no)
+            return cached
+        first = block_no * BLOCK_LINES
+        last = min(first + BLOCK_LINES, self.line_count)
+        if first >= last:
+            return []
+        try:
+            with open(self.path, 'rb') as f:
+                if self.starts[last] - self.starts[first] <= INDEX_CHUNK_BYTES:
+                    f.seek(self.starts[first])
+                    raw = f.read(self.starts[last] - self.starts[first])
+                    # Split on b'\n' only, as update() does; str.splitlines() would also break on \f, \x85, \u2028...
+                    parts = raw.split(b'\n')[:last - first]
+                    truncated = [False] * len(parts)
+                else:
+                    # A block holding very long lines: read each one, cut at MAX_LINE_BYTES
+                    parts, truncated = [], []
+                    for n in range(first, last):
+                        length = self.starts[n + 1] - self.starts[n] - 1
+                        f.seek(self.starts[n])
+                        parts.append(f.read(min(length, MAX_LINE_BYTES)))
+                        truncated.append(length > MAX_LINE_BYTES)
+        except OSError:
+            return []
+        lines = []
+        for part, cut in zip(parts, truncated):
+            if part.endswith(b'\r') and not cut:
+                part = part[:-1]
+            text = part.decode('utf-8', errors='replace')
+            lines.append(text + ' … [line truncated]' if cut else text)
+        self._blocks[block_no] = lines
+        while len(self._blocks) > MAX_CACHED_BLOCKS:
+            self._blocks.popitem(last=False)
+        return lines
+
+    def line(self, n: int) -> str:
+        block = self._block(n // BLOCK_LINES)
+        i = n % BLOCK_LINES
+        return block[i] if i < len(block) else ""
+
+    def lines(self, first: int, last: int):
+        """Yield (line_no, text) for line numbers in [first, last)."""
+        n = first
+        while n < last:
+            block_no = n // BLOCK_LINES
+            block = self._block(block_no)
+            base = block_no * BLOCK_LINES
+            for i in range(n - base, min(len(block), last - base)):
+                yield base + i, block[i]
+            n = base + BLOCK_LINES
+
+
+def line_level(text: str) -> Optional[str]:
+    # Lines look like "<asctime> - <name> - <LEVEL> - <message>"
+    parts = text.split(' - ', 3)
+    if len(parts) >= 3 and parts[2] in LEVELS:
+        return parts[2]
+    return None
+
+
+class LogLineModel(QAbstractListModel):
+    """Lazily reads lines from a LogFileIndex, optionally through a filter."""
+
+    def __init__(self, index: LogFileIndex, parent=None):
+        super().__init__(parent)
+        self.index_ = index
+        self._rows: Optional[array] = None
+        self._visible_lines = 0
+        self.min_level: Optional[str] = None
+        self.text = ""
+        self._scan_pos = 0
+        self._scan_timer = QTimer(self)
+        self._scan_timer.setInterval(0)
+        self._scan_timer.timeout.connect(self._scan_slice)
+
+    @property
+    def filtering(self) -> bool:
+        return bool(self.min_level or self.text)
+
+    @property
+    def scanning(self) -> bool:
+        return self._scan_timer.isActive()
+
+    def matches(self, text: str) -> bool:
+        if self.min_level:
+            level = line_level(text)
+            if level is None or LEVELS.index(level) < LEVELS.index(self.min_level):
+                return False
+        if self.text and self.text not in text.lower():
+            return False
+        return True
+
+    def set_filter(self, min_level: Optional[str], text: str):
+        self.min_level = min_level or None
+        self.text = (text or "").lower()
+        self._scan_timer.stop()
+        self.beginResetModel()
+        if self.filtering:
+            self._rows = array('q')
+            self._scan_pos = 0
+        else:
+            self._rows = None
+            self._visible_lines = self.index_.line_count
+        self.endResetModel()
+        if self.filtering:
+            self._scan_timer.start()
+
+    def _scan_slice(self):
+        deadline = time.perf_counter() + SCAN_SLICE_SECONDS
+        total = self.index_.line_count
+        found = array('q')
+        while self._scan_pos < total and time.perf_counter() < deadline:
+            end = min(total, self._scan_pos + BLOCK_LINES)
+            for n, text in self.index_.lines(self._scan_pos, end):
+                if self.matches(text):
+                    found.append(n)
+            self._scan_pos = end
+        self._append_rows(found)
+        if self._scan_pos >= total:
+            self._scan_timer.stop()
+
+    def _append_rows(self, line_numbers):
+        if not line_numbers:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(line_numbers) - 1)
+        self._rows.extend(line_numbers)
+        self.endInsertRows()
+
+    def lines_added(self):
+        """Expose lines indexed since the last call."""
+        total = self.index_.line_count
+        if self._rows is None:
+            if total > self._visible_lines:
+                self.beginInsertRows(QModelIndex(), self._visible_lines, total - 1)
+                self._visible_lines = total
+                self.endInsertRows()
+        elif not self.scanning and self._scan_pos < total:
+            self._scan_timer.start()
+
+    def reset_all(self):
+        self._scan_timer.stop()
+        self.beginResetModel()
+        self._visible_lines = 0
+        if self._rows is not None:
+            self._rows = array('q')
+            self._scan_pos = 0
+        self.endResetModel()
+
+    def line_number(self, row: int) -> int:
+        return self._rows[row] if self._rows is not None else row
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._rows) if self._rows is not None else self._visible_lines
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self.index_.line(self.line_number(index.row()))
+        return None
+
+
+class LogViewerDialog(QDialog):
+    """Log viewer that indexes the file in the background and tails new writes."""
+
+    def __init__(self, path: str, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Application Logs")
+        self.setMinimumSize(900, 600)
+        self.file_index = LogFileIndex(path)
+        self.model = LogLineModel(self.file_index, self)
+        self.model.set_filter(None, "")
+
+        layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Level:"))
+        self.level_combo = QComboBox()
+        self.level_combo.addItems(["All"] + LEVELS)
+        self.level_combo.currentTextChanged.connect(self._schedule_filter)
+        controls.addWidget(self.level_combo)
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search logs…")
+        self.search_edit.textChanged.connect(self._schedule_filter)
+        controls.addWidget(self.search_edit, 1)
+        self.follow_check = QCheckBox("Follow tail")
+        self.follow_check.setObjectName("app_checkbox")
+        self.follow_check.setChecked(True)
+        self.follow_check.toggled.connect(self._on_follow_toggled)
+        controls.addWidget(self.follow_check)
+        layout.addLayout(controls)
+
+        # A one-column table rather than a QListView: with fixed row heights its
+        # layout cost does not depend on the number of rows
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setItemDelegate(LineDelegate(lambda text: LEVEL_COLORS.get(line_level(text)), self.view))
+        self.view.setFont(QFont("Consolas", 9))
+        self.view.setShowGrid(False)
+        self.view.setWordWrap(False)
+        self.view.horizontalHeader().hide()
+        self.view.horizontalHeader().setStretchLastSection(True)
+        self.view.verticalHeader().hide()
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.view.verticalHeader().setDefaultSectionSize(self.view.fontMetrics().height() + 4)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.view.setObjectName("log_view")
+        layout.addWidget(self.view, 1)
+
+        bottom = QHBoxLayout()
+        self.status_label = QLabel()
+        bottom.addWidget(self.status_label, 1)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        bottom.addWidget(close_btn)
+        layout.addLayout(bottom)
+
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(250)
+        self._filter_timer.timeout.connect(self._apply_filter)
+
+        self._index_timer = QTimer(self)
+        self._index_timer.timeout.connect(self._index_step)
+        self.model.rowsInserted.connect(self._on_rows_inserted)
+        self._index_step()
+
+    def _index_step(self):
+        state = self.file_index.update()
+        if state == 'reset':
+            self.model.reset_all()
+            state = self.file_index.update()
+        self.model.lines_added()
+        # Index eagerly until caught up, then poll for new writes
+        self._index_timer.start(0 if state == 'more' else POLL_INTERVAL_MS)
+        self._update_status()
+
+    def _schedule_filter(self, *_):
+        self._filter_timer.start()
+
+    def _apply_filter(self):
+        level = self.level_combo.currentText()
+        self.model.set_filter(None if level == "All" else level, self.search_edit.text())
+        self._update_status()
+        if self.follow_check.isChecked():
+            self.view.scrollToBottom()
+
+    def _on_rows_inserted(self, *_):
+        if self.follow_check.isChecked():
+            self.view.scrollToBottom()
+        self._update_status()
+
+    def _on_follow_toggled(self, checked: bool):
+        if checked:
+            self.view.scrollToBottom()
+
+    def _update_status(self):
+        total = self.file_index.line_count
+        size_kb = self.file_index.indexed_size / 1024
+        if self.model.filtering:
+            suffix = " (searching…)" if self.model.scanning else ""
+            self.status_label.setText(f"{self.model.rowCount():,} matching of {total:,} lines · {size_kb:,.0f} KB{suffix}")
+        else:
+            self.status_label.setText(f"{total:,} lines · {size_kb:,.0f} KB")
+
+    def done(self, result):
+        self._index_timer.stop()
+        self._filter_timer.stop()
+        super().done(result)
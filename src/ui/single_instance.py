@@ -0,0 +1,89 @@
+import os
+import getpass
+import hashlib
+import logging
+from pathlib import Path
+
+from PySide6.QtCore import QObject, QLockFile, QDir, Signal
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+logger = logging.getLogger(__name__)
+
+ACTIVATE_MESSAGE = b"activate\n"
+CONNECT_TIMEOUT_MS = 1000
+# The first instance may still be starting up (lock taken, server not yet listening)
+CONNECT_ATTEMPTS = 5
+
+
+def _instance_key(db_path) -> str:
+    """Per user and per database, so separate databases can still be open side by side."""
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = str(os.getpid())
+    digest = hashlib.sha1(f"{user}:{Path(db_path).resolve()}".encode('utf-8')).hexdigest()[:12]
+    return f"phantomid-{digest}"
+
+
+class SingleInstance(QObject):
+    """
+    Keeps one PhantomID window per database.
+
+    The first process takes a QLockFile (stale locks from a crashed process are
+    reclaimed) and listens on a QLocalServer; later processes fail the lock,
+    ask the running one to come to the front and exit. Headless jobs
+    (phantomid_cli.py) do not take the lock and share the database through
+    SQLite's locking instead.
+    """
+    activation_requested = Signal()
+
+    def __init__(self, db_path, parent=None):
+        super().__init__(parent)
+        self.key = _instance_key(db_path)
+        self.lock = QLockFile(os.path.join(QDir.tempPath(), self.key + ".lock"))
+        self.lock.setStaleLockTime(0)
+        self.server = None
+
+    def acquire(self) -> bool:
+        """True when this process is the primary instance; otherwise the running one was asked to activate."""
+        if self.lock.tryLock(100):
+            # A server socket left by a crashed instance would make listen() fail on Unix
+            QLocalServer.removeServer(self.key)
+            self.server = QLocalServer(self)
+            self.server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+            self.server.newConnection.connect(self._on_new_connection)
+            if not self.server.listen(self.key):
+                logger.warning(f"Single-instance server could not listen: {self.server.errorString()}")
+            return True
+        self.notify_running()
+        return False
+
+    def notify_running(self) -> bool:
+        for _ in range(CONNECT_ATTEMPTS):
+            socket = QLocalSocket()
+            socket.connectToServer(self.key)
+            if socket.waitForConnected(CONNECT_TIMEOUT_MS):
+                socket.write(ACTIVATE_MESSAGE)
+                socket.waitForBytesWritten(CONNECT_TIMEOUT_MS)
+                socket.disconnectFromServer()
+                return True
+        logger.warning("Another PhantomID instance holds the lock but did not answer")
+        return False
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            socket.readyRead.connect(lambda s=socket: self._on_ready_read(s))
+            socket.disconnected.connect(socket.deleteLater)
+            if socket.bytesAvailable():
+                self._on_ready_read(socket)
+
+    def _on_ready_read(self, socket):
+        if ACTIVATE_MESSAGE.strip() in bytes(socket.readAll()):
+            self.activation_requested.emit()
+
+    def release(self):
+        if self.server is not None:
+            self.server.close()
+            self.server = None
+        self.lock.unlock()
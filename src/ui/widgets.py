@@ -0,0 +1,164 @@
+import os
+import sys
+
+from PySide6.QtWidgets import QPushButton
+from PySide6.QtCore import Qt, QObject, Signal, QSize
+from PySide6.QtGui import QFont, QImage, QPainter, QPainterPath
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.game_assets import get_asset_service, get_text_logo_pixmap
+
+class ModernButton(QPushButton):
+    
+    def __init__(self, text, parent=None):
+        super().__init__(text, parent)
+        self.setFixedHeight(45)
+        self.setFont(QFont("Segoe UI", 11, QFont.Weight.Medium))
+        self.setObjectName("primary_button")
+        self.setCursor(Qt.PointingHandCursor)
+
+class MiniButton(QPushButton):
+    def __init__(self, text, parent=None):
+        super().__init__(text, parent)
+        self.setFixedHeight(28)
+        self.setFont(QFont("Segoe UI", 9, QFont.Weight.Medium))
+        self.setObjectName("primary_button")
+
+class LogoLoader(QObject):
+    # Emitted from asset worker threads; delivered queued on the GUI thread
+    image_ready = Signal(str, QImage)
+
+    def deliver(self, game_name: str, image):
+        if image is not None:
+            self.image_ready.emit(game_name, image)
+
+class GameButton(QPushButton):
+    
+    def __init__(self, game_name, icon_text, parent=None):
+        super().__init__(parent)
+        self.game_name = game_name
+        self.setFixedSize(200, 80)
+        self.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        # Paint a placeholder immediately; the real logo is swapped in when it arrives
+        service = get_asset_service()
+        cached = service.cached_pixmap(game_name)
+        # Scaled copies keyed by (width, height, hover, dpr) so repaints only blit
+        self._scaled_cache = {}
+        self.bg_pix = cached or get_text_logo_pixmap(game_name, 400, 160)
+        self._hover = False
+        
+        game_styles = {
+            "FiveM": {
+                "gradient": ("rgba(255, 107, 53, 0.9)", "rgba(247, 147, 30, 0.9)"),
+                "hover_gradient": ("rgba(255, 130, 70, 0.95)", "rgba(255, 170, 50, 0.95)"),
+                "border_color": "#ff6b35"
+            },
+            "Fortnite": {
+                "gradient": ("rgba(139, 92, 246, 0.9)", "rgba(168, 85, 247, 0.9)"),
+                "hover_gradient": ("rgba(160, 110, 255, 0.95)", "rgba(190, 110, 255, 0.95)"),
+                "border_color": "#8b5cf6"
+            },
+            "Valorant": {
+                "gradient": ("rgba(239, 68, 68, 0.9)", "rgba(249, 115, 22, 0.9)"),
+                "hover_gradient": ("rgba(255, 90, 90, 0.95)", "rgba(255, 140, 40, 0.95)"),
+                "border_color": "#ef4444"
+            },
+            "Minecraft": {
+                "gradient": ("rgba(16, 185, 129, 0.9)", "rgba(5, 150, 105, 0.9)"),
+                "hover_gradient": ("rgba(30, 210, 150, 0.95)", "rgba(15, 180, 120, 0.95)"),
+                "border_color": "#10b981"
+            },
+            "Roblox": {
+                "gradient": ("rgba(59, 130, 246, 0.9)", "rgba(29, 78, 216, 0.9)"),
+                "hover_gradient": ("rgba(80, 150, 255, 0.95)", "rgba(50, 100, 235, 0.95)"),
+                "border_color": "#3b82f6"
+            },
+            "CS:GO": {
+                "gradient": ("rgba(255, 193, 7, 0.9)", "rgba(255, 152, 0, 0.9)"),
+                "hover_gradient": ("rgba(255, 210, 40, 0.95)", "rgba(255, 180, 30, 0.95)"),
+                "border_color": "#ffc107"
+            }
+        }
+        
+        style = game_styles.get(game_name, {
+            "gradient": ("rgba(102, 126, 234, 0.9)", "rgba(118, 75, 162, 0.9)"),
+            "hover_gradient": ("rgba(120, 140, 250, 0.95)", "rgba(140, 100, 180, 0.95)"),
+            "border_color": "#667eea"
+        })
+        
+        self.setObjectName("game_button")
+        self.setText("")
+        self.setToolTip(self.game_name)
+        self.setCursor(Qt.PointingHandCursor)
+
+        if cached is None:
+            try:
+                self._logo_loader = LogoLoader(self)
+                self._logo_loader.image_ready.connect(self._on_image_ready)
+                service.fetch_async(game_name, self._logo_loader.deliver)
+            except Exception:
+                pass
+
+    def _on_image_ready(self, game_name, image):
+        try:
+            pm = get_asset_service().cached_pixmap(game_name)
+            if pm is None:
+                pm = get_asset_service().pixmap_from_image(game_name, image)
+            if pm is not None:
+                self.bg_pix = pm
+                self.update()
+        except Exception:
+            pass
+
+    @property
+    def bg_pix(self):
+        return self._bg_pix
+
+    @bg_pix.setter
+    def bg_pix(self, pm):
+        self._bg_pix = pm
+        self._scaled_cache.clear()
+
+    def _scaled_pixmap(self, rect, hover: bool):
+        dpr = self.devicePixelRatioF()
+        key = (rect.width(), rect.height(), hover, dpr)
+        scaled = self._scaled_cache.get(key)
+        if scaled is None:
+            base_scale = 0.92
+            hover_scale = 0.98
+            scale_ratio = hover_scale if hover else base_scale
+            target_size = QSize(int(rect.width() * scale_ratio * dpr), int(rect.height() * scale_ratio * dpr))
+            scaled = self._bg_pix.scaled(target_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            scaled.setDevicePixelRatio(dpr)
+            self._scaled_cache[key] = scaled
+        return scaled
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if getattr(self, '_bg_pix', None):
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.Antialiasing)
+            rect = self.rect()
+            path = QPainterPath()
+            path.addRoundedRect(rect, 12, 12)
+            painter.setClipPath(path)
+            scaled = self._scaled_pixmap(rect, bool(getattr(self, '_hover', False)))
+            dpr = scaled.devicePixelRatio() or 1.0
+            target_x = rect.x() + (rect.width() - int(scaled.width() / dpr)) // 2
+            target_y = rect.y() + (rect.height() - int(scaled.height() / dpr)) // 2
+            painter.drawPixmap(target_x, target_y, scaled)
+
+    def resizeEvent(self, event):
+        self._scaled_cache.clear()
+        super().resizeEvent(event)
+
+    def enterEvent(self, event):
+        self._hover = True
+        self.update()
+        super().enterEvent(event)
+
+    def leaveEvent(self, event):
+        self._hover = False
+        self.update()
+        super().leaveEvent(event)
@@ -7,7 +7,7 @@ import subprocess
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
-import requests
+from core.metrics import metrics
 
 
 class AutoUpdater:
@@ -57,6 +57,7 @@ class AutoUpdater:
     def _latest_release_info(self, owner: str, name: str, token: Optional[str]) -> Optional[Dict[str, str]]:
         url = f'https://api.github.com/repos/{owner}/{name}/releases/latest'
         try:
+            import requests
             resp = requests.get(url, headers=self._api_headers(token), timeout=20)
         except Exception as e:
             self._log(f'GitHub API request failed: {e}')
@@ -88,6 +89,7 @@ class AutoUpdater:
         except Exception:
             pass
 
+    @metrics.timed('update.check')
     def check_update_available(self) -> Tuple[bool, Optional[str]]:
         cfg = self._get_config()
         owner, name = self._split_repo(cfg['repo'] or '')
@@ -101,12 +103,14 @@ class AutoUpdater:
         self._log(f'Updater: local_tag={local_tag}, remote_tag={latest.get("tag")}')
         return (local_tag != latest.get('tag')), latest.get('tag')
 
+    @metrics.timed('update.download')
     def _download_release_zip(self, owner: str, name: str, tag: str, token: Optional[str]) -> Optional[Path]:
         zip_url = f'https://api.github.com/repos/{owner}/{name}/zipball/{tag}'
         updates_dir = self.app_dir / 'updates'
         updates_dir.mkdir(parents=True, exist_ok=True)
         zip_path = updates_dir / f'{name}-{tag}.zip'
         try:
+            import requests
             r = requests.get(zip_url, headers=self._api_headers(token), stream=True, timeout=60)
             if r.status_code != 200:
                 self._log(f'Download failed ({r.status_code}) for {zip_url}')
@@ -1,58 +1,234 @@
 import os
-from typing import Optional, List
+import re
+import json
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Dict, Optional, List
 from pathlib import Path
 try:
-    from PySide6.QtGui import QPixmap, QImage, QPainter, QLinearGradient, QColor
-    from PySide6.QtSvg import QSvgRenderer
-    from PySide6.QtGui import QFont
+    from PySide6.QtGui import QPixmap, QImage, QPainter, QLinearGradient, QColor, QFont
 except Exception:
     QPixmap = None
     QImage = None
     QPainter = None
     QLinearGradient = None
     QColor = None
-    QSvgRenderer = None
     QFont = None
 
-try:
-    from PySide6.QtGui import QPixmap
-except Exception:
-    QPixmap = None
+from core.metrics import metrics
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+GAMES_DIR = os.path.join(PROJECT_ROOT, 'assets', 'images', 'games')
+CACHE_DIR = os.path.join(GAMES_DIR, '.cache')
 
-def _candidate_paths(game_name: str):
-    base_dir = os.path.join(PROJECT_ROOT, 'assets', 'images', 'games')
-    candidates = [
-        os.path.join(base_dir, f"{game_name}.png"),
-        os.path.join(base_dir, f"{game_name}.jpg"),
-        os.path.join(base_dir, f"{game_name}.jpeg"),
-        os.path.join(base_dir, f"{game_name}.webp"),
-        os.path.join(base_dir, f"{game_name}.svg"),
-        os.path.join(base_dir, f"{game_name.lower()}.png"),
-        os.path.join(base_dir, f"{game_name.lower()}.jpg"),
-        os.path.join(base_dir, f"{game_name.lower()}.jpeg"),
-        os.path.join(base_dir, f"{game_name.lower()}.webp"),
-        os.path.join(base_dir, f"{game_name.lower()}.svg"),
-    ]
-    return candidates
+# Remote logo sources, tried in order when no local asset exists
+LOGO_URLS: Dict[str, List[str]] = {
+    'FiveM': [
+        'https://upload.wikimedia.org/wikipedia/commons/5/5a/FiveM-Logo.png',
+    ],
+    'Fortnite': [
+        'https://upload.wikimedia.org/wikipedia/commons/7/7c/Fortnite_F_lettermark_logo.png',
+    ],
+    'Valorant': [
+        'https://freelogopng.com/images/all_img/1664302686valorant-icon-png.png',
+    ],
+    'Minecraft': [
+        'https://cdn.freebiesupply.com/logos/large/2x/minecraft-1-logo-svg-vector.svg',
+    ],
+    'Roblox': [
+        'https://upload.wikimedia.org/wikipedia/commons/7/7e/Roblox_Logo_2022.jpg',
+    ],
+    'CS:GO': [
+        'https://cdn2.steamgriddb.com/icon/01063bcf7624297fbb408495bcb62904/8/512x512.png',
+    ],
+}
 
-def _rasterize_svg_to_pixmap(svg_path: str, width: int = 512, height: int = 256) -> Optional['QPixmap']:
-    if QSvgRenderer is None or QImage is None or QPainter is None:
+# Cached downloads are trusted without a network round-trip for this long
+CACHE_REVALIDATE_AFTER = timedelta(days=7)
+FETCH_TIMEOUT = 6
+
+
+def _safe_name(game_name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]", "_", game_name)
+
+# Preferred order when several files exist for the same game
+ASSET_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.svg')
+
+
+class _AssetIndex:
+    """
+    Case-insensitive name -> file index of the games asset directory.
+
+    The directory is scanned once and rescanned only when its mtime changes, so
+    lookups cost a single stat plus a dictionary hit.
+    """
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+        self._lock = threading.Lock()
+        self._mtime_ns: int | None = None
+        self._files: Dict[str, str] = {}
+
+    def _scan(self) -> Dict[str, str]:
+        found: Dict[str, tuple[int, str]] = {}
+        try:
+            with os.scandir(self.base_dir) as it:
+                for entry in it:
+                    try:
+                        if not entry.is_file() or entry.stat().st_size <= 0:
+                            continue
+                    except OSError:
+                        continue
+                    stem, ext = os.path.splitext(entry.name)
+                    ext = ext.lower()
+                    if ext not in ASSET_EXTENSIONS:
+                        continue
+                    rank = ASSET_EXTENSIONS.index(ext)
+                    key = stem.lower()
+                    if key not in found or rank < found[key][0]:
+                        found[key] = (rank, entry.path)
+        except OSError:
+            pass
+        return {k: v[1] for k, v in found.items()}
+
+    def _refresh_if_stale(self) -> None:
+        try:
+            mtime_ns = os.stat(self.base_dir).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if mtime_ns != self._mtime_ns or (mtime_ns is None and self._files):
+            self._files = self._scan() if mtime_ns is not None else {}
+            self._mtime_ns = mtime_ns
+
+    def lookup(self, game_name: str) -> Optional[str]:
+        with self._lock:
+            self._refresh_if_stale()
+            # Names like "CS:GO" are stored on disk under their sanitized form
+            return self._files.get(game_name.lower()) or self._files.get(_safe_name(game_name).lower())
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._mtime_ns = None
+
+
+_asset_index = _AssetIndex(GAMES_DIR)
+
+def resolve_asset_path(game_name: str) -> Optional[str]:
+    return _asset_index.lookup(game_name)
+
+RASTER_CACHE_DIR = os.path.join(CACHE_DIR, 'raster')
+
+# path -> (mtime_ns, size, sha256) so unchanged sources are not re-hashed per lookup
+_svg_hashes: Dict[str, tuple[int, int, str]] = {}
+_svg_hash_lock = threading.Lock()
+
+def _svg_source_hash(svg_path: str) -> Optional[str]:
+    try:
+        st = os.stat(svg_path)
+    except OSError:
+        return None
+    with _svg_hash_lock:
+        known = _svg_hashes.get(svg_path)
+        if known and known[0] == st.st_mtime_ns and known[1] == st.st_size:
+            return known[2]
+    try:
+        with open(svg_path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+    except OSError:
         return None
+    with _svg_hash_lock:
+        _svg_hashes[svg_path] = (st.st_mtime_ns, st.st_size, digest)
+    return digest
+
+def _raster_cache_path(svg_path: str, digest: str, width: int, height: int, dpr: float) -> Path:
+    stem = _safe_name(Path(svg_path).stem)
+    return Path(RASTER_CACHE_DIR) / f"{stem}-{digest[:16]}-{width}x{height}@{dpr:g}x.png"
+
+def _prune_stale_rasters(svg_path: str, digest: str) -> None:
+    # Outputs rendered from an older version of the source are never valid again
+    stem = _safe_name(Path(svg_path).stem)
     try:
+        for old in Path(RASTER_CACHE_DIR).glob(f"{stem}-*.png"):
+            if not old.name.startswith(f"{stem}-{digest[:16]}-"):
+                try:
+                    old.unlink()
+                except OSError:
+                    pass
+    except Exception:
+        pass
+
+def _render_svg(renderer, width: int, height: int, dpr: float) -> Optional['QImage']:
+    img = QImage(max(1, int(round(width * dpr))), max(1, int(round(height * dpr))), QImage.Format.Format_ARGB32)
+    img.fill(0)
+    painter = QPainter(img)
+    renderer.render(painter)
+    painter.end()
+    if img.isNull():
+        return None
+    img.setDevicePixelRatio(dpr)
+    return img
+
+def rasterize_svg_batch(svg_path: str, sizes: List[tuple[int, int]], dpr: float = 1.0) -> Dict[tuple[int, int], 'QImage']:
+    """
+    Rasterize one SVG at several target sizes, parsing the source at most once.
+
+    Each output is cached on disk as a PNG keyed by source hash, size and device
+    pixel ratio; cached sizes are loaded without touching QSvgRenderer.
+    """
+    results: Dict[tuple[int, int], 'QImage'] = {}
+    if QImage is None or QPainter is None:
+        return results
+    digest = _svg_source_hash(svg_path)
+    if digest is None:
+        return results
+    missing: List[tuple[int, int]] = []
+    for width, height in sizes:
+        cached = _raster_cache_path(svg_path, digest, width, height, dpr)
+        if cached.exists():
+            img = QImage(str(cached))
+            if not img.isNull():
+                img.setDevicePixelRatio(dpr)
+                results[(width, height)] = img
+                continue
+        missing.append((width, height))
+    if not missing:
+        return results
+    try:
+        # QtSvg is only loaded when an SVG actually has to be rendered
+        from PySide6.QtSvg import QSvgRenderer
         renderer = QSvgRenderer(svg_path)
         if not renderer.isValid():
-            return None
-        img = QImage(width, height, QImage.Format.Format_ARGB32)
-        img.fill(0)
-        painter = QPainter(img)
-        renderer.render(painter)
-        painter.end()
-        pm = QPixmap.fromImage(img)
-        return pm if (pm and not pm.isNull()) else None
+            return results
+        Path(RASTER_CACHE_DIR).mkdir(parents=True, exist_ok=True)
+        _prune_stale_rasters(svg_path, digest)
+        for width, height in missing:
+            img = _render_svg(renderer, width, height, dpr)
+            if img is None:
+                continue
+            results[(width, height)] = img
+            out_path = _raster_cache_path(svg_path, digest, width, height, dpr)
+            tmp_path = out_path.with_name(out_path.name + '.tmp')
+            try:
+                if img.save(str(tmp_path), 'PNG'):
+                    os.replace(tmp_path, out_path)
+            except Exception:
+                pass
     except Exception:
+        pass
+    return results
+
+def _rasterize_svg_to_image(svg_path: str, width: int = 512, height: int = 256, dpr: float = 1.0) -> Optional['QImage']:
+    # QImage rendering is safe off the GUI thread, unlike QPixmap
+    return rasterize_svg_batch(svg_path, [(width, height)], dpr).get((width, height))
+
+def _rasterize_svg_to_pixmap(svg_path: str, width: int = 512, height: int = 256) -> Optional['QPixmap']:
+    img = _rasterize_svg_to_image(svg_path, width, height)
+    if img is None or QPixmap is None:
         return None
+    pm = QPixmap.fromImage(img)
+    return pm if (pm and not pm.isNull()) else None
 
 def _fallback_gradient_pixmap(width: int = 512, height: int = 256) -> Optional['QPixmap']:
     if QPixmap is None or QPainter is None or QLinearGradient is None or QColor is None:
@@ -78,6 +254,17 @@ def _pixmap_from_bytes(data: bytes) -> Optional['QPixmap']:
         return None
     return None
 
+def _image_from_bytes(data: bytes) -> Optional['QImage']:
+    if QImage is None:
+        return None
+    try:
+        img = QImage()
+        if img.loadFromData(data):
+            return img if not img.isNull() else None
+    except Exception:
+        return None
+    return None
+
 def _generate_text_logo_pixmap(game_name: str, width: int = 512, height: int = 256) -> Optional['QPixmap']:
     if QPixmap is None or QPainter is None or QFont is None or QColor is None:
         return _fallback_gradient_pixmap(width, height)
@@ -101,86 +288,246 @@ def _generate_text_logo_pixmap(game_name: str, width: int = 512, height: int = 2
 def get_text_logo_pixmap(game_name: str, width: int = 512, height: int = 256) -> Optional['QPixmap']:
     return _generate_text_logo_pixmap(game_name, width, height)
 
-def get_game_bg_pixmap(game_name: str) -> Optional['QPixmap']:
-    if QPixmap is None:
-        return None
-    for path in _candidate_paths(game_name):
-        if os.path.exists(path) and os.path.getsize(path) > 0:
-            if path.lower().endswith('.svg'):
-                pm = _rasterize_svg_to_pixmap(path)
-                if pm is not None:
-                    return pm
-            else:
-                pix = QPixmap(path)
-                if not pix.isNull():
-                    return pix
-    urls_map: dict[str, List[str]] = {
-        'FiveM': [
-            'https://upload.wikimedia.org/wikipedia/commons/5/5a/FiveM-Logo.png',
-        ],
-        'Fortnite': [
-            'https://upload.wikimedia.org/wikipedia/commons/7/7c/Fortnite_F_lettermark_logo.png',
-        ],
-        'Valorant': [
-            'https://freelogopng.com/images/all_img/1664302686valorant-icon-png.png',
-        ],
-        'Minecraft': [
-            'https://cdn.freebiesupply.com/logos/large/2x/minecraft-1-logo-svg-vector.svg',
-        ],
-        'Roblox': [
-            'https://upload.wikimedia.org/wikipedia/commons/7/7e/Roblox_Logo_2022.jpg',
-        ],
-        'CS:GO': [
-            'https://cdn2.steamgriddb.com/icon/01063bcf7624297fbb408495bcb62904/8/512x512.png',
-        ],
-    }
-    candidates = urls_map.get(game_name, [])
-    if not candidates:
-        return None
-    import urllib.request, re
-    headers = {'User-Agent': 'PhantomID/1.0', 'Accept': 'image/*', 'Referer': 'https://www.google.com'}
-    for url in candidates:
-        try:
-            req = urllib.request.Request(url, headers=headers)
-            with urllib.request.urlopen(req, timeout=6) as resp:
-                ctype = resp.info().get_content_type()
-                if not (ctype.startswith('image/')):
-                    continue
-                data = resp.read()
-            # Try loading directly from bytes; if successful, cache as PNG
-            pm = _pixmap_from_bytes(data)
-            if pm is not None:
-                base_dir = Path(PROJECT_ROOT) / 'assets' / 'images' / 'games'
-                base_dir.mkdir(parents=True, exist_ok=True)
-                safe_name = re.sub(r"[^A-Za-z0-9_-]", "_", game_name)
-                out_path = base_dir / f"{safe_name}.png"
+
+class GameAssetService:
+    """
+    Resolves game logos without blocking the GUI thread.
+
+    Lookups go local asset -> on-disk download cache -> network. File and network
+    work runs on a small thread pool and produces QImage objects; conversion to
+    QPixmap (GUI thread only) is memoized per game.
+    """
+
+    def __init__(self, max_workers: int = 4, cache_dir: str | None = None):
+        self.cache_dir = Path(cache_dir or CACHE_DIR)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='asset-fetch')
+        self._lock = threading.Lock()
+        self._pixmaps: Dict[str, 'QPixmap'] = {}
+        self._pending: Dict[str, Future] = {}
+        # Set from the GUI thread once a screen is known; used for SVG rasterization
+        self.device_pixel_ratio = 1.0
+
+    # ---------- In-memory memo (GUI thread) ----------
+    def cached_pixmap(self, game_name: str) -> Optional['QPixmap']:
+        with self._lock:
+            return self._pixmaps.get(game_name)
+
+    def pixmap_from_image(self, game_name: str, image: Optional['QImage']) -> Optional['QPixmap']:
+        if image is None or QPixmap is None:
+            return None
+        pm = QPixmap.fromImage(image)
+        if pm.isNull():
+            return None
+        with self._lock:
+            self._pixmaps[game_name] = pm
+        return pm
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._pixmaps.clear()
+
+    # ---------- Async fetch ----------
+    def fetch_async(self, game_name: str,
+                    callback: Callable[[str, Optional['QImage']], None] | None = None) -> Future:
+        # Concurrent requests for the same game share one load
+        with self._lock:
+            fut = self._pending.get(game_name)
+            if fut is None:
+                fut = self._executor.submit(self.load_image, game_name)
+                self._pending[game_name] = fut
+                fut.add_done_callback(lambda _f, g=game_name: self._forget(g))
+        if callback is not None:
+            def _deliver(f: Future):
                 try:
-                    pm.save(str(out_path), 'PNG')
+                    img = f.result()
                 except Exception:
+                    img = None
+                try:
+                    callback(game_name, img)
+                except Exception:
+                    # Receiver may have been destroyed while the fetch was running
                     pass
-                return pm
-            # If content is SVG and QtSvg is available, cache and rasterize
-            if 'svg' in ctype:
-                base_dir = Path(PROJECT_ROOT) / 'assets' / 'images' / 'games'
-                base_dir.mkdir(parents=True, exist_ok=True)
-                safe_name = re.sub(r"[^A-Za-z0-9_-]", "_", game_name)
-                out_path = base_dir / f"{safe_name}.svg"
-                with open(out_path, 'wb') as f:
-                    f.write(data)
-                pm2 = _rasterize_svg_to_pixmap(str(out_path))
-                if pm2 is not None:
-                    return pm2
+            fut.add_done_callback(_deliver)
+        return fut
+
+    def prefetch(self, game_names: List[str]) -> None:
+        for name in game_names:
+            if self.cached_pixmap(name) is None:
+                self.fetch_async(name)
+
+    def _forget(self, game_name: str) -> None:
+        with self._lock:
+            self._pending.pop(game_name, None)
+
+    def shutdown(self) -> None:
+        try:
+            self._executor.shutdown(wait=False, cancel_futures=True)
         except Exception:
-            continue
-    # Final fallback: generate a themed text logo
-    pm_fallback = _generate_text_logo_pixmap(game_name)
-    if pm_fallback is not None:
+            pass
+
+    # ---------- Resolution (worker threads) ----------
+    def load_image(self, game_name: str) -> Optional['QImage']:
+        if QImage is None:
+            return None
+        with metrics.timer('asset.load'):
+            img = self._load_local(game_name)
+            if img is not None:
+                metrics.incr('asset.local')
+                return img
+            metrics.incr('asset.remote')
+            return self._load_remote(game_name)
+
+    def _load_local(self, game_name: str) -> Optional['QImage']:
+        path = resolve_asset_path(game_name)
+        if path is None:
+            return None
+        if path.lower().endswith('.svg'):
+            return _rasterize_svg_to_image(path, dpr=self.device_pixel_ratio)
+        img = QImage(path)
+        return img if not img.isNull() else None
+
+    def _meta_path(self, game_name: str) -> Path:
+        return self.cache_dir / f"{_safe_name(game_name)}.json"
+
+    def _read_meta(self, game_name: str) -> dict:
+        try:
+            with open(self._meta_path(game_name), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            return meta if isinstance(meta, dict) else {}
+        except Exception:
+            return {}
+
+    def _cached_file(self, meta: dict) -> Optional[Path]:
+        # A cache entry is only trusted if its content still matches the recorded hash
+        try:
+            path = self.cache_dir / str(meta.get('file') or '')
+            if not meta.get('file') or not path.exists():
+                return None
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            return path if digest == meta.get('sha256') else None
+        except Exception:
+            return None
+
+    def _image_from_cache_file(self, path: Path) -> Optional['QImage']:
+        if path.suffix.lower() == '.svg':
+            return _rasterize_svg_to_image(str(path), dpr=self.device_pixel_ratio)
+        img = QImage(str(path))
+        return img if not img.isNull() else None
+
+    def _write_cache(self, game_name: str, url: str, ctype: str, data: bytes, headers) -> Optional[Path]:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            ext = '.svg' if 'svg' in ctype else '.img'
+            out_path = self.cache_dir / f"{_safe_name(game_name)}{ext}"
+            tmp_path = out_path.with_suffix(out_path.suffix + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, out_path)
+            meta = {
+                'url': url,
+                'file': out_path.name,
+                'content_type': ctype,
+                'sha256': hashlib.sha256(data).hexdigest(),
+                'size': len(data),
+                'etag': headers.get('ETag') if headers else None,
+                'last_modified': headers.get('Last-Modified') if headers else None,
+                'fetched_at': datetime.now().isoformat(timespec='seconds'),
+            }
+            with open(self._meta_path(game_name), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, indent=2)
+            return out_path
+        except Exception:
+            return None
+
+    def _touch_meta(self, game_name: str, meta: dict) -> None:
         try:
-            base_dir = Path(PROJECT_ROOT) / 'assets' / 'images' / 'games'
-            base_dir.mkdir(parents=True, exist_ok=True)
-            out_path = base_dir / f"{game_name}.png"
-            pm_fallback.save(str(out_path), 'PNG')
+            meta['fetched_at'] = datetime.now().isoformat(timespec='seconds')
+            with open(self._meta_path(game_name), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, indent=2)
         except Exception:
             pass
+
+    def _load_remote(self, game_name: str) -> Optional['QImage']:
+        meta = self._read_meta(game_name)
+        cached = self._cached_file(meta) if meta else None
+        if cached is not None:
+            try:
+                fetched_at = datetime.fromisoformat(str(meta.get('fetched_at')))
+            except Exception:
+                fetched_at = datetime.min
+            if datetime.now() - fetched_at < CACHE_REVALIDATE_AFTER:
+                img = self._image_from_cache_file(cached)
+                if img is not None:
+                    return img
+        candidates = LOGO_URLS.get(game_name, [])
+        import urllib.request, urllib.error
+        headers = {'User-Agent': 'PhantomID/1.0', 'Accept': 'image/*', 'Referer': 'https://www.google.com'}
+        for url in candidates:
+            req_headers = dict(headers)
+            if cached is not None and meta.get('url') == url:
+                if meta.get('etag'):
+                    req_headers['If-None-Match'] = meta['etag']
+                if meta.get('last_modified'):
+                    req_headers['If-Modified-Since'] = meta['last_modified']
+            try:
+                req = urllib.request.Request(url, headers=req_headers)
+                with urllib.request.urlopen(req, timeout=FETCH_TIMEOUT) as resp:
+                    ctype = resp.info().get_content_type()
+                    if not (ctype.startswith('image/')):
+                        continue
+                    data = resp.read()
+                    resp_headers = resp.headers
+            except urllib.error.HTTPError as e:
+                if e.code == 304 and cached is not None:
+                    self._touch_meta(game_name, meta)
+                    img = self._image_from_cache_file(cached)
+                    if img is not None:
+                        return img
+                continue
+            except Exception:
+                continue
+            out_path = self._write_cache(game_name, url, ctype, data, resp_headers)
+            if 'svg' in ctype:
+                if out_path is not None:
+                    img = _rasterize_svg_to_image(str(out_path), dpr=self.device_pixel_ratio)
+                    if img is not None:
+                        return img
+                continue
+            img = _image_from_bytes(data)
+            if img is not None:
+                return img
+        # Offline or all sources failed: fall back to a stale cache entry if we have one
+        if cached is not None:
+            return self._image_from_cache_file(cached)
+        return None
+
+
+_service: Optional[GameAssetService] = None
+_service_lock = threading.Lock()
+
+def get_asset_service() -> GameAssetService:
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = GameAssetService()
+        return _service
+
+def get_game_bg_pixmap(game_name: str) -> Optional['QPixmap']:
+    # Blocking convenience wrapper; GUI code should prefer GameAssetService.fetch_async
+    if QPixmap is None:
+        return None
+    service = get_asset_service()
+    pm = service.cached_pixmap(game_name)
+    if pm is not None:
+        return pm
+    if game_name not in LOGO_URLS:
+        img = service._load_local(game_name)
+        return service.pixmap_from_image(game_name, img) if img is not None else None
+    pm = service.pixmap_from_image(game_name, service.load_image(game_name))
+    if pm is not None:
+        return pm
+    # Final fallback: generate a themed text logo
+    pm_fallback = _generate_text_logo_pixmap(game_name)
+    if pm_fallback is not None:
         return pm_fallback
     return _fallback_gradient_pixmap()
@@ -0,0 +1,131 @@
+import os
+import gzip
+import time
+import queue
+import shutil
+import atexit
+import logging
+import logging.handlers
+from typing import Optional
+
+LOG_FILE = 'phantomid.log'
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+DEFAULT_ROTATE_HOURS = 24
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+def _gzip_namer(name: str) -> str:
+    return name + '.gz'
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+class SizeAndTimeRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler that also rolls over once the file is older than an interval.
+
+    Rotated files keep the numbered naming of RotatingFileHandler
+    (phantomid.log.1, .2, ...), with a .gz suffix when compression is on.
+    """
+
+    def __init__(self, filename, max_bytes: int = DEFAULT_MAX_BYTES, backup_count: int = DEFAULT_BACKUP_COUNT,
+                 interval_seconds: float = DEFAULT_ROTATE_HOURS * 3600, compress: bool = True, encoding='utf-8'):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding, delay=True)
+        self.interval_seconds = interval_seconds
+        try:
+            started = os.path.getmtime(self.baseFilename) if os.path.getsize(self.baseFilename) else time.time()
+        except OSError:
+            started = time.time()
+        self.rollover_at = started + interval_seconds if interval_seconds > 0 else None
+        if compress:
+            self.namer = _gzip_namer
+            self.rotator = _gzip_rotator
+
+    def shouldRollover(self, record) -> bool:
+        if self.rollover_at is not None and time.time() >= self.rollover_at:
+            try:
+                if os.path.getsize(self.baseFilename) > 0:
+                    return True
+            except OSError:
+                pass
+            self.rollover_at = time.time() + self.interval_seconds
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self):
+        super().doRollover()
+        if self.interval_seconds > 0:
+            self.rollover_at = time.time() + self.interval_seconds
+
+
+def setup_logging(level: int = logging.INFO, log_file: str = LOG_FILE, max_bytes: int = DEFAULT_MAX_BYTES,
+                  backup_count: int = DEFAULT_BACKUP_COUNT, rotate_hours: float = DEFAULT_ROTATE_HOURS,
+                  compress: bool = True, console: bool = True) -> logging.handlers.QueueListener:
+    """
+    Route all logging through a queue so callers never block on file I/O.
+
+    The root logger gets a single QueueHandler; a QueueListener thread owns the
+    rotating file handler (and console handler) and does the actual writes,
+    rotation and compression. Calling this again replaces the pipeline.
+    """
+    global _listener, _queue_handler
+    shutdown_logging()
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = []
+    try:
+        file_handler = SizeAndTimeRotatingFileHandler(
+            log_file,
+            max_bytes=max(0, int(max_bytes)),
+            backup_count=max(0, int(backup_count)),
+            interval_seconds=max(0.0, float(rotate_hours)) * 3600,
+            compress=compress,
+        )
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"File logging unavailable: {e}")
+    if console:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+        handlers.append(stream_handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    root = logging.getLogger()
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and close the handlers; safe to call more than once."""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        try:
+            _listener.stop()
+        except Exception:
+            pass
+        for h in _listener.handlers:
+            try:
+                h.close()
+            except Exception:
+                pass
+        _listener = None
+
+
+atexit.register(shutdown_logging)